@@ -3,24 +3,52 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
+from flask_caching import Cache
 from dotenv import load_dotenv
 from datetime import timedelta
 import os
+from app.services.banco import SessaoRoteada, configurar_banco, init_leitura
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": SessaoRoteada})
 jwt = JWTManager()
+cache = Cache()
 
-def create_app():
+def create_app(config=None):
     load_dotenv()
 
     app = Flask(__name__)
 
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv("DATABASE_URL")
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config.update(config or {})  # sobrescritas explícitas (ex.: banco em memória nas verificações)
+    # Pool, pre-ping e statement_timeout vêm do ambiente; DATABASE_READ_URL liga a réplica
+    configurar_banco(app)
     app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "fallback-secret")
     app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(minutes=30)
     app.config["JWT_REFRESH_TOKEN_EXPIRES"] = timedelta(days=7)
 
+    # Cache do dashboard: em memória por padrão, Redis se CACHE_REDIS_URL estiver definida
+    app.config["CACHE_REDIS_URL"] = os.getenv("CACHE_REDIS_URL")
+    app.config["CACHE_TYPE"] = os.getenv("CACHE_TYPE", "RedisCache" if app.config["CACHE_REDIS_URL"] else "SimpleCache")
+    app.config["CACHE_DEFAULT_TIMEOUT"] = int(os.getenv("CACHE_DEFAULT_TIMEOUT", 300))
+    # Limite de chaves do SimpleCache (acima dele, descarta): respostas do dashboard por dia e
+    # parâmetros, mais as versões dos grupos e das tabelas
+    app.config["CACHE_THRESHOLD"] = int(os.getenv("CACHE_THRESHOLD", 2000))
+    # SimpleCache vive em cada processo: invalidações de um worker (ou da CLI) não chegam aos outros
+    if app.config["CACHE_TYPE"] == "SimpleCache" and int(os.getenv("WEB_CONCURRENCY", 1)) > 1:
+        raise RuntimeError("Com mais de um worker, defina CACHE_REDIS_URL: o SimpleCache não é compartilhado.")
+
+    # Dados de quem emite os recibos gerados no servidor (recibos em lote)
+    app.config["RECIBO_EMITENTE"] = {
+        "nome": os.getenv("EMITENTE_NOME", ""),
+        "cpf": os.getenv("EMITENTE_CPF", ""),
+        "crp": os.getenv("EMITENTE_CRP", ""),
+        "cidade": os.getenv("EMITENTE_CIDADE", ""),
+        "endereco": os.getenv("EMITENTE_ENDERECO", ""),
+        "contato": os.getenv("EMITENTE_CONTATO", ""),
+    }
+    app.config["RECIBOS_CACHE_DIR"] = os.getenv("RECIBOS_CACHE_DIR")  # padrão: instance/recibos
+
     frontend_origin = os.getenv("FRONTEND_ORIGIN", "http://localhost:5173")
     CORS(app,
          resources={r"/*": {"origins": [frontend_origin, "http://localhost:5173"]}},
@@ -32,10 +60,25 @@ def create_app():
 
     db.init_app(app)
     jwt.init_app(app)
+    cache.init_app(app)
     Migrate(app, db)
+    init_leitura(app, db)
 
     # Modelos
-    from app.models import cliente, sessao, pagamento
+    from app.models import cliente, sessao, pagamento, serie_repeticao, cliente_token, saldo_cliente
+
+    from app.services.cache_dashboard import init_cache_dashboard
+    from app.services.busca_clientes import init_busca_clientes
+    from app.services.busca_textual import init_busca_textual
+    from app.services.saldos import init_saldos
+    from app.services.metricas import init_metricas
+    from app.services.requisicao_condicional import init_requisicao_condicional
+    init_cache_dashboard()
+    init_requisicao_condicional()
+    init_busca_clientes()
+    init_busca_textual()
+    init_saldos()
+    init_metricas(app)
 
     # Rotas
     from app.routes.clientes import clientes_bp
@@ -47,6 +90,12 @@ def create_app():
     from app.routes.sessoesAmanha import sessoes_amanha_bp
     from app.routes.historico import historico_bp
     from app.routes.notas import notas_bp
+    from app.routes.series import series_bp
+    from app.routes.exportacao import exportacao_bp
+    from app.routes.busca import busca_bp
+    from app.routes.pagamentos import pagamentos_bp
+    from app.routes.saldos import saldos_bp
+    from app.routes.metricas import metricas_bp
     app.register_blueprint(notas_bp)
     app.register_blueprint(historico_bp)
     app.register_blueprint(clientes_bp)
@@ -56,9 +105,24 @@ def create_app():
     app.register_blueprint(dashboard_bp)  
     app.register_blueprint(proximas_sessoes_bp)
     app.register_blueprint(sessoes_amanha_bp)
+    app.register_blueprint(series_bp)
+    app.register_blueprint(exportacao_bp)
+    app.register_blueprint(busca_bp)
+    app.register_blueprint(pagamentos_bp)
+    app.register_blueprint(saldos_bp)
+    app.register_blueprint(metricas_bp)
     
     # CLI (importa após init do app e db)
-    from app.cli import renovar_sessoes_command
+    from app.cli import renovar_sessoes_command, verificar_indices_command, benchmark_serializacao_command, exportar_command, recibos_lote_command, recalcular_saldos_command, seed_command, benchmark_rotas_command, verificar_consultas_command, importar_clientes_command
     app.cli.add_command(renovar_sessoes_command)
+    app.cli.add_command(verificar_indices_command)
+    app.cli.add_command(benchmark_serializacao_command)
+    app.cli.add_command(exportar_command)
+    app.cli.add_command(recibos_lote_command)
+    app.cli.add_command(recalcular_saldos_command)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(benchmark_rotas_command)
+    app.cli.add_command(verificar_consultas_command)
+    app.cli.add_command(importar_clientes_command)
 
     return app
\ No newline at end of file
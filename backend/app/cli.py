@@ -1,9 +1,230 @@
 import click
+import os
 from flask.cli import with_appcontext
 from app.services.renovacao_sessoes import renovar_sessoes_repetidas
+from app.services.verificacao_indices import verificar_indices
+from app.services.verificacao_consultas import TAMANHOS_PADRAO
 
 @click.command("renovar-sessoes")
+@click.option("--dry-run", "simular", is_flag=True, help="Apenas calcula, sem gravar.")
+@click.option("--horizonte", default=4, show_default=True, help="Ocorrências geradas por série.")
+@click.option("--tamanho-lote", default=500, show_default=True, help="Séries por commit.")
 @with_appcontext
-def renovar_sessoes_command():
-    renovar_sessoes_repetidas()
-    click.echo("Sessões futuras geradas com sucesso.")
\ No newline at end of file
+def renovar_sessoes_command(simular, horizonte, tamanho_lote):
+    relatorio = renovar_sessoes_repetidas(horizonte=horizonte, simular=simular, tamanho_lote=tamanho_lote)
+    click.echo(
+        f"{relatorio['series']} séries, {relatorio['candidatas']} candidatas, "
+        f"{relatorio['inseridas']} novas em {relatorio['lotes']} lote(s) "
+        f"({relatorio['segundos']}s)."
+    )
+    if simular:
+        click.echo("Simulação: nenhuma sessão foi gravada.")
+    else:
+        click.echo("Sessões futuras geradas com sucesso.")
+
+@click.command("verificar-indices")
+@with_appcontext
+def verificar_indices_command():
+    falhas = 0
+    for rota, tabelas in verificar_indices():
+        if tabelas:
+            falhas += 1
+            click.echo(f"FALHA  {rota}: varredura sequencial em {', '.join(tabelas)}")
+        else:
+            click.echo(f"ok     {rota}")
+
+    if falhas:
+        raise click.ClickException(f"{falhas} consulta(s) sem índice.")
+    click.echo("Todas as consultas usam índices.")
+
+@click.command("benchmark-serializacao")
+@click.option("--limite", type=int, default=None, help="Máximo de linhas por tabela.")
+@click.option("--repeticoes", default=5, show_default=True, help="Rodadas por caminho (usa a mediana).")
+@with_appcontext
+def benchmark_serializacao_command(limite, repeticoes):
+    from app.services.benchmark_serializacao import comparar_todos
+    from app.services.serializacao import orjson
+
+    click.echo(f"Codificador: {'orjson' if orjson else 'json (stdlib)'}")
+    for tabela, caminhos in comparar_todos(limite, repeticoes).items():
+        click.echo(tabela)
+        for caminho, medida in caminhos.items():
+            click.echo(f"  {caminho:<12} {medida['mediana_ms']:>9.2f} ms  {medida['bytes']:>10} bytes")
+
+
+@click.command("exportar")
+@click.argument("tipo", type=click.Choice(["sessoes", "pagamentos"]))
+@click.option("--formato", type=click.Choice(["csv", "ndjson"]), default="csv", show_default=True)
+@click.option("--inicio", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Data inicial (AAAA-MM-DD).")
+@click.option("--fim", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Data final (AAAA-MM-DD).")
+@click.option("--cliente-id", type=int, default=None)
+@click.option("--saida", type=click.File("wb"), default="-", help="Arquivo de saída (padrão: stdout).")
+@with_appcontext
+def exportar_command(tipo, formato, inicio, fim, cliente_id, saida):
+    from app.services.exportacao import exportar
+
+    for pedaco in exportar(tipo, formato, inicio and inicio.date(), fim and fim.date(), cliente_id):
+        saida.write(pedaco.encode() if isinstance(pedaco, str) else pedaco)
+
+
+@click.command("recibos-lote")
+@click.option("--mes", type=click.IntRange(1, 12), required=True)
+@click.option("--ano", type=int, required=True)
+@click.option("--saida", type=click.Path(), required=True,
+              help="Arquivo .zip ou diretório onde gravar um PDF por cliente.")
+@click.option("--processos", type=int, default=None, help="Processos de renderização (padrão: CPUs).")
+@with_appcontext
+def recibos_lote_command(mes, ano, saida, processos):
+    from app.services.recibos_lote import gerar_lote, compactar
+
+    arquivos, relatorio = gerar_lote(mes, ano, processos=processos)
+    if saida.endswith(".zip"):
+        with open(saida, "wb") as f:
+            f.write(compactar(arquivos))
+    else:
+        os.makedirs(saida, exist_ok=True)
+        for nome, conteudo in arquivos.items():
+            with open(os.path.join(saida, nome), "wb") as f:
+                f.write(conteudo)
+
+    click.echo(
+        f"{relatorio['recibos']} recibo(s) em {saida}: "
+        f"{relatorio['renderizados']} renderizado(s), {relatorio['em_cache']} do cache."
+    )
+
+
+@click.command("recalcular-saldos")
+@click.option("--verificar", is_flag=True, help="Só confere; falha se houver divergência.")
+@with_appcontext
+def recalcular_saldos_command(verificar):
+    from app import db
+    from app.services.saldos import divergencias, recalcular
+
+    diferentes = divergencias(db.session)
+    if diferentes:
+        amostra = ", ".join(str(c) for c in diferentes[:20])
+        click.echo(f"{len(diferentes)} cliente(s) com saldo divergente: {amostra}{' ...' if len(diferentes) > 20 else ''}")
+    else:
+        click.echo("Saldos consistentes com sessões e pagamentos.")
+
+    if verificar:
+        if diferentes:
+            raise click.ClickException("Saldos divergentes; rode 'flask recalcular-saldos'.")
+        return
+
+    recalcular(db.session)
+    db.session.commit()
+    click.echo("Saldos recalculados.")
+
+
+@click.command("seed")
+@click.option("--clientes", default=200, show_default=True, help="Quantidade de clientes.")
+@click.option("--anos", default=3, show_default=True, help="Anos de histórico das séries.")
+@click.option("--semente", default=42, show_default=True, help="Mesma semente, mesmos dados.")
+@click.option("--referencia", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Data tomada como hoje (padrão: hoje).")
+@click.option("--apagar", is_flag=True, help="Apaga todos os dados antes de gerar.")
+@with_appcontext
+def seed_command(clientes, anos, semente, referencia, apagar):
+    from time import perf_counter
+    from app.services.dados_sinteticos import popular
+
+    if apagar:
+        click.confirm("Apagar TODOS os clientes, sessões, pagamentos, históricos e notas?", abort=True)
+
+    inicio = perf_counter()
+    totais = popular(
+        clientes, anos=anos, semente=semente,
+        referencia=referencia.date() if referencia else None, apagar=apagar,
+        progresso=lambda feitos, total: click.echo(f"  {feitos}/{total} clientes", err=True),
+    )
+    resumo = ", ".join(f"{quantidade} {tabela}" for tabela, quantidade in totais.items())
+    click.echo(f"Gerados {resumo} em {perf_counter() - inicio:.1f}s.")
+
+
+@click.command("benchmark-rotas")
+@click.option("--repeticoes", default=20, show_default=True, help="Rodadas medidas por rota.")
+@click.option("--filtro", default=None, help="Só as rotas cujo nome contém este texto.")
+@click.option("--saida", type=click.Path(dir_okay=False), default=None, help="Grava o resultado em JSON.")
+@click.option("--comparar", "base", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="JSON de uma execução anterior; falha se houver regressão.")
+@click.option("--tolerancia", default=0.2, show_default=True, help="Aumento relativo aceito em latência e memória.")
+@with_appcontext
+def benchmark_rotas_command(repeticoes, filtro, saida, base, tolerancia):
+    import json
+    from app.services.benchmark_rotas import executar, comparar
+
+    def mostrar(nome, m):
+        click.echo(
+            f"{nome:<36} p50 {m['p50_ms']:>8.2f} ms  p95 {m['p95_ms']:>8.2f} ms  "
+            f"{m['consultas']:>4} consultas  {m['pico_memoria_kb']:>9.1f} KB  {m['status']}"
+        )
+
+    resultado = executar(repeticoes, filtro, progresso=mostrar)
+    if saida:
+        with open(saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+        click.echo(f"Resultado gravado em {saida}.")
+
+    if base:
+        with open(base, encoding="utf-8") as arquivo:
+            regressoes = comparar(resultado, json.load(arquivo), tolerancia)
+        for nome, medida, antes, depois in regressoes:
+            click.echo(f"REGRESSÃO {nome}: {medida} {antes} → {depois}", err=True)
+        if regressoes:
+            raise click.ClickException(f"{len(regressoes)} regressão(ões) em relação a {base}.")
+        click.echo(f"Sem regressões em relação a {base}.")
+
+
+@click.command("verificar-consultas")
+@click.option("--pequeno", default=TAMANHOS_PADRAO[0][0], show_default=True, help="Clientes no volume menor.")
+@click.option("--grande", default=TAMANHOS_PADRAO[1][0], show_default=True, help="Clientes no volume maior.")
+@with_appcontext
+def verificar_consultas_command(pequeno, grande):
+    """Mesma verificação de tests/test_orcamento_consultas.py, com volumes ajustáveis."""
+    from app.services.verificacao_consultas import verificar_consultas
+
+    (_, serie_pequena), (_, serie_grande) = TAMANHOS_PADRAO
+    falhas = 0
+    for nome, orcamento, contagens, problema in verificar_consultas(((pequeno, serie_pequena), (grande, serie_grande))):
+        medidas = " / ".join(f"{total} com {clientes} clientes" for clientes, total in contagens.items())
+        if problema:
+            falhas += 1
+            click.echo(f"FALHA  {nome}: {medidas}; {problema}")
+        else:
+            click.echo(f"ok     {nome}: {medidas} (orçamento {orcamento})")
+
+    if falhas:
+        raise click.ClickException(f"{falhas} rota(s) fora do orçamento de consultas.")
+    click.echo("Todas as rotas dentro do orçamento de consultas.")
+
+
+@click.command("importar-clientes")
+@click.argument("arquivo", type=click.Path(exists=True, dir_okay=False))
+@click.option("--simular", is_flag=True, help="Valida tudo sem gravar.")
+@click.option("--relatorio", type=click.File("w", encoding="utf-8"), default=None,
+              help="Grava as linhas rejeitadas em CSV (linha, nome, erros).")
+@with_appcontext
+def importar_clientes_command(arquivo, simular, relatorio):
+    import csv
+    from app.services.importacao_clientes import importar_clientes, formato_do_arquivo, ArquivoInvalido
+
+    with open(arquivo, "rb") as entrada:
+        try:
+            resultado = importar_clientes(entrada, formato_do_arquivo(arquivo), simular=simular)
+        except ArquivoInvalido as e:
+            raise click.ClickException(str(e))
+
+    for erro in resultado["erros"][:20]:
+        click.echo(f"  linha {erro['linha']}: {'; '.join(erro['erros'])}", err=True)
+    if relatorio:
+        escritor = csv.writer(relatorio)
+        escritor.writerow(["linha", "nome", "erros"])
+        for erro in resultado["erros"]:
+            escritor.writerow([erro["linha"], erro["nome"], "; ".join(erro["erros"])])
+
+    click.echo(
+        f"{resultado['linhas']} linhas: {resultado['importados']} importadas, "
+        f"{resultado['rejeitados']} rejeitadas."
+        + (" Simulação: nada foi gravado." if simular else "")
+    )
@@ -13,6 +13,7 @@ class Cliente(db.Model):
     email = db.Column(db.String(100))
     ativo = db.Column(db.Boolean, default=True)
     criado_em = db.Column(db.DateTime, default=datetime.utcnow)
+    busca = db.Column(db.Text)  # Termos normalizados de nome, CPF/CNPJ, telefone e email (índice trigram no Postgres)
     sessoes = db.relationship("Sessao", backref="cliente", cascade="all, delete", passive_deletes=True)
     historicos = db.relationship("Historico", back_populates="cliente", cascade="all, delete-orphan")
     
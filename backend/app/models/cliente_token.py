@@ -0,0 +1,8 @@
+from app import db
+
+class ClienteToken(db.Model):
+    """Termos normalizados (sem acento, minúsculos) de cada cliente, para busca por prefixo."""
+    __tablename__ = "clientes_tokens"
+
+    token = db.Column(db.String(100), primary_key=True)
+    cliente_id = db.Column(db.Integer, db.ForeignKey("clientes.id", ondelete="CASCADE"), primary_key=True, index=True)
@@ -3,6 +3,9 @@ from datetime import datetime
 
 class Historico(db.Model):
     __tablename__ = "historicos"
+    __table_args__ = (
+        db.Index("ix_historicos_cliente_id_data", "cliente_id", "data"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     cliente_id = db.Column(db.Integer, db.ForeignKey("clientes.id"), nullable=False)
@@ -16,7 +19,7 @@ class Historico(db.Model):
         return {
             "id": self.id,
             "cliente_id": self.cliente_id,
-            "data": self.data.isoformat(),
+            "data": self.data.isoformat() if self.data else None,
             "tipo": self.tipo,
             "conteudo": self.conteudo,
         }
\ No newline at end of file
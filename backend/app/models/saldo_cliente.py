@@ -0,0 +1,27 @@
+from app import db
+from datetime import datetime
+
+class SaldoCliente(db.Model):
+    """Resumo financeiro por cliente, recalculado a cada commit que altera suas sessões ou pagamentos."""
+    __tablename__ = "saldo_cliente"
+
+    cliente_id = db.Column(db.Integer, db.ForeignKey("clientes.id", ondelete="CASCADE"), primary_key=True)
+    total_faturado = db.Column(db.Numeric(12, 2), nullable=False, default=0)  # sessões realizadas
+    total_pago = db.Column(db.Numeric(12, 2), nullable=False, default=0)  # soma dos pagamentos
+    em_aberto = db.Column(db.Numeric(12, 2), nullable=False, default=0, index=True)  # realizadas e não pagas
+    sessoes_em_aberto = db.Column(db.Integer, nullable=False, default=0)
+    ultima_sessao = db.Column(db.Date)  # última sessão realizada
+    proxima_sessao = db.Column(db.Date)  # sessão não realizada mais antiga
+    atualizado_em = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "cliente_id": self.cliente_id,
+            "total_faturado": float(self.total_faturado),
+            "total_pago": float(self.total_pago),
+            "em_aberto": float(self.em_aberto),
+            "sessoes_em_aberto": self.sessoes_em_aberto,
+            "ultima_sessao": self.ultima_sessao.isoformat() if self.ultima_sessao else None,
+            "proxima_sessao": self.proxima_sessao.isoformat() if self.proxima_sessao else None,
+            "atualizado_em": self.atualizado_em.isoformat() if self.atualizado_em else None,
+        }
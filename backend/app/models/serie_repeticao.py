@@ -0,0 +1,43 @@
+from app import db
+from app.services.recorrencia_sessoes import datas_no_intervalo
+from datetime import datetime
+import uuid
+
+class SerieRepeticao(db.Model):
+    """Regra de uma série de sessões recorrentes.
+
+    As ocorrências são calculadas sob demanda; só viram linhas em `sessoes`
+    (com `repeticao_id` = id da série e `data_ocorrencia` preenchida) quando
+    são realizadas, pagas ou editadas individualmente.
+    """
+    __tablename__ = "series_repeticao"
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    cliente_id = db.Column(db.Integer, db.ForeignKey("clientes.id", ondelete="CASCADE"), nullable=False, index=True)
+    tipo_atendimento = db.Column(db.String(30), nullable=False)
+    frequencia = db.Column(db.String(20), nullable=False)  # semanal, quinzenal, mensal
+    horario = db.Column(db.Time, nullable=False)
+    valor = db.Column(db.Numeric(10, 2))
+    observacoes = db.Column(db.Text)
+    data_inicio = db.Column(db.Date, nullable=False)
+    data_fim = db.Column(db.Date, nullable=True)  # None = sem término
+    criado_em = db.Column(db.DateTime, default=datetime.utcnow)
+    atualizado_em = db.Column(db.DateTime, onupdate=datetime.utcnow)
+
+    def ocorrencias(self, inicio, fim):
+        return datas_no_intervalo(self.data_inicio, self.frequencia, inicio, fim, self.data_fim)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "cliente_id": self.cliente_id,
+            "tipo_atendimento": self.tipo_atendimento,
+            "frequencia": self.frequencia,
+            "horario": self.horario.isoformat(),
+            "valor": float(self.valor) if self.valor else None,
+            "observacoes": self.observacoes,
+            "data_inicio": self.data_inicio.isoformat(),
+            "data_fim": self.data_fim.isoformat() if self.data_fim else None,
+            "criado_em": self.criado_em.isoformat() if self.criado_em else None,
+            "atualizado_em": self.atualizado_em.isoformat() if self.atualizado_em else None,
+        }
@@ -4,10 +4,22 @@ import uuid
 
 class Sessao(db.Model):
     __tablename__ = "sessoes"
+    __table_args__ = (
+        db.Index("ix_sessoes_data_horario", "data", "horario"),  # conflitos de horário
+        db.Index("ix_sessoes_cliente_id_data", "cliente_id", "data"),  # recibos
+        db.Index("ix_sessoes_repeticao_id_data", "repeticao_id", "data"),  # séries e renovação
+        # Dashboard: sessões ainda não realizadas
+        db.Index(
+            "ix_sessoes_nao_realizadas_data_horario", "data", "horario",
+            postgresql_where=db.text("foi_realizada = false"),
+            sqlite_where=db.text("foi_realizada = false"),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     cliente_id = db.Column(db.Integer, db.ForeignKey("clientes.id", ondelete="CASCADE"), nullable=False)
     repeticao_id = db.Column(db.String(36), nullable=True)  # Identificador da série de sessões    
+    data_ocorrencia = db.Column(db.Date, nullable=True, index=True)  # Ocorrência da SerieRepeticao que esta linha substitui
     data = db.Column(db.Date, nullable=False)
     tipo_atendimento = db.Column(db.String(30), nullable=False)  # psicologia ou rolfing
     frequencia = db.Column(db.String(20), nullable=False)  # semanal, quinzenal, avulso
@@ -24,6 +36,7 @@ class Sessao(db.Model):
             "id": self.id,
             "cliente_id": self.cliente_id,
             "repeticao_id": self.repeticao_id,
+            "data_ocorrencia": self.data_ocorrencia.isoformat() if self.data_ocorrencia else None,
             "data": self.data.isoformat(),
             "tipo_atendimento": self.tipo_atendimento,
             "frequencia": self.frequencia,
@@ -0,0 +1,38 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.services.busca_textual import buscar_textos, LIMITE_PADRAO, LIMITE_MAXIMO
+from app.services.serializacao import resposta_json
+
+busca_bp = Blueprint("busca", __name__, url_prefix="/busca")
+
+ORIGENS = {"historicos": ("historico",), "notas": ("nota",), "todos": ("historico", "nota")}
+
+# GET /busca/?q=&em=historicos|notas|todos&cliente_id=&pagina=&limite=
+@busca_bp.route("/", methods=["GET"])
+@jwt_required()
+def buscar():
+    q = request.args.get("q", "").strip()
+    if not q:
+        return jsonify({"erro": "Parâmetro 'q' é obrigatório."}), 400
+
+    em = request.args.get("em", "todos")
+    if em not in ORIGENS:
+        return jsonify({"erro": "Parâmetro 'em' deve ser 'historicos', 'notas' ou 'todos'."}), 400
+
+    pagina = request.args.get("pagina", 1, type=int)
+    limite = request.args.get("limite", LIMITE_PADRAO, type=int)
+    if pagina < 1 or limite < 1:
+        return jsonify({"erro": "Parâmetros 'pagina' e 'limite' devem ser positivos."}), 400
+
+    resultados, tem_mais = buscar_textos(
+        q,
+        pagina=pagina,
+        limite=min(limite, LIMITE_MAXIMO),
+        em=ORIGENS[em],
+        cliente_id=request.args.get("cliente_id", type=int)
+    )
+    return resposta_json({
+        "resultados": resultados,
+        "pagina": pagina,
+        "proxima_pagina": pagina + 1 if tem_mais else None,
+    })
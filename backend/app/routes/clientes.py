@@ -1,6 +1,10 @@
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models.cliente import Cliente
+from app.services.requisicao_condicional import resposta_condicional
+from app.services.serializacao import consultar, resposta_lista, resposta_json
+from app.services.busca_clientes import buscar_clientes, buscar_por_nome, LIMITE_PADRAO, LIMITE_MAXIMO
+from app.services.importacao_clientes import importar_clientes, formato_do_arquivo, ArquivoInvalido
 from flask_jwt_extended import jwt_required
 
 clientes_bp = Blueprint("clientes", __name__, url_prefix="/clientes")
@@ -10,8 +14,9 @@ clientes_bp = Blueprint("clientes", __name__, url_prefix="/clientes")
 @clientes_bp.route("/", methods=["GET"])
 @jwt_required()
 def get_all_clientes():
-    clientes = Cliente.query.all()
-    return jsonify([c.to_dict() for c in clientes])
+    return resposta_condicional(
+        Cliente, lambda: resposta_lista(Cliente, consultar(Cliente))
+    )
 
 
 # GET /clientes/<id> → buscar por ID
@@ -22,12 +27,22 @@ def get_cliente_by_id(id):
     return jsonify(cliente.to_dict())
 
 
-# GET /clientes/nome/<nome> → buscar por nome
+# GET /clientes/nome/<nome> → todos os clientes cujo nome contém o trecho (sem diferenciar acentos)
 @clientes_bp.route("/nome/<nome>", methods=["GET"])
 @jwt_required()
 def get_cliente_by_nome(nome):
-    clientes = Cliente.query.filter(Cliente.nome.ilike(f"%{nome}%")).all()
-    return jsonify([c.to_dict() for c in clientes])
+    return resposta_lista(Cliente, buscar_por_nome(nome))
+
+
+# GET /clientes/busca?q=&limite=&ativos= → autocomplete por nome, CPF/CNPJ, telefone ou email
+@clientes_bp.route("/busca", methods=["GET"])
+@jwt_required()
+def buscar():
+    limite = min(max(request.args.get("limite", LIMITE_PADRAO, type=int), 1), LIMITE_MAXIMO)
+    ativos = request.args.get("ativos")
+    if ativos is not None:
+        ativos = ativos.lower() in ("1", "true", "sim")
+    return resposta_json(buscar_clientes(request.args.get("q", ""), limite=limite, ativos=ativos))
 
 
 # POST /clientes/ → criar novo cliente
@@ -56,6 +71,22 @@ def create_cliente():
     db.session.commit()
     return jsonify(cliente.to_dict()), 201
 
+# POST /clientes/importar (multipart, campo "arquivo") → cadastro em massa a partir de CSV ou XLSX
+@clientes_bp.route("/importar", methods=["POST"])
+@jwt_required()
+def importar():
+    arquivo = request.files.get("arquivo")
+    if arquivo is None:
+        return jsonify({"erro": "Envie o arquivo no campo 'arquivo'."}), 400
+
+    formato = request.form.get("formato") or formato_do_arquivo(arquivo.filename)
+    simular = request.args.get("simular", "").lower() in ("1", "true", "sim")
+    try:
+        relatorio = importar_clientes(arquivo.stream, formato, simular=simular)
+    except ArquivoInvalido as e:
+        return jsonify({"erro": str(e)}), 400
+    return jsonify(relatorio)
+
 # PUT /clientes/<id> → atualizar
 @clientes_bp.route("/<int:id>", methods=["PUT"])
 @jwt_required()
@@ -1,41 +1,110 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
+from app import db
 from app.models.sessao import Sessao
-from datetime import datetime
+from app.services.cache_dashboard import em_cache, estatisticas
+from app.services.agenda_dashboard import sessoes_pendentes, formatar_sessao, dia_alvo_amanha
+from datetime import date, timedelta
+from sqlalchemy import func, case, and_, or_
 
 dashboard_bp = Blueprint("dashboard", __name__, url_prefix="/dashboard")
 
+METRICAS = ("sessoes", "recebido", "a_receber", "futuras", "nao_realizadas")
+DIAS_MAXIMO_AGENDA = 366
+
+def calcular_resumo(mes, ano, hoje):
+    mes_inicio = date(ano, mes, 1)
+    proximo_mes = date(ano + 1, 1, 1) if mes == 12 else date(ano, mes + 1, 1)
+    # Considera o mês até hoje (ou inteiro, se já terminou)
+    mes_fim = min(proximo_mes - timedelta(days=1), hoje)
+
+    realizada_no_mes = and_(
+        Sessao.data >= mes_inicio,
+        Sessao.data <= mes_fim,
+        Sessao.foi_realizada == True
+    )
+    futura = Sessao.data > hoje
+    passada_nao_realizada = and_(Sessao.data < hoje, Sessao.foi_realizada == False)
+    valor = func.coalesce(Sessao.valor, 0)
+
+    # Todas as métricas em uma só consulta, agregadas por tipo de atendimento
+    linhas = db.session.query(
+        Sessao.tipo_atendimento,
+        func.count().filter(realizada_no_mes),
+        func.sum(case((and_(realizada_no_mes, Sessao.foi_paga == True), valor), else_=0)),
+        func.sum(case((and_(realizada_no_mes, Sessao.foi_paga == False), valor), else_=0)),
+        func.count().filter(futura),
+        func.count().filter(passada_nao_realizada),
+    ).filter(
+        or_(realizada_no_mes, futura, passada_nao_realizada)
+    ).group_by(Sessao.tipo_atendimento).all()
+
+    por_tipo = {}
+    totais = dict.fromkeys(METRICAS, 0)
+    for tipo, sessoes, recebido, a_receber, futuras, nao_realizadas in linhas:
+        valores = {
+            "sessoes": sessoes,
+            "recebido": float(recebido or 0),
+            "a_receber": float(a_receber or 0),
+            "futuras": futuras,
+            "nao_realizadas": nao_realizadas,
+        }
+        por_tipo[tipo] = valores
+        for chave in METRICAS:
+            totais[chave] += valores[chave]
+
+    return {
+        **totais,
+        "mes": mes,
+        "ano": ano,
+        "por_tipo": por_tipo
+    }
+
+# GET /dashboard/resumo-financeiro?mes=&ano=
 @dashboard_bp.route("/resumo-financeiro", methods=["GET"])
 @jwt_required()
+@em_cache("resumo_financeiro")
 def resumo_financeiro():
-    hoje = datetime.today()
-    mes_inicio = datetime(hoje.year, hoje.month, 1)
+    hoje = date.today()
+    mes = request.args.get("mes", hoje.month, type=int)
+    ano = request.args.get("ano", hoje.year, type=int)
 
-    sessoes_mes = Sessao.query.filter(
-        Sessao.data >= mes_inicio,
-        Sessao.data <= hoje
-    ).all()
+    if not 1 <= mes <= 12:
+        return jsonify({"erro": "Parâmetro 'mes' deve estar entre 1 e 12."}), 400
+    # calcular_resumo também monta o primeiro dia do mês seguinte
+    if not 1 <= ano < date.max.year:
+        return jsonify({"erro": f"Parâmetro 'ano' deve estar entre 1 e {date.max.year - 1}."}), 400
+
+    return jsonify(calcular_resumo(mes, ano, hoje))
 
-    sessoes_realizadas = [s for s in sessoes_mes if s.foi_realizada]
-    sessoes_pagas = [s for s in sessoes_realizadas if s.foi_paga]
-    sessoes_nao_pagas = [s for s in sessoes_realizadas if not s.foi_paga]
+# GET /dashboard/agenda?dias=N → resumo, próximas sessões e sessões de amanhã em uma chamada
+@dashboard_bp.route("/agenda", methods=["GET"])
+@jwt_required()
+@em_cache("agenda")
+def agenda():
+    hoje = date.today()
+    dias = request.args.get("dias", 7, type=int)
+    # O limite também evita o OverflowError de hoje + timedelta para valores enormes
+    if not 0 <= dias <= DIAS_MAXIMO_AGENDA:
+        return jsonify({"erro": f"Parâmetro 'dias' deve estar entre 0 e {DIAS_MAXIMO_AGENDA}."}), 400
 
-    valor_recebido = sum([float(s.valor or 0) for s in sessoes_pagas])
-    valor_a_receber = sum([float(s.valor or 0) for s in sessoes_nao_pagas])
+    fim_proximas = hoje + timedelta(days=dias)
+    alvo = dia_alvo_amanha(hoje)
 
-    sessoes_futuras = Sessao.query.filter(
-        Sessao.data > hoje
-    ).count()
+    # Uma consulta cobre as duas listas; a separação é feita em memória
+    pendentes = sessoes_pendentes(hoje, max(fim_proximas, alvo))
 
-    sessoes_passadas_nao_realizadas = Sessao.query.filter(
-        Sessao.data < hoje,
-        Sessao.foi_realizada == False
-    ).count()
+    return jsonify({
+        "resumo_financeiro": calcular_resumo(hoje.month, hoje.year, hoje),
+        "proximas_sessoes": [formatar_sessao(s) for s in pendentes if s.data <= fim_proximas],
+        "sessoes_amanha": [formatar_sessao(s) for s in pendentes if s.data == alvo]
+    })
 
+# GET /dashboard/cache → acertos e falhas do cache neste processo
+@dashboard_bp.route("/cache", methods=["GET"])
+@jwt_required()
+def estatisticas_cache():
     return jsonify({
-        "sessoes": len(sessoes_realizadas),
-        "recebido": valor_recebido,
-        "a_receber": valor_a_receber,
-        "futuras": sessoes_futuras,
-        "nao_realizadas": sessoes_passadas_nao_realizadas
-    })
\ No newline at end of file
+        "hits": dict(estatisticas["hits"]),
+        "misses": dict(estatisticas["misses"])
+    })
@@ -0,0 +1,37 @@
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from flask_jwt_extended import jwt_required
+from app.services.exportacao import exportar, FORMATOS
+from datetime import date
+
+exportacao_bp = Blueprint("exportacao", __name__, url_prefix="/exportar")
+
+def resposta_exportacao(tipo):
+    formato = request.args.get("formato", "csv")
+    if formato not in FORMATOS:
+        return jsonify({"erro": "Parâmetro 'formato' deve ser 'csv' ou 'ndjson'."}), 400
+
+    try:
+        inicio = date.fromisoformat(request.args["inicio"]) if request.args.get("inicio") else None
+        fim = date.fromisoformat(request.args["fim"]) if request.args.get("fim") else None
+    except ValueError:
+        return jsonify({"erro": "Datas devem estar no formato AAAA-MM-DD."}), 400
+
+    conteudo = exportar(tipo, formato, inicio, fim, request.args.get("cliente_id", type=int))
+    nome = f"{tipo}.{formato}"
+    return Response(
+        stream_with_context(conteudo),
+        mimetype=FORMATOS[formato],
+        headers={"Content-Disposition": f"attachment; filename={nome}"}
+    )
+
+# GET /exportar/sessoes?inicio=&fim=&cliente_id=&formato=csv|ndjson
+@exportacao_bp.route("/sessoes", methods=["GET"])
+@jwt_required()
+def exportar_sessoes():
+    return resposta_exportacao("sessoes")
+
+# GET /exportar/pagamentos?inicio=&fim=&cliente_id=&formato=csv|ndjson
+@exportacao_bp.route("/pagamentos", methods=["GET"])
+@jwt_required()
+def exportar_pagamentos():
+    return resposta_exportacao("pagamentos")
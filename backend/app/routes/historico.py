@@ -1,10 +1,20 @@
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models.historico import Historico
+from app.services.requisicao_condicional import resposta_condicional
+from app.services.serializacao import resposta_json
 from flask_jwt_extended import jwt_required
+from datetime import date
+from sqlalchemy import and_, func, or_, tuple_
+import base64
+import binascii
 
 historico_bp = Blueprint("historicos", __name__, url_prefix="/historicos")
 
+LIMITE_PADRAO = 20
+LIMITE_MAXIMO = 200
+TAMANHO_PREVIA = 200  # caracteres do conteúdo exibidos na listagem
+
 @historico_bp.route("/", methods=["POST"])
 @jwt_required()
 def criar_historico():
@@ -19,11 +29,78 @@ def criar_historico():
     db.session.commit()
     return jsonify(novo.to_dict()), 201
 
+# GET /historicos/cliente/<id>?tipo=&inicio=&fim=&limite=&cursor=
+# Resumos (sem o conteúdo completo), do mais recente ao mais antigo; o texto
+# inteiro de cada registro vem de GET /historicos/<id>.
 @historico_bp.route("/cliente/<int:cliente_id>", methods=["GET"])
 @jwt_required()
 def listar_por_cliente(cliente_id):
-    historicos = Historico.query.filter_by(cliente_id=cliente_id).order_by(Historico.data.desc()).all()
-    return jsonify([h.to_dict() for h in historicos])
+    return resposta_condicional(Historico, lambda: listar_resumos(cliente_id))
+
+# Registros sem data vêm depois de todos os datados; no cursor, a data deles vai vazia
+def codificar_cursor(linha):
+    data_str = linha.data.isoformat() if linha.data else ""
+    return base64.urlsafe_b64encode(f"{data_str}|{linha.id}".encode()).decode()
+
+def decodificar_cursor(cursor):
+    data_str, id_str = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    return (date.fromisoformat(data_str) if data_str else None), int(id_str)
+
+def depois_do_cursor(data, id_):
+    if data is None:
+        return and_(Historico.data.is_(None), Historico.id < id_)
+    # A comparação de tupla com data NULL dá NULL: os sem data entram à parte
+    return or_(tuple_(Historico.data, Historico.id) < tuple_(data, id_), Historico.data.is_(None))
+
+def listar_resumos(cliente_id):
+    filtros = [Historico.cliente_id == cliente_id]
+    try:
+        if request.args.get("inicio"):
+            filtros.append(Historico.data >= date.fromisoformat(request.args["inicio"]))
+        if request.args.get("fim"):
+            filtros.append(Historico.data <= date.fromisoformat(request.args["fim"]))
+        if request.args.get("cursor"):
+            filtros.append(depois_do_cursor(*decodificar_cursor(request.args["cursor"])))
+    except (ValueError, binascii.Error):
+        return jsonify({"erro": "Parâmetros 'inicio', 'fim' ou 'cursor' inválidos."}), 400
+
+    if request.args.get("tipo"):
+        filtros.append(Historico.tipo == request.args["tipo"])
+
+    limite = request.args.get("limite", LIMITE_PADRAO, type=int)
+    if limite <= 0:
+        return jsonify({"erro": "O parâmetro 'limite' deve ser positivo."}), 400
+    limite = min(limite, LIMITE_MAXIMO)
+
+    # Prévia e tamanho calculados no banco: o texto completo não sai do servidor
+    linhas = db.session.execute(
+        db.select(
+            Historico.id,
+            Historico.data,
+            Historico.tipo,
+            func.substr(Historico.conteudo, 1, TAMANHO_PREVIA).label("previa"),
+            func.length(Historico.conteudo).label("tamanho"),
+        ).where(*filtros).order_by(Historico.data.desc().nulls_last(), Historico.id.desc()).limit(limite + 1)
+    ).all()
+
+    proximo_cursor = None
+    if len(linhas) > limite:
+        linhas = linhas[:limite]
+        proximo_cursor = codificar_cursor(linhas[-1])
+
+    return resposta_json({
+        "historicos": [
+            {
+                "id": linha.id,
+                "data": linha.data.isoformat() if linha.data else None,
+                "tipo": linha.tipo,
+                "previa": linha.previa,
+                "tamanho": linha.tamanho,
+            }
+            for linha in linhas
+        ],
+        "proximo_cursor": proximo_cursor,
+    })
 
 @historico_bp.route("/<int:id>", methods=["PUT"])
 @jwt_required()
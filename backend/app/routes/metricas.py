@@ -0,0 +1,12 @@
+from flask import Blueprint, current_app, request
+from app.services.metricas import texto_prometheus
+
+metricas_bp = Blueprint("metricas", __name__)
+
+# GET /metrics → histogramas no formato do Prometheus; exige METRICS_TOKEN, se definido
+@metricas_bp.route("/metrics", methods=["GET"])
+def expor_metricas():
+    token = current_app.config.get("METRICS_TOKEN")
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return {"error": "Não autorizado"}, 401
+    return current_app.response_class(texto_prometheus(), mimetype="text/plain; version=0.0.4")
@@ -2,14 +2,17 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app import db
 from app.models.nota import Nota
+from app.services.requisicao_condicional import resposta_condicional
+from app.services.serializacao import consultar, resposta_lista
 
 notas_bp = Blueprint("notas", __name__, url_prefix="/notas")
 
 @notas_bp.route("/", methods=["GET"])
 @jwt_required()
 def listar_notas():
-    notas = Nota.query.order_by(Nota.criado_em.desc()).all()
-    return jsonify([n.to_dict() for n in notas])
+    return resposta_condicional(
+        Nota, lambda: resposta_lista(Nota, consultar(Nota, ordem=(Nota.criado_em.desc(),)))
+    )
 
 @notas_bp.route("/<int:id>", methods=["GET"])
 @jwt_required()
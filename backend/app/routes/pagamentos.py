@@ -1,7 +1,11 @@
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models.pagamento import Pagamento
+from app.models.sessao import Sessao
+from app.services.serializacao import consultar, resposta_lista, resposta_json, serializar, colunas
 from flask_jwt_extended import jwt_required
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import func, insert, update
 
 pagamentos_bp = Blueprint("pagamentos", __name__, url_prefix="/pagamentos")
 
@@ -9,8 +13,7 @@ pagamentos_bp = Blueprint("pagamentos", __name__, url_prefix="/pagamentos")
 @pagamentos_bp.route("/", methods=["GET"])
 @jwt_required()
 def get_all_pagamentos():
-    pagamentos = Pagamento.query.all()
-    return jsonify([p.to_dict() for p in pagamentos])
+    return resposta_lista(Pagamento, consultar(Pagamento))
 
 # GET /pagamentos/<id>
 @pagamentos_bp.route("/<int:id>", methods=["GET"])
@@ -23,8 +26,7 @@ def get_pagamento_by_id(id):
 @pagamentos_bp.route("/sessao/<int:sessao_id>", methods=["GET"])
 @jwt_required()
 def get_pagamentos_by_sessao(sessao_id):
-    pagamentos = Pagamento.query.filter_by(sessao_id=sessao_id).all()
-    return jsonify([p.to_dict() for p in pagamentos])
+    return resposta_lista(Pagamento, consultar(Pagamento, Pagamento.sessao_id == sessao_id))
 
 # POST /pagamentos/
 @pagamentos_bp.route("/", methods=["POST"])
@@ -41,6 +43,109 @@ def create_pagamento():
     db.session.commit()
     return jsonify(pagamento.to_dict()), 201
 
+def saldos_das_sessoes(sessao_ids):
+    """(id, valor, foi_paga, já pago) de cada sessão, das mais antigas às mais novas."""
+    if db.engine.dialect.name == "postgresql":
+        # Trava as sessões até o commit para dois lançamentos não pagarem a mesma sessão
+        # (FOR UPDATE não pode ser usado junto com GROUP BY)
+        db.session.execute(db.select(Sessao.id).where(Sessao.id.in_(sessao_ids)).with_for_update())
+
+    return db.session.query(
+        Sessao.id,
+        Sessao.valor,
+        Sessao.foi_paga,
+        func.coalesce(func.sum(Pagamento.valor_pago), 0)
+    ).outerjoin(Pagamento, Pagamento.sessao_id == Sessao.id).filter(
+        Sessao.id.in_(sessao_ids)
+    ).group_by(Sessao.id, Sessao.valor, Sessao.foi_paga, Sessao.data, Sessao.horario).order_by(
+        Sessao.data, Sessao.horario, Sessao.id
+    ).all()
+
+def alocar(total, saldos):
+    """Distribui `total` pelas sessões em ordem; retorna [(sessao_id, valor, quitada)] e a sobra."""
+    alocacoes = []
+    for sessao_id, saldo in saldos:
+        parte = min(total, saldo)
+        total -= parte
+        alocacoes.append((sessao_id, parte, parte == saldo))
+    return alocacoes, total
+
+# POST /pagamentos/lote → um pagamento cobrindo várias sessões, em uma transação
+@pagamentos_bp.route("/lote", methods=["POST"])
+@jwt_required()
+def create_pagamento_em_lote():
+    data = request.get_json() or {}
+    sessao_ids = data.get("sessao_ids")
+    # bool é subclasse de int: true/false não são ids
+    if not isinstance(sessao_ids, list) or not sessao_ids or not all(
+        isinstance(i, int) and not isinstance(i, bool) for i in sessao_ids
+    ):
+        return jsonify({"erro": "Informe 'sessao_ids' como uma lista de ids de sessões."}), 400
+    sessao_ids = list(dict.fromkeys(sessao_ids))
+
+    linhas = saldos_das_sessoes(sessao_ids)
+    faltando = set(sessao_ids) - {linha.id for linha in linhas}
+    if faltando:
+        db.session.rollback()
+        return jsonify({"erro": "Sessões não encontradas.", "sessoes": sorted(faltando)}), 404
+
+    ja_pagas = [linha.id for linha in linhas if linha.foi_paga]
+    if ja_pagas:
+        db.session.rollback()
+        return jsonify({"erro": "Há sessões já pagas no lote.", "sessoes": ja_pagas}), 409
+
+    # Sessão sem valor definido não tem o que quitar: fica de fora e volta no relatório
+    sem_valor = [linha.id for linha in linhas if linha.valor is None]
+    saldos = [
+        (linha.id, max(Decimal(linha.valor) - Decimal(linha[3]), Decimal(0)))
+        for linha in linhas if linha.valor is not None
+    ]
+    devido = sum((saldo for _, saldo in saldos), Decimal(0))
+    try:
+        total = Decimal(str(data["valor_pago"])) if data.get("valor_pago") is not None else devido
+    except InvalidOperation:
+        total = None
+    if total is None or not total.is_finite():  # "NaN" e "Infinity" são Decimals válidos
+        db.session.rollback()
+        return jsonify({"erro": "'valor_pago' inválido."}), 400
+    if total < 0:
+        db.session.rollback()
+        return jsonify({"erro": "'valor_pago' não pode ser negativo."}), 400
+
+    alocacoes, sobra = alocar(total, saldos)
+    if sobra > 0:
+        db.session.rollback()
+        return jsonify({
+            "erro": "O valor pago é maior que o devido pelas sessões.",
+            "devido": float(devido)
+        }), 400
+
+    pagamentos = []
+    linhas_pagamento = [{
+        "sessao_id": sessao_id,
+        "valor_pago": valor,
+        "forma_pagamento": data.get("forma_pagamento"),
+        "observacoes": data.get("observacoes"),
+    } for sessao_id, valor, _ in alocacoes if valor > 0]
+    if linhas_pagamento:
+        pagamentos = db.session.execute(
+            insert(Pagamento).returning(*colunas(Pagamento)), linhas_pagamento
+        ).all()
+
+    quitadas = [sessao_id for sessao_id, _, quitada in alocacoes if quitada]
+    if quitadas:
+        db.session.execute(update(Sessao).where(Sessao.id.in_(quitadas)).values(foi_paga=True))
+    db.session.commit()
+
+    return resposta_json({
+        "pagamentos": serializar(Pagamento, pagamentos),
+        "sessoes_pagas": quitadas,
+        "sessoes_parciais": [sessao_id for sessao_id, valor, quitada in alocacoes if valor > 0 and not quitada],
+        "sessoes_sem_valor": sem_valor,
+        "valor_alocado": float(total),
+        "devido": float(devido),
+    }), 201
+
 # PUT /pagamentos/<id>
 @pagamentos_bp.route("/<int:id>", methods=["PUT"])
 @jwt_required()
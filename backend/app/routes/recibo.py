@@ -1,7 +1,9 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, send_file
 from flask_jwt_extended import jwt_required
 from app.models.sessao import Sessao
-from datetime import datetime
+from app.services.recibos_lote import gerar_lote, compactar
+from datetime import date, datetime
+import io
 
 recibos_bp = Blueprint("recibos", __name__, url_prefix="/recibos")
 
@@ -40,4 +42,29 @@ def preview_recibo(id):
         })
 
     except Exception as e:
-        return jsonify({"erro": "Erro ao buscar recibo", "detalhes": str(e)}), 500
\ No newline at end of file
+        return jsonify({"erro": "Erro ao buscar recibo", "detalhes": str(e)}), 500
+
+# GET /recibos/lote?mes=&ano= → zip com o recibo em PDF de cada cliente
+@recibos_bp.route("/lote", methods=["GET"])
+@jwt_required()
+def recibos_em_lote():
+    mes = request.args.get("mes", type=int)
+    ano = request.args.get("ano", type=int)
+
+    if not mes or not ano:
+        return jsonify({"erro": "Parâmetros 'mes' e 'ano' são obrigatórios."}), 400
+    if not 1 <= mes <= 12:
+        return jsonify({"erro": "Parâmetro 'mes' deve estar entre 1 e 12."}), 400
+    if not 1 <= ano < date.max.year:  # o fim do período é o primeiro dia do mês seguinte
+        return jsonify({"erro": f"Parâmetro 'ano' deve estar entre 1 e {date.max.year - 1}."}), 400
+
+    arquivos, relatorio = gerar_lote(mes, ano)
+    resposta = send_file(
+        io.BytesIO(compactar(arquivos)),
+        mimetype="application/zip",
+        as_attachment=True,
+        download_name=f"recibos-{ano}-{mes:02d}.zip"
+    )
+    resposta.headers["X-Recibos-Renderizados"] = str(relatorio["renderizados"])
+    resposta.headers["X-Recibos-Cache"] = str(relatorio["em_cache"])
+    return resposta
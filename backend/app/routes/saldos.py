@@ -0,0 +1,40 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app import db
+from app.models.cliente import Cliente
+from app.models.saldo_cliente import SaldoCliente
+
+saldos_bp = Blueprint("saldos", __name__, url_prefix="/saldos")
+
+LIMITE_PADRAO = 100
+LIMITE_MAXIMO = 1000
+
+# GET /saldos/devedores?limite= → clientes com valor em aberto, do maior para o menor
+@saldos_bp.route("/devedores", methods=["GET"])
+@jwt_required()
+def listar_devedores():
+    limite = min(request.args.get("limite", LIMITE_PADRAO, type=int), LIMITE_MAXIMO)
+
+    # Lê só a tabela de resumo (uma linha por cliente), nunca as sessões
+    linhas = db.session.query(SaldoCliente, Cliente.nome, Cliente.telefone).join(
+        Cliente, Cliente.id == SaldoCliente.cliente_id
+    ).filter(SaldoCliente.em_aberto > 0).order_by(
+        SaldoCliente.em_aberto.desc(), Cliente.nome
+    ).limit(limite).all()
+
+    return jsonify([
+        {**saldo.to_dict(), "nome": nome, "telefone": telefone}
+        for saldo, nome, telefone in linhas
+    ])
+
+# GET /saldos/cliente/<id>
+@saldos_bp.route("/cliente/<int:cliente_id>", methods=["GET"])
+@jwt_required()
+def saldo_do_cliente(cliente_id):
+    saldo = db.session.get(SaldoCliente, cliente_id)
+    if saldo is None:
+        Cliente.query.get_or_404(cliente_id)
+        return jsonify(SaldoCliente(
+            cliente_id=cliente_id, total_faturado=0, total_pago=0, em_aberto=0, sessoes_em_aberto=0
+        ).to_dict())
+    return jsonify(saldo.to_dict())
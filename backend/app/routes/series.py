@@ -0,0 +1,138 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app import db
+from app.models.sessao import Sessao
+from app.models.serie_repeticao import SerieRepeticao
+from app.services.conflitos_sessoes import encontrar_conflitos, conflitos_para_json, como_data, como_horario
+from app.services.recorrencia_sessoes import dias_da_frequencia
+from app.services.series_repeticao import agenda, materializar
+from datetime import date, timedelta
+
+series_bp = Blueprint("series", __name__, url_prefix="/series")
+
+# Janela usada para checar conflitos de uma série sem data de término
+HORIZONTE_CONFLITOS = timedelta(days=365)
+
+CAMPOS_SERIE = [
+    "tipo_atendimento", "frequencia", "horario", "valor",
+    "observacoes", "data_inicio", "data_fim"
+]
+
+def aplicar_campos(serie, data):
+    conversores = {"horario": como_horario, "data_inicio": como_data, "data_fim": como_data}
+    for campo in CAMPOS_SERIE:
+        if campo in data:
+            setattr(serie, campo, conversores.get(campo, lambda v: v)(data[campo]))
+
+def conflitos_da_serie(serie):
+    fim = serie.data_fim or serie.data_inicio + HORIZONTE_CONFLITOS
+    slots = [(d, serie.horario) for d in serie.ocorrencias(max(serie.data_inicio, date.today()), fim)]
+    return encontrar_conflitos(slots, ignorar_repeticao_id=serie.id)
+
+# GET /series/agenda?inicio=&fim=&cliente_id=
+@series_bp.route("/agenda", methods=["GET"])
+@jwt_required()
+def get_agenda():
+    try:
+        inicio = date.fromisoformat(request.args["inicio"])
+        fim = date.fromisoformat(request.args["fim"])
+    except (KeyError, ValueError):
+        return jsonify({"erro": "Parâmetros 'inicio' e 'fim' (AAAA-MM-DD) são obrigatórios."}), 400
+
+    return jsonify(agenda(inicio, fim, request.args.get("cliente_id", type=int)))
+
+# GET /series/<id>
+@series_bp.route("/<string:id>", methods=["GET"])
+@jwt_required()
+def get_serie(id):
+    serie = SerieRepeticao.query.get_or_404(id)
+    return jsonify(serie.to_dict())
+
+# POST /series/
+@series_bp.route("/", methods=["POST"])
+@jwt_required()
+def create_serie():
+    data = request.get_json()
+    if dias_da_frequencia(data.get("frequencia")) <= 0:
+        return jsonify({"erro": "Frequência deve ser semanal, quinzenal ou mensal."}), 400
+
+    serie = SerieRepeticao(cliente_id=data["cliente_id"])
+    aplicar_campos(serie, data)
+
+    conflitos = conflitos_da_serie(serie)
+    if conflitos:
+        return jsonify({
+            "erro": "Com a frequência selecionada vai haver conflitos de horário no futuro, selecione outra frequência e/ou horário",
+            "conflitos": conflitos_para_json(conflitos)
+        }), 400
+
+    db.session.add(serie)
+    db.session.commit()
+    return jsonify(serie.to_dict()), 201
+
+# PUT /series/<id> → altera a regra; vale para todas as ocorrências ainda não gravadas
+@series_bp.route("/<string:id>", methods=["PUT"])
+@jwt_required()
+def update_serie(id):
+    serie = SerieRepeticao.query.get_or_404(id)
+    data = request.get_json()
+    if "frequencia" in data and dias_da_frequencia(data["frequencia"]) <= 0:
+        return jsonify({"erro": "Frequência deve ser semanal, quinzenal ou mensal."}), 400
+
+    aplicar_campos(serie, data)
+
+    conflitos = conflitos_da_serie(serie)
+    if conflitos:
+        db.session.rollback()
+        return jsonify({
+            "erro": "Com a alteração haverá conflitos de sessões futuras.",
+            "conflitos": conflitos_para_json(conflitos)
+        }), 400
+
+    db.session.commit()
+    return jsonify(serie.to_dict())
+
+# DELETE /series/<id> → remove a regra; sessões já gravadas são mantidas
+@series_bp.route("/<string:id>", methods=["DELETE"])
+@jwt_required()
+def delete_serie(id):
+    serie = SerieRepeticao.query.get_or_404(id)
+    db.session.delete(serie)
+    db.session.commit()
+    return jsonify({"mensagem": "Série excluída com sucesso."})
+
+# POST /series/<id>/ocorrencias/<data> → grava uma ocorrência para realizar, pagar ou editar
+@series_bp.route("/<string:id>/ocorrencias/<data_ocorrencia>", methods=["POST"])
+@jwt_required()
+def materializar_ocorrencia(id, data_ocorrencia):
+    serie = SerieRepeticao.query.get_or_404(id)
+    try:
+        data_ocorrencia = date.fromisoformat(data_ocorrencia)
+    except ValueError:
+        return jsonify({"erro": "Data da ocorrência inválida."}), 400
+
+    if data_ocorrencia not in serie.ocorrencias(data_ocorrencia, data_ocorrencia):
+        return jsonify({"erro": "A série não tem ocorrência nessa data."}), 404
+
+    existente = Sessao.query.filter_by(repeticao_id=serie.id, data_ocorrencia=data_ocorrencia).first()
+    if existente:
+        return jsonify({"erro": "Ocorrência já gravada.", "sessao": existente.to_dict()}), 409
+
+    sessao = materializar(serie, data_ocorrencia)
+    data = request.get_json(silent=True) or {}
+    conversores = {"data": como_data, "horario": como_horario}
+    for campo in ["data", "horario", "foi_realizada", "foi_paga", "valor", "observacoes"]:
+        if campo in data:
+            setattr(sessao, campo, conversores.get(campo, lambda v: v)(data[campo]))
+
+    if sessao.data != data_ocorrencia or sessao.horario != serie.horario:
+        conflitos = encontrar_conflitos([(sessao.data, sessao.horario)], ignorar_repeticao_id=serie.id)
+        if conflitos:
+            return jsonify({
+                "erro": "Já existe uma sessão cadastrada para esse horário",
+                "conflitos": conflitos_para_json(conflitos)
+            }), 400
+
+    db.session.add(sessao)
+    db.session.commit()
+    return jsonify(sessao.to_dict()), 201
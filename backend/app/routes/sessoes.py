@@ -1,60 +1,143 @@
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models.sessao import Sessao
+from app.models.serie_repeticao import SerieRepeticao
 from flask_jwt_extended import jwt_required
-from datetime import datetime, timedelta, date
+from datetime import datetime, date, time
+import base64
+import binascii
+import heapq
 import uuid
-import unicodedata
-from sqlalchemy import and_
+from time import perf_counter
+from sqlalchemy import and_, tuple_, insert, update
+from app.services.conflitos_sessoes import (
+    encontrar_conflitos, conflitos_para_json, como_data, como_horario
+)
+from app.services.recorrencia_sessoes import datas_repeticao, dias_da_frequencia
+from app.services.requisicao_condicional import resposta_condicional
+from app.services.series_repeticao import ocorrencias_como_linhas
+from app.services.serializacao import consultar, serializar, resposta_lista, resposta_json, formato_colunar
 
 sessoes_bp = Blueprint("sessoes", __name__, url_prefix="/sessoes")
 
-# Função auxiliar para calcular o próximo dia
-FREQ_MAP = {
-    "semanal": 7,
-    "quinzenal": 14,
-    "mensal": 30,
-    "avulsa": 0,
-}
-
-def normalizar_dia_semana(nome_dia):
-    return unicodedata.normalize("NFKD", nome_dia).encode("ASCII", "ignore").decode("ASCII").lower()
-
-def gerar_repeticoes(sessao, quantidade=8):
-    sessoes_geradas = []
-    dias = FREQ_MAP.get(normalizar_dia_semana(sessao.frequencia), 0)
-    if dias <= 0:
-        return []
-
-    data_base = datetime.fromisoformat(sessao.data)
-    dia_semana_alvo = data_base.weekday()  # 0 = segunda, 6 = domingo
-    for i in range(1, quantidade):
-        nova_data_base = data_base + timedelta(days=dias * i)
-        while nova_data_base.weekday() != dia_semana_alvo:
-            nova_data_base -= timedelta(days=1)
-        nova_data = nova_data_base
-        nova_sessao = Sessao(
-            cliente_id=sessao.cliente_id,
-            data=nova_data.date().isoformat(),
-            tipo_atendimento=sessao.tipo_atendimento,
-            frequencia=sessao.frequencia,
-            horario=sessao.horario,
-            foi_realizada=False,
-            foi_paga=False,
-            valor=sessao.valor,
-            observacoes=sessao.observacoes,
-            repeticao_id=sessao.repeticao_id
-        )
-        db.session.add(nova_sessao)
-        sessoes_geradas.append(nova_sessao)
-    return sessoes_geradas
-
-# GET /sessoes/
+QUANTIDADE_PADRAO = 8
+QUANTIDADE_MAXIMA = 260  # cinco anos de sessões semanais
+
+def gerar_repeticoes(sessao, quantidade=QUANTIDADE_PADRAO):
+    """Linhas das ocorrências futuras da série de `sessao`, prontas para um INSERT em massa."""
+    return [{
+        "cliente_id": sessao.cliente_id,
+        "data": nova_data,
+        "tipo_atendimento": sessao.tipo_atendimento,
+        "frequencia": sessao.frequencia,
+        "horario": sessao.horario,
+        "foi_realizada": False,
+        "foi_paga": False,
+        "valor": sessao.valor,
+        "observacoes": sessao.observacoes,
+        "repeticao_id": sessao.repeticao_id,
+        "criado_em": datetime.utcnow(),
+    } for nova_data in datas_repeticao(sessao.data, sessao.frequencia, quantidade)]
+
+LIMITE_PADRAO = 500
+LIMITE_MAXIMO = 2000
+
+def parse_bool(valor):
+    return str(valor).strip().lower() in ("1", "true", "sim")
+
+def chave_da_linha(sessao):
+    """Posição na listagem: (data, horario, id, série). Ocorrências não gravadas têm id 0
+    e vêm antes das gravadas no mesmo horário, desempatadas pela série."""
+    if sessao.id is None:
+        return sessao.data, sessao.horario, 0, sessao.repeticao_id
+    return sessao.data, sessao.horario, sessao.id, ""
+
+def codificar_cursor(sessao):
+    data, horario, id_, serie = chave_da_linha(sessao)
+    bruto = f"{data.isoformat()}|{horario.isoformat()}|{id_}|{serie}"
+    return base64.urlsafe_b64encode(bruto.encode()).decode()
+
+def decodificar_cursor(cursor):
+    partes = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    data_str, horario_str, id_str = partes[:3]
+    serie = partes[3] if len(partes) > 3 else ""  # cursores antigos não têm a série
+    return date.fromisoformat(data_str), time.fromisoformat(horario_str), int(id_str), serie
+
+# GET /sessoes/?inicio=&fim=&cliente_id=&tipo_atendimento=&foi_realizada=&foi_paga=&limite=&cursor=
+# Sem parâmetros devolve a lista completa (formato antigo); com qualquer filtro
+# devolve uma página ordenada por (data, horario, id) e o cursor da próxima.
+# Com `fim`, a página inclui as ocorrências das séries (SerieRepeticao) ainda não
+# gravadas, com `id` nulo; elas nunca estão realizadas nem pagas.
 @sessoes_bp.route("/", methods=["GET"])
 @jwt_required()
 def get_all_sessoes():
-    sessoes = Sessao.query.all()
-    return jsonify([s.to_dict() for s in sessoes])
+    return resposta_condicional((Sessao, SerieRepeticao), listar_sessoes)
+
+def listar_sessoes():
+    if not request.args.keys() - {"formato"}:
+        return resposta_lista(Sessao, consultar(Sessao))
+
+    try:
+        inicio = request.args.get("inicio")
+        fim = request.args.get("fim")
+        cursor = request.args.get("cursor")
+        limite = min(request.args.get("limite", LIMITE_PADRAO, type=int), LIMITE_MAXIMO)
+
+        inicio = date.fromisoformat(inicio) if inicio else None
+        fim = date.fromisoformat(fim) if fim else None
+        cursor = decodificar_cursor(cursor) if cursor else None
+
+        filtros = []
+        if inicio:
+            filtros.append(Sessao.data >= inicio)
+        if fim:
+            filtros.append(Sessao.data <= fim)
+        if cursor:
+            filtros.append(tuple_(Sessao.data, Sessao.horario, Sessao.id) > tuple_(*cursor[:3]))
+    except (ValueError, binascii.Error):
+        return jsonify({"erro": "Parâmetros 'inicio', 'fim' ou 'cursor' inválidos."}), 400
+
+    if limite <= 0:
+        return jsonify({"erro": "O parâmetro 'limite' deve ser positivo."}), 400
+
+    cliente_id = request.args.get("cliente_id", type=int)
+    tipo_atendimento = request.args.get("tipo_atendimento")
+    if cliente_id:
+        filtros.append(Sessao.cliente_id == cliente_id)
+    if tipo_atendimento:
+        filtros.append(Sessao.tipo_atendimento == tipo_atendimento)
+    incluir_series = fim is not None
+    for campo in ("foi_realizada", "foi_paga"):
+        if campo in request.args:
+            valor = parse_bool(request.args[campo])
+            filtros.append(getattr(Sessao, campo) == valor)
+            incluir_series = incluir_series and not valor
+
+    sessoes = consultar(
+        Sessao, *filtros,
+        ordem=(Sessao.data.asc(), Sessao.horario.asc(), Sessao.id.asc()),
+        limite=limite + 1
+    )
+
+    if incluir_series:
+        # A série só é expandida a partir do cursor: páginas seguintes não recalculam as anteriores
+        de = max(inicio or date.min, cursor[0]) if cursor else inicio
+        calculadas = [
+            linha for linha in ocorrencias_como_linhas(de, fim, cliente_id, tipo_atendimento)
+            if not cursor or chave_da_linha(linha) > cursor
+        ]
+        if calculadas:
+            sessoes = heapq.nsmallest(limite + 1, [*sessoes, *calculadas], key=chave_da_linha)
+
+    proximo_cursor = None
+    if len(sessoes) > limite:
+        sessoes = sessoes[:limite]
+        proximo_cursor = codificar_cursor(sessoes[-1])
+
+    return resposta_json({
+        "sessoes": serializar(Sessao, sessoes, formato_colunar()),
+        "proximo_cursor": proximo_cursor,
+    })
 
 # GET /sessoes/<id>
 @sessoes_bp.route("/<int:id>", methods=["GET"])
@@ -67,8 +150,7 @@ def get_sessao_by_id(id):
 @sessoes_bp.route("/cliente/<int:cliente_id>", methods=["GET"])
 @jwt_required()
 def get_sessoes_by_cliente(cliente_id):
-    sessoes = Sessao.query.filter_by(cliente_id=cliente_id).all()
-    return jsonify([s.to_dict() for s in sessoes])
+    return resposta_lista(Sessao, consultar(Sessao, Sessao.cliente_id == cliente_id))
 
 # POST /sessoes/
 @sessoes_bp.route("/", methods=["POST"])
@@ -76,22 +158,8 @@ def get_sessoes_by_cliente(cliente_id):
 def create_sessao():
     data = request.get_json()
 
-    # Converte para datetime
-    data_str = data["data"]
-    horario_str = data["horario"]
-    data_horario = datetime.fromisoformat(f"{data_str}T{horario_str}")
-    uma_hora_antes = data_horario - timedelta(hours=1)
-    uma_hora_depois = data_horario + timedelta(hours=1)
-
-    conflito = Sessao.query.filter(
-        Sessao.data == data_str,
-        Sessao.horario >= uma_hora_antes.time().isoformat(),
-        Sessao.horario <= uma_hora_depois.time().isoformat()
-    ).first()
-
-    if conflito:
-        return jsonify({"erro": "Já existe uma sessão cadastrada para esse horário"}), 400
-
+    # As repetições ainda são gravadas como linhas; séries novas só viram SerieRepeticao por
+    # /series/, até renovar-sessoes e as edições em cadeia passarem a trabalhar sobre a regra
     # Verifica se já existe sessão com mesmo cliente_id e tipo_atendimento
     sessao_existente = Sessao.query.filter_by(
         cliente_id=data["cliente_id"],
@@ -103,54 +171,70 @@ def create_sessao():
     else:
         repeticao_id = None
 
+    # Quantidade total de sessões da série (incluindo a principal)
+    quantidade = request.args.get("quantidade", data.get("quantidade_repeticoes", QUANTIDADE_PADRAO), type=int)
+    if not 1 <= quantidade <= QUANTIDADE_MAXIMA:
+        return jsonify({"erro": f"A quantidade de repetições deve estar entre 1 e {QUANTIDADE_MAXIMA}."}), 400
+
     # Cria a sessão principal
     sessao = Sessao(
         cliente_id=data["cliente_id"],
-        data=data["data"],
+        data=como_data(data["data"]),
         tipo_atendimento=data["tipo_atendimento"],
         frequencia=data["frequencia"],
-        horario=data["horario"],
+        horario=como_horario(data["horario"]),
         foi_realizada=data.get("foi_realizada", False),
         foi_paga=data.get("foi_paga", False),
         valor=data.get("valor"),
         observacoes=data.get("observacoes"),
         repeticao_id=repeticao_id
     )
-    db.session.add(sessao)
-
-    # Geração das futuras e verificação de conflito real
-    if repeticao_id:
-        sessoes_repetidas = gerar_repeticoes(sessao)
-        datas_horarios_atuais = {(s.data, s.horario) for s in sessoes_repetidas}
-        datas_horarios_atuais.add((sessao.data, sessao.horario))
-
-        for s in sessoes_repetidas:
-            data_horario = datetime.fromisoformat(f"{s.data}T{s.horario}")
-            uma_hora_antes = data_horario - timedelta(hours=1)
-            uma_hora_depois = data_horario + timedelta(hours=1)
-
-            conflitos = Sessao.query.filter(
-                Sessao.data == s.data,
-                Sessao.horario >= uma_hora_antes.time().isoformat(),
-                Sessao.horario <= uma_hora_depois.time().isoformat()
-            ).all()
-
-            for c in conflitos:
-                if (c.data, c.horario) not in datas_horarios_atuais:
-                    return jsonify({
-                        "erro": "Com a frequência selecionada vai haver conflitos de horário no futuro, selecione outra frequência e/ou horário"
-                    }), 400
 
-        for s in sessoes_repetidas:
-            db.session.add(s)
+    sessoes_repetidas = gerar_repeticoes(sessao, quantidade) if repeticao_id else []
+
+    # Uma única verificação de conflito para a sessão principal e todas as futuras
+    slot_principal = (sessao.data, sessao.horario)
+    conflitos = encontrar_conflitos(
+        [slot_principal] + [(s["data"], s["horario"]) for s in sessoes_repetidas]
+    )
+
+    if slot_principal in conflitos:
+        return jsonify({
+            "erro": "Já existe uma sessão cadastrada para esse horário",
+            "conflitos": conflitos_para_json(conflitos)
+        }), 400
+
+    if conflitos:
+        return jsonify({
+            "erro": "Com a frequência selecionada vai haver conflitos de horário no futuro, selecione outra frequência e/ou horário",
+            "conflitos": conflitos_para_json(conflitos)
+        }), 400
+
+    if sessoes_repetidas:
+        # A principal e todas as futuras em um único INSERT em massa. O id da principal sai do
+        # RETURNING pela data, única na série: pedir o RETURNING na ordem das linhas
+        # (sort_by_parameter_order) faz o SQLite voltar a um INSERT por linha
+        sessao.criado_em = datetime.utcnow()
+        principal = {**sessoes_repetidas[0], "data": sessao.data, "foi_realizada": sessao.foi_realizada,
+                     "foi_paga": sessao.foi_paga, "criado_em": sessao.criado_em}
+        gravadas = db.session.execute(
+            insert(Sessao).returning(Sessao.id, Sessao.data), [principal] + sessoes_repetidas
+        ).all()
+        sessao.id = next(id_ for id_, data_gravada in gravadas if data_gravada == sessao.data)
+    else:
+        db.session.add(sessao)
+        db.session.flush()
 
+    # Serializada antes do commit, que expira o objeto e forçaria um SELECT para recarregá-lo
+    corpo = sessao.to_dict()
     db.session.commit()
-    return jsonify(sessao.to_dict()), 201
+    return jsonify(corpo), 201
 
 # PUT /sessoes/<id>
 @sessoes_bp.route("/<int:id>", methods=["PUT"])
 @jwt_required()
 def update_sessao(id):
+    inicio = perf_counter()
     sessao = Sessao.query.get_or_404(id)
     data = request.get_json()
     atualizar_futuras_frequencias = data.get("atualizar_futuras_frequencias", False)
@@ -159,149 +243,129 @@ def update_sessao(id):
 
     data_original = sessao.data  # salva a data antes de atualizar
 
-    # NOVO BLOCO: verificar conflito do novo horário
+    # Verificar conflito do novo horário
     nova_data = data.get("data", sessao.data)
     novo_horario = data.get("horario", sessao.horario)
-    nova_datahora = datetime.fromisoformat(f"{nova_data}T{novo_horario}")
-    uma_hora_antes = nova_datahora - timedelta(hours=1)
-    uma_hora_depois = nova_datahora + timedelta(hours=1)
-
-    conflito = Sessao.query.filter(
-        Sessao.id != sessao.id,
-        Sessao.data == nova_data,
-        Sessao.horario >= uma_hora_antes.time().isoformat(),
-        Sessao.horario <= uma_hora_depois.time().isoformat()
-    ).first()
-
+    conflitos = encontrar_conflitos([(nova_data, novo_horario)], ignorar_ids={sessao.id})
 
-    if conflito:
-        return jsonify({"erro": "Já existe uma sessão cadastrada para esse horário"}), 400
+    if conflitos:
+        return jsonify({
+            "erro": "Já existe uma sessão cadastrada para esse horário",
+            "conflitos": conflitos_para_json(conflitos)
+        }), 400
 
     # Atualiza os campos da sessão principal
     campos = [
         "data", "tipo_atendimento", "frequencia", "horario",
         "foi_realizada", "foi_paga", "valor", "observacoes"
     ]
+    conversores = {"data": como_data, "horario": como_horario}
     for campo in campos:
         if campo in data:
-            setattr(sessao, campo, data[campo])
+            setattr(sessao, campo, conversores.get(campo, lambda v: v)(data[campo]))
 
     # Se tiver futuras e for atualizar...
+    futuras_atualizadas = 0
     if sessao.repeticao_id:
-        sessoes_futuras = Sessao.query.filter(
+        filtro_futuras = and_(
             Sessao.repeticao_id == sessao.repeticao_id,
             Sessao.id != sessao.id,
             Sessao.data > data_original
-        ).order_by(Sessao.data.asc()).all()
+        )
+        # Só as colunas necessárias; as alterações são gravadas em massa no final
+        sessoes_futuras = db.session.query(
+            Sessao.id, Sessao.data, Sessao.horario
+        ).filter(filtro_futuras).order_by(Sessao.data.asc()).all()
+        ids_futuras = {s.id for s in sessoes_futuras}
+
+        novas_datas = [s.data for s in sessoes_futuras]
+        novos_horarios = [s.horario for s in sessoes_futuras]
+        valores_comuns = {}  # colunas com o mesmo valor em todas as futuras
+        datas_alteradas = False
+
+        data_base = como_data(sessao.data)
 
         # Se frequência vai mudar
         if atualizar_futuras_frequencias and "frequencia" in data:
-            dias_frequencia = FREQ_MAP.get(normalizar_dia_semana(data["frequencia"]), 0)
-            if dias_frequencia > 0:
-                sessoes_futuras.sort(key=lambda s: s.data)
-                data_base = datetime.fromisoformat(sessao.data)
-                dia_semana_alvo = data_base.weekday()
-
-                for i, futura in enumerate(sessoes_futuras):
-                    futura.frequencia = data["frequencia"]
-                    nova_data_base = data_base + timedelta(days=dias_frequencia * (i + 1))
-                    while nova_data_base.weekday() != dia_semana_alvo:
-                        nova_data_base -= timedelta(days=1)
-                    nova_data = nova_data_base.date().isoformat()
-
-                    # NOVO: checar conflitos antes de aplicar
-                    nova_datahora = datetime.fromisoformat(f"{nova_data}T{sessao.horario}")
-                    uma_hora_antes = nova_datahora - timedelta(hours=1)
-                    uma_hora_depois = nova_datahora + timedelta(hours=1)
-
-                    conflito = Sessao.query.filter(
-                        Sessao.data == nova_data,
-                        Sessao.horario >= uma_hora_antes.time().isoformat(),
-                        Sessao.horario <= uma_hora_depois.time().isoformat(),
-                        Sessao.id != futura.id,
-                        Sessao.repeticao_id != sessao.repeticao_id  # IGNORA sessões da mesma repetição
-                    ).first()
-
-                    if conflito:
-                        return jsonify({
-                            "erro": "Com a frequência selecionada vai haver conflitos de horário no futuro, selecione outra frequência e/ou horário"
-                        }), 400
-
-                    futura.data = nova_data
+            if dias_da_frequencia(data["frequencia"]) > 0:
+                datas_calculadas = datas_repeticao(data_base, data["frequencia"], len(sessoes_futuras) + 1)
+
+                # Checar conflitos de todas as futuras antes de aplicar
+                conflitos = encontrar_conflitos(
+                    [(d, sessao.horario) for d in datas_calculadas],
+                    ignorar_ids=ids_futuras,
+                    ignorar_repeticao_id=sessao.repeticao_id  # IGNORA sessões da mesma repetição
+                )
+
+                if conflitos:
+                    return jsonify({
+                        "erro": "Com a frequência selecionada vai haver conflitos de horário no futuro, selecione outra frequência e/ou horário",
+                        "conflitos": conflitos_para_json(conflitos)
+                    }), 400
+
+                novas_datas = datas_calculadas
+                valores_comuns["frequencia"] = data["frequencia"]
+                datas_alteradas = True
 
         # Se horário e/ou data vão mudar
         if atualizar_futuras_data_horario:
             if "horario" in data:
-                for futura in sessoes_futuras:
-                    nova_datahora = datetime.fromisoformat(f"{futura.data}T{data['horario']}")
-                    uma_hora_antes = nova_datahora - timedelta(hours=1)
-                    uma_hora_depois = nova_datahora + timedelta(hours=1)
-
-                    conflito = Sessao.query.filter(
-                        Sessao.data == futura.data,
-                        Sessao.horario >= uma_hora_antes.time().isoformat(),
-                        Sessao.horario <= uma_hora_depois.time().isoformat(),
-                        Sessao.id != futura.id
-                    ).first()
+                conflitos = encontrar_conflitos(
+                    [(d, sessao.horario) for d in novas_datas],
+                    ignorar_ids=ids_futuras | {sessao.id}
+                )
 
-                    if conflito:
-                        return jsonify({
-                            "erro": "Com o novo horário haverá conflitos de sessões futuras. Altere o horário ou desmarque a atualização em cadeia."
-                        }), 400
+                if conflitos:
+                    return jsonify({
+                        "erro": "Com o novo horário haverá conflitos de sessões futuras. Altere o horário ou desmarque a atualização em cadeia.",
+                        "conflitos": conflitos_para_json(conflitos)
+                    }), 400
 
-                    futura.horario = data["horario"]
+                novos_horarios = [sessao.horario] * len(sessoes_futuras)
+                valores_comuns["horario"] = sessao.horario
 
             if "data" in data:
-                from dateutil.parser import parse
-                dias_frequencia = FREQ_MAP.get(normalizar_dia_semana(sessao.frequencia), 0)
-                data_base = datetime.fromisoformat(sessao.data)
-                dia_semana_alvo = data_base.weekday()
-
-                for i, futura in enumerate(sessoes_futuras):
-                    try:
-                        if isinstance(futura.data, datetime):
-                            futura_data_date = futura.data.date()
-                        elif isinstance(futura.data, str):
-                            futura_data_date = parse(futura.data).date()
-                        elif isinstance(futura.data, date):
-                            futura_data_date = futura.data
-                        else:
-                            raise ValueError(f"Tipo inesperado para futura.data: {type(futura.data)}")
-                    except Exception as e:
-                        raise
-
-                    nova_data_base = data_base + timedelta(days=dias_frequencia * (i + 1))
-                    while nova_data_base.weekday() != dia_semana_alvo:
-                        nova_data_base -= timedelta(days=1)
-                    nova_data = nova_data_base
-
-                    nova_data_str = nova_data.date().isoformat()
-
-                    nova_datahora = datetime.fromisoformat(f"{nova_data_str}T{futura.horario}")
-                    uma_hora_antes = nova_datahora - timedelta(hours=1)
-                    uma_hora_depois = nova_datahora + timedelta(hours=1)
-
-                    conflito = Sessao.query.filter(
-                        Sessao.data == nova_data,
-                        Sessao.horario >= uma_hora_antes.time().isoformat(),
-                        Sessao.horario <= uma_hora_depois.time().isoformat(),
-                        Sessao.id != futura.id,
-                        Sessao.repeticao_id != sessao.repeticao_id
-                    ).first()
-
-                    if conflito:
-                        return jsonify({
-                            "erro": "Com a nova data haverá conflitos de sessões futuras. Altere a data ou desmarque a atualização em cadeia."
-                        }), 400
-
-                    futura.data = nova_data.date().isoformat()
-
-    if atualizar_valores_futuros and sessao.repeticao_id and "valor" in data:
-        for futura in sessoes_futuras:
-            futura.valor = data["valor"]
+                datas_calculadas = datas_repeticao(data_base, sessao.frequencia, len(sessoes_futuras) + 1)
+
+                conflitos = encontrar_conflitos(
+                    list(zip(datas_calculadas, novos_horarios)),
+                    ignorar_ids=ids_futuras,
+                    ignorar_repeticao_id=sessao.repeticao_id
+                )
+
+                if conflitos:
+                    return jsonify({
+                        "erro": "Com a nova data haverá conflitos de sessões futuras. Altere a data ou desmarque a atualização em cadeia.",
+                        "conflitos": conflitos_para_json(conflitos)
+                    }), 400
+
+                if datas_calculadas:
+                    novas_datas = datas_calculadas
+                    datas_alteradas = True
+
+        if atualizar_valores_futuros and "valor" in data:
+            valores_comuns["valor"] = data["valor"]
+
+        if datas_alteradas:
+            # Uma data diferente por linha: um único executemany pela chave primária
+            db.session.execute(update(Sessao), [
+                {"id": s.id, "data": nova_data, **valores_comuns}
+                for s, nova_data in zip(sessoes_futuras, novas_datas)
+            ])
+            futuras_atualizadas = len(sessoes_futuras)
+        elif valores_comuns:
+            resultado = db.session.execute(
+                update(Sessao).where(filtro_futuras).values(**valores_comuns)
+                .execution_options(synchronize_session=False)
+            )
+            futuras_atualizadas = resultado.rowcount
 
     db.session.commit()
-    return jsonify(sessao.to_dict())
+    return jsonify({
+        **sessao.to_dict(),
+        "futuras_atualizadas": futuras_atualizadas,
+        "tempo_ms": round((perf_counter() - inicio) * 1000, 1)
+    })
 
 # DELETE /sessoes/<id>?delete_all=true
 @sessoes_bp.route("/<int:id>", methods=["DELETE"])
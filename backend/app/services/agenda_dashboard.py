@@ -0,0 +1,49 @@
+from app import db
+from app.models.sessao import Sessao
+from app.models.cliente import Cliente
+from app.services.series_repeticao import Pendente, ocorrencias_pendentes
+from datetime import timedelta
+from sqlalchemy import and_, or_
+
+def dia_alvo_amanha(hoje):
+    if hoje.weekday() == 4:  # sexta-feira
+        return hoje + timedelta(days=3)
+    return hoje + timedelta(days=1)
+
+def sessoes_pendentes(inicio, fim):
+    """Sessões não realizadas entre `inicio` e `fim`, só com as colunas exibidas no dashboard.
+
+    Uma consulta com JOIN projetado (sem objetos Sessao/Cliente, então sem lazy load de
+    `sessao.cliente` por linha) traz as pendentes e, na mesma passada, as ocorrências de série
+    já gravadas na janela, que não são calculadas de novo; mais uma para as regras das séries.
+    """
+    pendente = and_(Sessao.data >= inicio, Sessao.data <= fim, Sessao.foi_realizada == False)
+    linhas = db.session.query(
+        Cliente.nome,
+        Cliente.telefone,
+        Sessao.data,
+        Sessao.horario,
+        Sessao.tipo_atendimento,
+        Sessao.repeticao_id,
+        Sessao.data_ocorrencia,
+        pendente.label("pendente")
+    ).join(Cliente, Sessao.cliente_id == Cliente.id).filter(or_(
+        pendente,
+        and_(Sessao.data_ocorrencia >= inicio, Sessao.data_ocorrencia <= fim)
+    )).order_by(Sessao.data.asc(), Sessao.horario.asc()).all()
+
+    gravadas = [Pendente(*linha[:5]) for linha in linhas if linha.pendente]
+    materializadas = {(linha.repeticao_id, linha.data_ocorrencia) for linha in linhas if linha.data_ocorrencia}
+    calculadas = ocorrencias_pendentes(inicio, fim, materializadas)
+    if not calculadas:
+        return gravadas
+    return sorted([*gravadas, *calculadas], key=lambda linha: (linha.data, linha.horario))
+
+def formatar_sessao(linha):
+    return {
+        "cliente": linha.nome,
+        "telefone": linha.telefone,
+        "data": linha.data.strftime("%d/%m/%Y"),
+        "horario": linha.horario.strftime("%H:%M"),
+        "tipo_atendimento": linha.tipo_atendimento
+    }
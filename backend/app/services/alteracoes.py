@@ -0,0 +1,76 @@
+from collections import namedtuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Quem acompanha as gravações das sessões do ORM (cache do dashboard, requisições condicionais,
+# saldos). Cada um diz o que uma gravação mudou; o acumulado na sessão é entregue no commit.
+Observador = namedtuple("Observador", "do_flush em_massa confirmar antes_do_commit")
+
+observadores = {}
+
+def chave(nome):
+    return f"alteracoes:{nome}"
+
+def observar(nome, do_flush, em_massa, confirmar, antes_do_commit=False):
+    """Registra um observador e liga os eventos da Session (uma vez só).
+
+    `do_flush(session, objetos)` e `em_massa(estado)` devolvem conjuntos com o que mudou;
+    `confirmar(session, itens)` recebe a união deles depois do commit, ou antes dele (ainda na
+    transação) com `antes_do_commit`. Um rollback descarta o acumulado.
+    """
+    observadores[nome] = Observador(do_flush, em_massa, confirmar, antes_do_commit)
+    for evento, funcao in [
+        ("after_flush", ao_dar_flush),
+        ("do_orm_execute", ao_executar_orm),
+        ("before_commit", antes_do_commit_da_sessao),
+        ("after_commit", ao_dar_commit),
+        ("after_soft_rollback", ao_dar_rollback),
+    ]:
+        if not event.contains(Session, evento, funcao):
+            event.listen(Session, evento, funcao)
+
+def observar_por_classe(nome, itens_da_classe, confirmar):
+    """Observador cujo resultado depende só das classes gravadas."""
+    def do_flush(session, objetos):
+        return set().union(*(itens_da_classe(classe) for classe in {type(obj) for obj in objetos}))
+
+    def em_massa(estado):
+        return itens_da_classe(estado.bind_mapper.class_)
+
+    observar(nome, do_flush, em_massa, confirmar)
+
+def acumular(session, nome, itens):
+    if itens:
+        session.info.setdefault(chave(nome), set()).update(itens)
+
+def entregar(session, nomes):
+    for nome in nomes:
+        itens = session.info.pop(chave(nome), None)
+        if itens:
+            observadores[nome].confirmar(session, itens)
+
+def ao_dar_flush(session, flush_context):
+    objetos = list(session.new) + list(session.dirty) + list(session.deleted)
+    if objetos:
+        for nome, observador in list(observadores.items()):
+            acumular(session, nome, observador.do_flush(session, objetos))
+
+def ao_executar_orm(estado):
+    # INSERT/UPDATE/DELETE em massa não passam pelo flush
+    if (estado.is_insert or estado.is_update or estado.is_delete) and estado.bind_mapper is not None:
+        for nome, observador in list(observadores.items()):
+            acumular(estado.session, nome, observador.em_massa(estado))
+
+def antes_do_commit_da_sessao(session):
+    nomes = [nome for nome, observador in observadores.items() if observador.antes_do_commit]
+    if nomes:
+        session.flush()  # o flush do próprio commit só acontece depois deste evento
+        entregar(session, nomes)
+
+def ao_dar_commit(session):
+    # Depois do commit: nenhuma requisição lê (e guarda em cache) dados ainda não gravados
+    entregar(session, [nome for nome, observador in observadores.items() if not observador.antes_do_commit])
+
+def ao_dar_rollback(session, transacao_anterior):
+    for nome in observadores:
+        session.info.pop(chave(nome), None)
@@ -0,0 +1,83 @@
+from flask import request
+from flask_sqlalchemy.session import Session as SessaoFlask
+from sqlalchemy.sql.dml import UpdateBase
+import os
+
+# Nome do bind da réplica de leitura em SQLALCHEMY_BINDS
+BIND_LEITURA = "leitura"
+
+# Marca em session.info de que a requisição só lê e pode usar a réplica
+SOMENTE_LEITURA = "somente_leitura"
+
+METODOS_DE_LEITURA = {"GET", "HEAD", "OPTIONS"}
+
+def _inteiro(nome, padrao):
+    valor = os.getenv(nome)
+    return int(valor) if valor not in (None, "") else padrao
+
+def _booleano(nome, padrao):
+    valor = os.getenv(nome)
+    if valor in (None, ""):
+        return padrao
+    return valor.strip().lower() in ("1", "true", "sim", "yes", "on")
+
+def opcoes_do_engine(url, statement_timeout=None):
+    """Perfil do engine lido do ambiente; o pool e os timeouts só se aplicam fora do SQLite."""
+    opcoes = {"pool_pre_ping": _booleano("DB_POOL_PRE_PING", True)}
+    if not url or url.startswith("sqlite"):
+        return opcoes
+
+    opcoes.update({
+        "pool_size": _inteiro("DB_POOL_SIZE", 5),
+        "max_overflow": _inteiro("DB_MAX_OVERFLOW", 10),
+        "pool_timeout": _inteiro("DB_POOL_TIMEOUT", 30),
+        # Recicla antes que o servidor ou o balanceador derrube conexões ociosas
+        "pool_recycle": _inteiro("DB_POOL_RECYCLE", 1800),
+    })
+
+    if url.startswith("postgresql"):
+        timeout = _inteiro("DB_STATEMENT_TIMEOUT", 30000) if statement_timeout is None else statement_timeout
+        connect_args = {"application_name": os.getenv("DB_APPLICATION_NAME", "gestao-atendimentos")}
+        if timeout:
+            # Em milissegundos; o Postgres cancela a consulta que passar disso
+            connect_args["options"] = f"-c statement_timeout={timeout}"
+        opcoes["connect_args"] = connect_args
+    return opcoes
+
+def configurar_banco(app):
+    """Preenche a configuração do Flask-SQLAlchemy: engine principal e réplica opcional.
+
+    Chaves já definidas (pelo `config` de create_app) são mantidas: só completa o que falta.
+    """
+    url = app.config["SQLALCHEMY_DATABASE_URI"]
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", opcoes_do_engine(url))
+
+    url_leitura = os.getenv("DATABASE_READ_URL")
+    if url_leitura and "SQLALCHEMY_BINDS" not in app.config:
+        timeout = _inteiro("DB_READ_STATEMENT_TIMEOUT", _inteiro("DB_STATEMENT_TIMEOUT", 30000))
+        app.config["SQLALCHEMY_BINDS"] = {
+            BIND_LEITURA: {"url": url_leitura, **opcoes_do_engine(url_leitura, timeout)},
+        }
+
+class SessaoRoteada(SessaoFlask):
+    """Sessão que manda as leituras de requisições GET para a réplica, se houver uma.
+
+    Flush, INSERT/UPDATE/DELETE e SELECT ... FOR UPDATE continuam indo para o banco principal.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get(SOMENTE_LEITURA) and not self._flushing:
+            escrita = isinstance(clause, UpdateBase) or getattr(clause, "_for_update_arg", None) is not None
+            replica = self._db.engines.get(BIND_LEITURA)
+            if replica is not None and not escrita:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def init_leitura(app, db):
+    if BIND_LEITURA not in app.config.get("SQLALCHEMY_BINDS", {}):
+        return
+
+    @app.before_request
+    def usar_replica_em_leituras():
+        if request.method in METODOS_DE_LEITURA:
+            db.session.info[SOMENTE_LEITURA] = True
@@ -0,0 +1,229 @@
+from app import db
+from app.models.cliente import Cliente
+from app.models.sessao import Sessao
+from app.models.pagamento import Pagamento
+from app.models.serie_repeticao import SerieRepeticao
+from app.services.cache_dashboard import limpar as limpar_cache_dashboard
+from app.services.renovacao_sessoes import renovar_sessoes_repetidas
+from datetime import date, datetime, time, timedelta
+from flask import current_app
+from flask_jwt_extended import create_access_token
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.engine import Engine
+from time import perf_counter
+import math
+import os
+import platform
+import tracemalloc
+
+# Sessões criadas pelo benchmark levam esta observação e são apagadas no fim
+MARCADOR = "benchmark-rotas"
+
+# Mudanças menores que isso são ruído, qualquer que seja a tolerância relativa
+FOLGA_MS = 1.0
+FOLGA_KB = 64
+
+class Caso:
+    """Uma rota (ou comando) medida; `chamar(cliente_http, contexto, rodada)` devolve o status."""
+
+    def __init__(self, nome, chamar, sem_cache=False):
+        self.nome = nome
+        self.chamar = chamar
+        self.sem_cache = sem_cache  # limpa o cache do dashboard antes de cada rodada: mede a consulta, não o acerto
+
+def _get(url):
+    return lambda http, ctx, rodada: http.get(url.format(**ctx), headers=ctx["headers"]).status_code
+
+def _data_futura(ctx, rodada, semanas=0):
+    # Bem depois de qualquer sessão real, para não esbarrar em conflitos de horário
+    return (ctx["hoje"] + timedelta(days=3650 + 7 * (semanas + rodada * 60))).isoformat()
+
+def _criar_serie(http, ctx, rodada):
+    # Tipo novo a cada rodada: a série só é criada se o cliente ainda não tem sessões do tipo
+    return http.post(f"/sessoes/?quantidade={ctx.get('quantidade', 8)}", headers=ctx["headers"], json={
+        "cliente_id": ctx["cliente_id"],
+        "data": _data_futura(ctx, rodada),
+        "horario": "06:00",
+        "tipo_atendimento": f"{MARCADOR}-{rodada}",
+        "frequencia": "semanal",
+        "valor": 200,
+        "observacoes": MARCADOR,
+    }).status_code
+
+def _atualizar_em_cadeia(http, ctx, rodada):
+    # Muda horário e valor da primeira sessão e de todas as futuras da série
+    return http.put(f"/sessoes/{ctx['sessao_serie_id']}", headers=ctx["headers"], json={
+        "horario": "06:30" if rodada % 2 == 0 else "06:00",
+        "valor": 210 + rodada % 2,
+        "atualizar_futuras_data_horario": True,
+        "atualizar_valores_futuros": True,
+    }).status_code
+
+def _renovar(http, ctx, rodada):
+    renovar_sessoes_repetidas(simular=True)
+    return 0
+
+CASOS = [
+    Caso("GET /sessoes/", _get("/sessoes/")),
+    Caso("GET /sessoes/ (janela)", _get("/sessoes/?inicio={hoje}&fim={fim_do_mes}")),
+    Caso("GET /sessoes/cliente/<id>", _get("/sessoes/cliente/{cliente_id}")),
+    Caso("POST /sessoes/ (série)", _criar_serie),
+    Caso("PUT /sessoes/<id> (em cadeia)", _atualizar_em_cadeia),
+    Caso("GET /clientes/", _get("/clientes/")),
+    Caso("GET /clientes/nome/<nome>", _get("/clientes/nome/{nome}")),
+    Caso("GET /clientes/busca", _get("/clientes/busca?q={prefixo}")),
+    Caso("GET /dashboard/proximas-sessoes", _get("/dashboard/proximas-sessoes"), sem_cache=True),
+    Caso("GET /dashboard/sessoes-amanha", _get("/dashboard/sessoes-amanha"), sem_cache=True),
+    Caso("GET /dashboard/resumo-financeiro", _get("/dashboard/resumo-financeiro"), sem_cache=True),
+    Caso("GET /dashboard/agenda", _get("/dashboard/agenda"), sem_cache=True),
+    Caso("GET /recibos/preview/<id>", _get("/recibos/preview/{cliente_id}?mes={mes}&ano={ano}")),
+    Caso("GET /historicos/cliente/<id>", _get("/historicos/cliente/{cliente_id}")),
+    Caso("GET /pagamentos/", _get("/pagamentos/")),
+    Caso("GET /saldos/devedores", _get("/saldos/devedores")),
+    Caso("GET /busca/", _get("/busca/?q=sonho")),
+    Caso("GET /notas/", _get("/notas/")),
+    Caso("flask renovar-sessoes --dry-run", _renovar),
+]
+
+def preparar_contexto(http):
+    """Ids e parâmetros reais do banco: o cliente com mais sessões e uma série só do benchmark."""
+    hoje = date.today()
+    cliente_id = db.session.execute(
+        select(Sessao.cliente_id).group_by(Sessao.cliente_id).order_by(func.count().desc()).limit(1)
+    ).scalar()
+    if cliente_id is None:
+        raise RuntimeError("Banco sem sessões; popule antes com 'flask seed'.")
+    nome = db.session.get(Cliente, cliente_id).nome
+    mes_passado = hoje.replace(day=1) - timedelta(days=1)
+
+    ctx = {
+        "hoje": hoje,
+        "cliente_id": cliente_id,
+        "nome": nome,
+        "prefixo": nome.split()[0][:4],
+        "fim_do_mes": (hoje.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1),
+        "mes": mes_passado.month,
+        "ano": mes_passado.year,
+        "headers": {"Authorization": f"Bearer {create_access_token(identity=os.getenv('APP_USERNAME', 'admin'))}"},
+    }
+
+    # Série de 20 semanas para a atualização em cadeia, longe das criadas por _criar_serie
+    resposta = http.post("/sessoes/?quantidade=20", headers=ctx["headers"], json={
+        "cliente_id": cliente_id,
+        "data": (hoje + timedelta(days=3650 * 2)).isoformat(),
+        "horario": "06:00",
+        "tipo_atendimento": "psicologia",
+        "frequencia": "semanal",
+        "valor": 200,
+        "observacoes": MARCADOR,
+    })
+    ctx["sessao_serie_id"] = resposta.get_json()["id"]
+
+    # Regra de SerieRepeticao com ocorrências nesta semana: o dashboard e /sessoes/ expandem a regra
+    db.session.add(SerieRepeticao(
+        cliente_id=cliente_id, tipo_atendimento="psicologia", frequencia="semanal", horario=time(4, 0),
+        valor=200, observacoes=MARCADOR, data_inicio=hoje,
+    ))
+    db.session.commit()
+    return ctx
+
+def limpar_marcadas():
+    ids = select(Sessao.id).where(Sessao.observacoes == MARCADOR)
+    db.session.execute(delete(Pagamento).where(Pagamento.sessao_id.in_(ids)))
+    db.session.execute(delete(Sessao).where(Sessao.observacoes == MARCADOR))
+    db.session.execute(delete(SerieRepeticao).where(SerieRepeticao.observacoes == MARCADOR))
+    db.session.commit()
+
+def percentil(valores, p):
+    """Percentil pelo método do posto mais próximo."""
+    ordenados = sorted(valores)
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+class ContadorConsultas:
+    def __init__(self):
+        self.total = 0
+
+    def _contar(self, *args):
+        self.total += 1
+
+    def __enter__(self):
+        event.listen(Engine, "before_cursor_execute", self._contar)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, "before_cursor_execute", self._contar)
+
+def medir_caso(caso, http, ctx, repeticoes, aquecimento=1):
+    for rodada in range(aquecimento):
+        caso.chamar(http, ctx, rodada)
+
+    tempos, consultas, status = [], [], set()
+    for rodada in range(aquecimento, aquecimento + repeticoes):
+        if caso.sem_cache:
+            limpar_cache_dashboard()
+        with ContadorConsultas() as contador:
+            inicio = perf_counter()
+            status.add(caso.chamar(http, ctx, rodada))
+            tempos.append((perf_counter() - inicio) * 1000)
+        consultas.append(contador.total)
+
+    # Memória numa rodada separada: o tracemalloc deixa tudo bem mais lento
+    if caso.sem_cache:
+        limpar_cache_dashboard()
+    tracemalloc.start()
+    try:
+        caso.chamar(http, ctx, aquecimento + repeticoes)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": round(percentil(tempos, 50), 2),
+        "p95_ms": round(percentil(tempos, 95), 2),
+        "media_ms": round(sum(tempos) / len(tempos), 2),
+        "consultas": max(consultas),
+        "pico_memoria_kb": round(pico / 1024, 1),
+        "status": sorted(status),
+    }
+
+def ambiente():
+    return {
+        "dialeto": db.engine.dialect.name,
+        "clientes": db.session.execute(select(func.count()).select_from(Cliente)).scalar(),
+        "sessoes": db.session.execute(select(func.count()).select_from(Sessao)).scalar(),
+        "python": platform.python_version(),
+        "executado_em": datetime.now().isoformat(timespec="seconds"),
+    }
+
+def executar(repeticoes=20, filtro=None, progresso=None):
+    """Mede cada caso com o test client e um JWT emitido na hora; devolve um dict pronto para JSON."""
+    http = current_app.test_client()
+    # Sobras de uma execução interrompida fariam o POST da série esbarrar em conflito (409)
+    limpar_marcadas()
+    resultados = {}
+    try:
+        ctx = preparar_contexto(http)
+        for caso in CASOS:
+            if filtro and filtro not in caso.nome:
+                continue
+            resultados[caso.nome] = medir_caso(caso, http, ctx, repeticoes)
+            if progresso:
+                progresso(caso.nome, resultados[caso.nome])
+    finally:
+        limpar_marcadas()
+    return {"ambiente": ambiente(), "repeticoes": repeticoes, "rotas": resultados}
+
+def comparar(atual, base, tolerancia=0.2):
+    """Regressões de `atual` em relação a `base`: latência e memória acima da tolerância, ou mais consultas."""
+    regressoes = []
+    for nome, medida in atual["rotas"].items():
+        anterior = base.get("rotas", {}).get(nome)
+        if anterior is None:
+            continue
+        if medida["consultas"] > anterior["consultas"]:
+            regressoes.append((nome, "consultas", anterior["consultas"], medida["consultas"]))
+        for chave, folga in (("p50_ms", FOLGA_MS), ("p95_ms", FOLGA_MS), ("pico_memoria_kb", FOLGA_KB)):
+            limite = anterior[chave] * (1 + tolerancia) + folga
+            if medida[chave] > limite:
+                regressoes.append((nome, chave, anterior[chave], medida[chave]))
+    return regressoes
@@ -0,0 +1,37 @@
+from app import db
+from app.services.serializacao import CAMPOS, consultar, serializar, codificar
+from flask import jsonify
+from time import perf_counter
+import statistics
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        db.session.expunge_all()  # cada rodada parte de um identity map vazio, como uma requisição
+        inicio = perf_counter()
+        tamanho = funcao()
+        tempos.append((perf_counter() - inicio) * 1000)
+    return {"mediana_ms": round(statistics.median(tempos), 2), "bytes": tamanho}
+
+def comparar(modelo, limite=None, repeticoes=5):
+    """Compara ORM + to_dict + jsonify com select de colunas + serializador em lote."""
+    def orm():
+        query = modelo.query
+        if limite is not None:
+            query = query.limit(limite)
+        return len(jsonify([obj.to_dict() for obj in query.all()]).get_data())
+
+    def tuplas():
+        return len(codificar(serializar(modelo, consultar(modelo, limite=limite))))
+
+    def colunar():
+        return len(codificar(serializar(modelo, consultar(modelo, limite=limite), colunar=True)))
+
+    return {
+        "orm_to_dict": medir(orm, repeticoes),
+        "tuplas": medir(tuplas, repeticoes),
+        "colunar": medir(colunar, repeticoes),
+    }
+
+def comparar_todos(limite=None, repeticoes=5):
+    return {modelo.__tablename__: comparar(modelo, limite, repeticoes) for modelo in CAMPOS}
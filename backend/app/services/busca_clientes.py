@@ -0,0 +1,234 @@
+from app import db
+from app.models.cliente import Cliente
+from app.models.cliente_token import ClienteToken
+from app.services.serializacao import colunas, consultar, serializar
+from app.services.alteracoes import observar
+from sqlalchemy import event, func, and_, delete, insert, bindparam
+from sqlalchemy.orm import aliased
+import re
+import unicodedata
+
+LIMITE_PADRAO = 10
+LIMITE_MAXIMO = 50
+
+# Peso de um termo que casa com o token inteiro; casar só o prefixo vale 1
+PESO_EXATO = 2
+
+# Entradas contadas por termo ao escolher o mais seletivo
+TETO_CONTAGEM = 500
+
+def normalizar(texto):
+    """Minúsculas e sem acento: "José" e "jose" viram o mesmo termo."""
+    texto = unicodedata.normalize("NFKD", texto or "")
+    return "".join(c for c in texto if not unicodedata.combining(c)).lower()
+
+def palavras(texto):
+    return re.findall(r"[a-z0-9]+", normalizar(texto))
+
+def digitos(texto):
+    return re.sub(r"\D", "", texto or "")
+
+def tokens_do_cliente(nome, cpf_cnpj, telefone, email, telefone_emergencia=None):
+    tokens = set(palavras(nome)) | set(palavras(email)) | set(palavras(cpf_cnpj))
+    if digitos(cpf_cnpj):
+        tokens.add(digitos(cpf_cnpj))
+    for fone in (telefone, telefone_emergencia):
+        numero = digitos(fone)
+        if numero:
+            tokens |= set(palavras(fone))
+            tokens.add(numero)
+            if len(numero) >= 10:
+                tokens.add(numero[2:])  # sem o DDD
+    return sorted(t[:100] for t in tokens)
+
+def termos_da_consulta(q):
+    # "123.456.789-00" ou "(81) 9999-0000" buscam pelos dígitos juntos
+    if re.fullmatch(r"[\d\s().\-/+]+", q or "") and digitos(q):
+        return [digitos(q)]
+    return palavras(q)
+
+def tokens_de(cliente):
+    return tokens_do_cliente(
+        cliente.nome, cliente.cpf_cnpj, cliente.telefone, cliente.email, cliente.telefone_emergencia
+    )
+
+def indexar(connection, clientes):
+    """Regrava os tokens de [(id, tokens), ...]; usado pelos eventos e por inserções em massa."""
+    ids = [cliente_id for cliente_id, _ in clientes]
+    if not ids:
+        return
+    connection.execute(delete(ClienteToken).where(ClienteToken.cliente_id.in_(ids)))
+    linhas = [{"cliente_id": cliente_id, "token": t} for cliente_id, tokens in clientes for t in tokens]
+    if linhas:
+        connection.execute(insert(ClienteToken), linhas)
+
+def ao_salvar_antes(mapper, connection, cliente):
+    cliente.busca = " ".join(tokens_de(cliente))
+
+def ao_salvar_depois(mapper, connection, cliente):
+    indexar(connection, [(cliente.id, cliente.busca.split())])
+
+def atualizados_em_massa(estado):
+    """Ids dos clientes que um UPDATE em massa vai alterar (lidos antes de o comando rodar).
+
+    Os eventos de mapper não veem esse caminho. INSERT em massa grava os tokens na hora
+    (importação e seed chamam `indexar`), então só o UPDATE é acompanhado aqui.
+    """
+    if not estado.is_update or estado.bind_mapper.class_ is not Cliente:
+        return set()
+    parametros = estado.parameters if isinstance(estado.parameters, list) else [estado.parameters or {}]
+    onde = getattr(estado.statement, "whereclause", None)
+    if onde is None and all("id" in p for p in parametros):
+        return {p["id"] for p in parametros}  # UPDATE em massa pela chave primária
+    stmt = db.select(Cliente.id)
+    if onde is not None:
+        stmt = stmt.where(onde)
+    return set(estado.session.execute(stmt).scalars())
+
+def reindexar(session, ids):
+    """Refaz `busca` e os tokens dos clientes, na transação do commit."""
+    linhas = session.execute(db.select(
+        Cliente.id, Cliente.nome, Cliente.cpf_cnpj, Cliente.telefone, Cliente.email, Cliente.telefone_emergencia
+    ).where(Cliente.id.in_(sorted(ids)))).all()
+    clientes = [(linha.id, tokens_do_cliente(*linha[1:])) for linha in linhas]
+    if not clientes:
+        return
+    # Pela conexão: um UPDATE pela sessão passaria de novo por este observador
+    connection = session.connection()
+    tabela = Cliente.__table__
+    connection.execute(
+        tabela.update().where(tabela.c.id == bindparam("cliente")).values(busca=bindparam("termos")),
+        [{"cliente": cliente_id, "termos": " ".join(tokens)} for cliente_id, tokens in clientes]
+    )
+    indexar(connection, clientes)
+
+def init_busca_clientes():
+    for nome, funcao in [
+        ("before_insert", ao_salvar_antes),
+        ("before_update", ao_salvar_antes),
+        ("after_insert", ao_salvar_depois),
+        ("after_update", ao_salvar_depois),
+    ]:
+        if not event.contains(Cliente, nome, funcao):
+            event.listen(Cliente, nome, funcao)
+    # Objetos salvos já passam pelos eventos acima; falta o UPDATE em massa
+    observar("busca_clientes", lambda session, objetos: set(), atualizados_em_massa, reindexar,
+             antes_do_commit=True)
+
+def faixa(coluna, termo):
+    # [termo, termo + U+FFFF) é uma busca por prefixo que usa o índice do token
+    return and_(coluna >= termo, coluna < termo + "\uffff")
+
+def igual(coluna, termo):
+    return coluna == termo
+
+def por_seletividade(termos):
+    """Termos do mais raro ao mais comum, contando as entradas de cada um no índice.
+
+    Retorna a ordem para a busca exata (None se algum termo não é palavra inteira de ninguém,
+    caso em que essa etapa é pulada) e a ordem para a busca por prefixo.
+    """
+    termos = list(dict.fromkeys(termos))
+    # Contar além do teto não muda qual termo é o mais raro, só gasta tempo
+    contagens = db.session.execute(db.select(*[
+        db.select(func.count()).select_from(
+            db.select(ClienteToken.token).where(casa(ClienteToken.token, t)).limit(TETO_CONTAGEM).subquery()
+        ).scalar_subquery()
+        for t in termos for casa in (igual, faixa)
+    ])).one()
+    exatas, prefixos = contagens[0::2], contagens[1::2]
+    ordem_exata = [t for _, t in sorted(zip(exatas, termos))] if all(exatas) else None
+    return ordem_exata, [t for _, t in sorted(zip(prefixos, termos))]
+
+def ids_por_tokens(termos, limite, ativos=None, exato=False, excluir=()):
+    """Ids dos clientes que têm todos os termos, na ordem da chave primária (token, cliente_id).
+
+    `termos` vem de por_seletividade: o mais raro percorre o índice e os demais só são
+    conferidos nos candidatos. Como o ORDER BY segue o índice, o LIMIT encerra a varredura cedo.
+    """
+    guia, *outros = termos
+    casa = igual if exato else faixa
+
+    stmt = db.select(ClienteToken.cliente_id).where(casa(ClienteToken.token, guia))
+    for termo in outros:
+        outro = aliased(ClienteToken)
+        stmt = stmt.where(
+            db.select(outro.token).where(outro.cliente_id == ClienteToken.cliente_id, casa(outro.token, termo)).exists()
+        )
+    if excluir:
+        stmt = stmt.where(ClienteToken.cliente_id.notin_(excluir))
+    if ativos is not None:
+        stmt = stmt.join(Cliente, Cliente.id == ClienteToken.cliente_id).where(Cliente.ativo == ativos)
+    stmt = stmt.order_by(ClienteToken.token, ClienteToken.cliente_id)
+
+    # Um cliente pode ter mais de um token com o mesmo prefixo ("Silva Silva")
+    ids, inicio = [], 0
+    while len(ids) < limite:
+        lote = db.session.execute(stmt.offset(inicio).limit(limite)).scalars().all()
+        ids.extend(i for i in dict.fromkeys(lote) if i not in ids)
+        if len(lote) < limite:
+            break
+        inicio += limite
+    return ids[:limite]
+
+def relevancia(termos, busca):
+    tokens = set((busca or "").split())
+    return sum(PESO_EXATO if t in tokens else 1 for t in termos) / (PESO_EXATO * len(termos))
+
+def buscar_tokens(termos, limite, ativos=None):
+    ordem_exata, ordem_prefixo = por_seletividade(termos)
+    # Primeiro os clientes em que todos os termos são palavras inteiras, depois os de prefixo
+    ids = ids_por_tokens(ordem_exata, limite, ativos, exato=True) if ordem_exata else []
+    if len(ids) < limite:
+        ids += ids_por_tokens(ordem_prefixo, limite - len(ids), ativos, excluir=ids)
+    if not ids:
+        return []
+
+    posicao = {cliente_id: i for i, cliente_id in enumerate(ids)}
+    linhas = db.session.execute(
+        db.select(*colunas(Cliente), Cliente.busca).where(Cliente.id.in_(ids))
+    ).all()
+    pontuadas = [(linha[:-1], relevancia(termos, linha.busca), posicao[linha.id]) for linha in linhas]
+    pontuadas.sort(key=lambda item: (-item[1], item[2]))
+    return [(linha, pontos) for linha, pontos, _ in pontuadas]
+
+def buscar_postgres(termos, limite, ativos=None):
+    # LIKE '%termo%' usa o índice GIN de trigramas; word_similarity ordena por proximidade
+    semelhanca = func.word_similarity(" ".join(termos), Cliente.busca)
+    stmt = db.select(*colunas(Cliente), semelhanca).where(
+        *[Cliente.busca.like(f"%{t}%") for t in termos]
+    )
+    if ativos is not None:
+        stmt = stmt.where(Cliente.ativo == ativos)
+    linhas = db.session.execute(stmt.order_by(semelhanca.desc(), Cliente.nome).limit(limite)).all()
+    return [(linha[:-1], linha[-1]) for linha in linhas]
+
+def buscar_por_nome(nome):
+    """Linhas dos clientes cujo nome contém `nome`, sem diferenciar acentos nem maiúsculas.
+
+    Mesmo resultado do antigo ILIKE '%nome%' (trecho de palavra, sem limite), só que sem acento.
+    A coluna `busca` (trigramas no Postgres) filtra os candidatos; o trecho é conferido no nome.
+    """
+    termos = palavras(nome)
+    if not termos:
+        return consultar(Cliente, Cliente.nome.ilike(f"%{nome}%"))
+    trecho = normalizar(nome)
+    candidatos = consultar(Cliente, *[Cliente.busca.like(f"%{t}%") for t in termos])
+    return [linha for linha in candidatos if trecho in normalizar(linha.nome)]
+
+def buscar_clientes(q, limite=LIMITE_PADRAO, ativos=None):
+    """Clientes cujo nome, CPF/CNPJ, telefone ou email contêm os termos, do mais ao menos parecido."""
+    termos = termos_da_consulta(q)
+    if not termos:
+        return []
+
+    if db.engine.dialect.name == "postgresql":
+        pontuadas = buscar_postgres(termos, limite, ativos)
+    else:
+        pontuadas = buscar_tokens(termos, limite, ativos)
+
+    clientes = serializar(Cliente, [linha for linha, _ in pontuadas])
+    return [
+        {**cliente, "relevancia": round(float(pontos), 3)}
+        for cliente, (_, pontos) in zip(clientes, pontuadas)
+    ]
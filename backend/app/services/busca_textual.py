@@ -0,0 +1,167 @@
+from app import db
+from app.models.historico import Historico
+from app.models.nota import Nota
+from app.services.busca_clientes import palavras
+from sqlalchemy import DDL, event, text, bindparam
+import html
+
+LIMITE_PADRAO = 20
+LIMITE_MAXIMO = 100
+
+# Marcadores usados no SQL e trocados por <mark> depois de escapar o trecho
+INICIO, FIM = "\x02", "\x03"
+
+# Postgres: tsvector gerado pelo próprio banco (sempre em sincronia) com índice GIN
+DDL_POSTGRES = {
+    "historicos": [
+        "ALTER TABLE historicos ADD COLUMN busca tsvector GENERATED ALWAYS AS "
+        "(to_tsvector('portuguese', coalesce(conteudo, ''))) STORED",
+        "CREATE INDEX ix_historicos_busca ON historicos USING gin (busca)",
+    ],
+    "notas": [
+        "ALTER TABLE notas ADD COLUMN busca tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('portuguese', coalesce(titulo, '')), 'A') || "
+        "setweight(to_tsvector('portuguese', coalesce(conteudo, '')), 'B')) STORED",
+        "CREATE INDEX ix_notas_busca ON notas USING gin (busca)",
+    ],
+}
+
+def _ddl_fts5(tabela, colunas):
+    lista = ", ".join(colunas)
+    novos = ", ".join(f"new.{c}" for c in colunas)
+    antigos = ", ".join(f"old.{c}" for c in colunas)
+    remover = f"INSERT INTO {tabela}_fts({tabela}_fts, rowid, {lista}) VALUES ('delete', old.id, {antigos});"
+    inserir = f"INSERT INTO {tabela}_fts(rowid, {lista}) VALUES (new.id, {novos});"
+    return [
+        f"CREATE VIRTUAL TABLE {tabela}_fts USING fts5({lista}, content='{tabela}', "
+        f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER {tabela}_fts_ai AFTER INSERT ON {tabela} BEGIN {inserir} END",
+        f"CREATE TRIGGER {tabela}_fts_ad AFTER DELETE ON {tabela} BEGIN {remover} END",
+        f"CREATE TRIGGER {tabela}_fts_au AFTER UPDATE ON {tabela} BEGIN {remover} {inserir} END",
+    ]
+
+# SQLite: tabelas FTS5 de conteúdo externo, mantidas por triggers
+DDL_SQLITE = {
+    "historicos": _ddl_fts5("historicos", ["conteudo"]),
+    "notas": _ddl_fts5("notas", ["titulo", "conteudo"]),
+}
+
+def ddl_da_tabela(dialeto, tabela):
+    return {"postgresql": DDL_POSTGRES, "sqlite": DDL_SQLITE}.get(dialeto, {}).get(tabela, [])
+
+def _ao_criar(tabela, connection, **kwargs):
+    for comando in ddl_da_tabela(connection.dialect.name, tabela.name):
+        connection.execute(DDL(comando))
+
+def _ao_remover(tabela, connection, **kwargs):
+    # O DROP TABLE leva os triggers (e, no Postgres, a coluna e o índice), mas não a tabela FTS5
+    if connection.dialect.name == "sqlite":
+        connection.execute(DDL(f"DROP TABLE IF EXISTS {tabela.name}_fts"))
+
+def init_busca_textual():
+    # Também vale para db.create_all() e db.drop_all(), usados em desenvolvimento e nos testes
+    for modelo in (Historico, Nota):
+        for nome, funcao in (("after_create", _ao_criar), ("after_drop", _ao_remover)):
+            if not event.contains(modelo.__table__, nome, funcao):
+                event.listen(modelo.__table__, nome, funcao)
+
+CONSULTA_POSTGRES = """
+    WITH consulta AS (SELECT websearch_to_tsquery('portuguese', :q) AS q)
+    SELECT * FROM (
+        SELECT 'historico' AS origem, h.id, h.cliente_id, h.data, NULL AS titulo,
+               ts_rank(h.busca, consulta.q) AS relevancia
+        FROM historicos h, consulta WHERE :historicos AND h.busca @@ consulta.q
+            AND (CAST(:cliente_id AS integer) IS NULL OR h.cliente_id = :cliente_id)
+        UNION ALL
+        SELECT 'nota', n.id, NULL, CAST(n.criado_em AS date), n.titulo,
+               ts_rank(n.busca, consulta.q)
+        FROM notas n, consulta WHERE :notas AND n.busca @@ consulta.q
+    ) resultados
+    ORDER BY relevancia DESC, origem, id DESC
+    LIMIT :limite OFFSET :deslocamento
+"""
+
+# bm25 é menor quanto melhor; o sinal é invertido para as duas bases ordenarem igual
+CONSULTA_SQLITE = """
+    SELECT * FROM (
+        SELECT 'historico' AS origem, h.id, h.cliente_id, h.data, NULL AS titulo,
+               -bm25(historicos_fts) AS relevancia
+        FROM historicos_fts JOIN historicos h ON h.id = historicos_fts.rowid
+        WHERE :historicos AND historicos_fts MATCH :q
+            AND (:cliente_id IS NULL OR h.cliente_id = :cliente_id)
+        UNION ALL
+        SELECT 'nota', n.id, NULL, date(n.criado_em), n.titulo, -bm25(notas_fts, 10.0, 1.0)
+        FROM notas_fts JOIN notas n ON n.id = notas_fts.rowid
+        WHERE :notas AND notas_fts MATCH :q
+    )
+    ORDER BY relevancia DESC, origem, id DESC
+    LIMIT :limite OFFSET :deslocamento
+"""
+
+# Trechos só das linhas da página: o custo não cresce com o total de resultados
+TRECHOS_POSTGRES = {
+    "historico": "SELECT id, ts_headline('portuguese', conteudo, websearch_to_tsquery('portuguese', :q), "
+                 ":opcoes) FROM historicos WHERE id IN :ids",
+    "nota": "SELECT id, ts_headline('portuguese', coalesce(titulo, '') || ' — ' || coalesce(conteudo, ''), "
+            "websearch_to_tsquery('portuguese', :q), :opcoes) FROM notas WHERE id IN :ids",
+}
+TRECHOS_SQLITE = {
+    "historico": "SELECT rowid, snippet(historicos_fts, 0, :inicio, :fim, '…', 16) FROM historicos_fts "
+                 "WHERE historicos_fts MATCH :q AND rowid IN :ids",
+    "nota": "SELECT rowid, snippet(notas_fts, -1, :inicio, :fim, '…', 16) FROM notas_fts "
+            "WHERE notas_fts MATCH :q AND rowid IN :ids",
+}
+
+def consulta_fts5(q):
+    """Cada palavra vira um prefixo entre aspas: nada do texto é lido como sintaxe do FTS5."""
+    return " ".join(f'"{p}"*' for p in palavras(q))
+
+def destacar(trecho):
+    return html.escape(trecho or "").replace(INICIO, "<mark>").replace(FIM, "</mark>")
+
+def trechos(dialeto, termo, resultados):
+    por_origem = {}
+    for r in resultados:
+        por_origem.setdefault(r["origem"], []).append(r["id"])
+
+    encontrados = {}
+    for origem, ids in por_origem.items():
+        if dialeto == "postgresql":
+            sql = TRECHOS_POSTGRES[origem]
+            parametros = {"q": termo, "ids": ids, "opcoes": (
+                f"StartSel={INICIO}, StopSel={FIM}, MaxFragments=2, MaxWords=30, MinWords=10"
+            )}
+        else:
+            sql = TRECHOS_SQLITE[origem]
+            parametros = {"q": termo, "ids": ids, "inicio": INICIO, "fim": FIM}
+        consulta = text(sql).bindparams(bindparam("ids", expanding=True))
+        for id_, trecho in db.session.execute(consulta, parametros):
+            encontrados[(origem, id_)] = destacar(trecho)
+    return encontrados
+
+def buscar_textos(q, pagina=1, limite=LIMITE_PADRAO, em=("historico", "nota"), cliente_id=None):
+    """Históricos e notas que contêm `q`, do mais ao menos relevante, com trechos destacados."""
+    dialeto = db.engine.dialect.name
+    if dialeto == "postgresql":
+        sql, termo = CONSULTA_POSTGRES, q
+    else:
+        sql, termo = CONSULTA_SQLITE, consulta_fts5(q)
+    if not termo.strip():
+        return [], False
+
+    linhas = db.session.execute(text(sql), {
+        "q": termo,
+        "historicos": "historico" in em,
+        "notas": "nota" in em,
+        "cliente_id": cliente_id,
+        "limite": limite + 1,
+        "deslocamento": (pagina - 1) * limite,
+    }).mappings().all()
+
+    resultados = [dict(linha) for linha in linhas[:limite]]
+    destaques = trechos(dialeto, termo, resultados)
+    for r in resultados:
+        r["data"] = str(r["data"]) if r["data"] else None
+        r["relevancia"] = round(float(r["relevancia"]), 6)
+        r["trecho"] = destaques.get((r["origem"], r["id"]))
+    return resultados, len(linhas) > limite
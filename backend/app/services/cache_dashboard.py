@@ -0,0 +1,75 @@
+from app import cache
+from app.models.sessao import Sessao
+from app.models.cliente import Cliente
+from app.models.serie_repeticao import SerieRepeticao
+from flask import request, current_app
+from functools import wraps
+from datetime import date
+from collections import Counter
+import time
+from app.services.alteracoes import observar_por_classe
+
+# Quais respostas do dashboard dependem de cada modelo
+GRUPOS_POR_MODELO = {
+    Sessao: {"resumo_financeiro", "proximas_sessoes", "sessoes_amanha", "agenda"},
+    Cliente: {"proximas_sessoes", "sessoes_amanha", "agenda"},  # exibem nome e telefone
+    SerieRepeticao: {"proximas_sessoes", "sessoes_amanha", "agenda"},  # ocorrências ainda não gravadas
+}
+
+# Contadores do processo atual, expostos em /dashboard/cache
+estatisticas = {"hits": Counter(), "misses": Counter()}
+
+def chave_versao(grupo):
+    return f"dashboard:versao:{grupo}"
+
+def versao(grupo):
+    # A versão não expira, mas o SimpleCache descarta chaves ao passar de CACHE_THRESHOLD.
+    # Se ela sumir, começa por um valor novo: nunca volta a uma versão com respostas guardadas.
+    atual = cache.get(chave_versao(grupo))
+    if atual is None:
+        atual = time.time_ns()
+        cache.set(chave_versao(grupo), atual, timeout=0)
+    return atual
+
+def invalidar(grupos):
+    """Troca a versão dos grupos; as entradas antigas deixam de ser lidas e expiram sozinhas."""
+    agora = time.time_ns()
+    for grupo in grupos:
+        cache.set(chave_versao(grupo), agora, timeout=0)
+
+def limpar():
+    """Descarta as respostas guardadas do dashboard, e só elas: o resto do cache (Redis) fica."""
+    invalidar(set().union(*GRUPOS_POR_MODELO.values()))
+
+def em_cache(grupo):
+    """Guarda a resposta JSON da rota por grupo, dia e parâmetros da requisição."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            chave = (
+                f"dashboard:{grupo}:v{versao(grupo)}:{date.today().isoformat()}:"
+                f"{request.query_string.decode()}"
+            )
+            guardada = cache.get(chave)
+            if guardada is not None:
+                estatisticas["hits"][grupo] += 1
+                corpo, status = guardada
+                resposta = current_app.response_class(corpo, status=status, mimetype="application/json")
+                resposta.headers["X-Cache"] = "HIT"
+                return resposta
+
+            estatisticas["misses"][grupo] += 1
+            resposta = current_app.make_response(fn(*args, **kwargs))
+            if resposta.status_code == 200:
+                cache.set(chave, (resposta.get_data(), resposta.status_code))
+            resposta.headers["X-Cache"] = "MISS"
+            return resposta
+        return wrapper
+    return decorator
+
+def init_cache_dashboard():
+    observar_por_classe(
+        "dashboard",
+        lambda classe: GRUPOS_POR_MODELO.get(classe, set()),
+        lambda session, grupos: invalidar(grupos),
+    )
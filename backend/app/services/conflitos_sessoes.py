@@ -0,0 +1,109 @@
+from app import db
+from app.models.sessao import Sessao
+from app.services.series_repeticao import series_ativas, ocorrencias_virtuais
+from datetime import date, time, datetime, timedelta
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, namedtuple
+from sqlalchemy import and_, or_
+
+# Duas sessões no mesmo dia conflitam se começam a menos de 1h uma da outra
+INTERVALO_MINIMO = timedelta(hours=1)
+
+# Horário ocupado por uma ocorrência de SerieRepeticao ainda não gravada
+OcorrenciaVirtual = namedtuple("OcorrenciaVirtual", "id data horario repeticao_id")
+
+
+def como_data(valor):
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, str):
+        return date.fromisoformat(valor[:10])
+    return valor
+
+
+def como_horario(valor):
+    if isinstance(valor, str):
+        return time.fromisoformat(valor)
+    return valor
+
+
+def normalizar_slot(data, horario):
+    return como_data(data), como_horario(horario)
+
+
+def minutos_do_dia(horario):
+    return horario.hour * 60 + horario.minute
+
+
+class IndiceSessoes:
+    """Sessões existentes agrupadas por dia, ordenadas pelo horário de início."""
+
+    def __init__(self, linhas):
+        self.por_dia = defaultdict(list)
+        for linha in linhas:
+            self.por_dia[linha.data].append(
+                (minutos_do_dia(linha.horario), linha.id, linha.repeticao_id)
+            )
+        for entradas in self.por_dia.values():
+            entradas.sort(key=lambda e: e[0])
+        self.inicios = {dia: [e[0] for e in entradas] for dia, entradas in self.por_dia.items()}
+
+    def sobrepostas(self, data, horario):
+        inicios = self.inicios.get(data)
+        if not inicios:
+            return []
+        minutos = minutos_do_dia(horario)
+        folga = int(INTERVALO_MINIMO.total_seconds() // 60)
+        esquerda = bisect_left(inicios, minutos - folga)
+        direita = bisect_right(inicios, minutos + folga)
+        return self.por_dia[data][esquerda:direita]
+
+
+def encontrar_conflitos(slots, ignorar_ids=(), ignorar_repeticao_id=None):
+    """Retorna todos os slots (data, horario) que conflitam com sessões já gravadas.
+
+    Busca as sessões e as séries de todo o intervalo coberto pelos slots (uma
+    consulta para cada) e resolve as sobreposições em memória. Sessões em
+    `ignorar_ids` ou da série `ignorar_repeticao_id` não contam como conflito.
+    """
+    slots = [normalizar_slot(d, h) for d, h in slots]
+    if not slots:
+        return []
+
+    inicio = min(d for d, _ in slots)
+    fim = max(d for d, _ in slots)
+    # no_autoflush: as sessões ainda pendentes da requisição não são "existentes"
+    with db.session.no_autoflush:
+        linhas = db.session.query(
+            Sessao.id, Sessao.data, Sessao.horario, Sessao.repeticao_id, Sessao.data_ocorrencia
+        ).filter(or_(
+            and_(Sessao.data >= inicio, Sessao.data <= fim),
+            and_(Sessao.data_ocorrencia >= inicio, Sessao.data_ocorrencia <= fim)
+        )).all()
+        series = series_ativas(inicio, fim)
+
+    # Ocorrências das séries que ainda não viraram linha também ocupam o horário
+    materializadas = {(l.repeticao_id, l.data_ocorrencia) for l in linhas if l.data_ocorrencia}
+    ocupados = [l for l in linhas if inicio <= l.data <= fim]
+    ocupados.extend(
+        OcorrenciaVirtual(None, data, serie.horario, serie.id)
+        for serie, data in ocorrencias_virtuais(series, inicio, fim, materializadas)
+    )
+
+    indice = IndiceSessoes(ocupados)
+    ignorar_ids = set(ignorar_ids)
+
+    conflitos = []
+    for data, horario in slots:
+        for _, sessao_id, repeticao_id in indice.sobrepostas(data, horario):
+            if sessao_id is not None and sessao_id in ignorar_ids:
+                continue
+            if ignorar_repeticao_id and repeticao_id == ignorar_repeticao_id:
+                continue
+            conflitos.append((data, horario))
+            break
+    return conflitos
+
+
+def conflitos_para_json(conflitos):
+    return [{"data": d.isoformat(), "horario": h.strftime("%H:%M")} for d, h in conflitos]
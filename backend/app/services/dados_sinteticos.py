@@ -0,0 +1,307 @@
+from app import db, cache
+from app.models.cliente import Cliente
+from app.models.sessao import Sessao
+from app.models.pagamento import Pagamento
+from app.models.historico import Historico
+from app.models.nota import Nota
+from app.models.serie_repeticao import SerieRepeticao
+from app.models.cliente_token import ClienteToken
+from app.models.saldo_cliente import SaldoCliente
+from app.services.busca_clientes import tokens_do_cliente, indexar, normalizar
+from app.services.recorrencia_sessoes import datas_repeticao, dias_da_frequencia
+from app.services.saldos import recalcular
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from sqlalchemy import func, select, text
+import csv
+import io
+import random
+import uuid
+
+NOMES = [
+    "Ana", "Beatriz", "Bruna", "Camila", "Carla", "Carolina", "Clara", "Daniela", "Eduarda", "Fernanda",
+    "Gabriela", "Helena", "Isabela", "Joana", "Júlia", "Larissa", "Letícia", "Luana", "Mariana", "Natália",
+    "Paula", "Rafaela", "Renata", "Sofia", "Vitória", "André", "Bruno", "Caio", "Carlos", "Daniel",
+    "Diego", "Eduardo", "Felipe", "Gabriel", "Gustavo", "Henrique", "João", "José", "Leonardo", "Lucas",
+    "Marcelo", "Mateus", "Paulo", "Pedro", "Rafael", "Ricardo", "Rodrigo", "Thiago", "Vinícius", "Vítor",
+]
+SOBRENOMES = [
+    "Albuquerque", "Almeida", "Alves", "Araújo", "Barbosa", "Barros", "Batista", "Bezerra", "Cavalcanti",
+    "Correia", "Costa", "Dias", "Farias", "Ferreira", "Gomes", "Lima", "Lins", "Macedo", "Martins", "Melo",
+    "Monteiro", "Moura", "Nascimento", "Oliveira", "Pereira", "Pessoa", "Queiroz", "Ribeiro", "Rocha",
+    "Santana", "Santos", "Silva", "Siqueira", "Soares", "Souza", "Teixeira", "Vasconcelos", "Wanderley",
+]
+BAIRROS = ["Boa Viagem", "Casa Forte", "Espinheiro", "Graças", "Ilha do Leite", "Madalena", "Parnamirim",
+           "Pina", "Poço da Panela", "Torre", "Derby", "Aflitos"]
+RUAS = ["Rua da Aurora", "Av. Boa Viagem", "Rua do Futuro", "Av. Rosa e Silva", "Rua Amélia",
+        "Rua das Pernambucanas", "Av. Conselheiro Aguiar", "Rua Real da Torre"]
+
+FRASES = [
+    "Paciente chegou no horário e relatou uma semana mais tranquila no trabalho.",
+    "Retomamos o tema da relação com a família, especialmente com a mãe.",
+    "Trouxe um sonho recorrente, que exploramos a partir das associações livres.",
+    "Relatou dificuldade para dormir nos últimos dias, associada à ansiedade antecipatória.",
+    "Conversamos sobre limites nas relações de amizade e sobre como dizer não.",
+    "Percebe avanços na forma como lida com críticas da chefia.",
+    "Demonstrou resistência ao falar do término recente e mudou de assunto algumas vezes.",
+    "Sessão focada na organização da rotina e nas expectativas para o semestre.",
+    "Trabalhamos a respiração diafragmática como recurso para momentos de crise.",
+    "Relatou tensão cervical persistente, que diminuiu após o trabalho na fáscia do tronco.",
+    "Observei melhora na mobilidade da pelve e no alinhamento ao caminhar.",
+    "Combinamos observar, ao longo da semana, as situações que disparam irritação.",
+    "Falou sobre o luto pelo avô com mais abertura do que nas sessões anteriores.",
+    "Mostrou-se mais confiante para a entrevista de emprego marcada para a próxima semana.",
+    "Discutimos estratégias para reduzir o uso do celular antes de dormir.",
+    "Relatou episódio de discussão com o parceiro e como conseguiu se posicionar.",
+    "Na supervisão, discutimos a condução do caso e o manejo da transferência.",
+    "Sugerido registro diário de humor para acompanharmos as oscilações.",
+]
+TITULOS_NOTAS = ["Leituras", "Ideias para grupo terapêutico", "Pendências do consultório", "Supervisão",
+                 "Cursos e eventos", "Materiais para sessões", "Financeiro", "Lembretes"]
+
+FREQUENCIAS = [("semanal", 60), ("quinzenal", 25), ("mensal", 15)]
+VALORES = [Decimal("150.00"), Decimal("180.00"), Decimal("200.00"), Decimal("220.00"), Decimal("250.00")]
+FORMAS_PAGAMENTO = [("pix", 70), ("dinheiro", 10), ("cartão", 15), ("transferência", 5)]
+
+# Probabilidades usadas para sessões já passadas
+CHANCE_REALIZADA = 0.9
+CHANCE_PAGA_ANTIGA = 0.97  # sessões com mais de 60 dias
+CHANCE_PAGA_RECENTE = 0.75
+CHANCE_PAGAMENTO_PARCELADO = 0.1
+CHANCE_HISTORICO = 0.4
+CHANCE_SEGUNDA_SERIE = 0.15
+
+OCORRENCIAS_FUTURAS = 4  # como o horizonte padrão de renovar-sessoes
+CLIENTES_POR_BLOCO = 500
+LINHAS_POR_COMANDO = 5000
+
+TABELAS_EM_ORDEM = [Pagamento, Historico, Sessao, SerieRepeticao, SaldoCliente, ClienteToken, Cliente, Nota]
+
+def escolher(rng, pesos):
+    return rng.choices([valor for valor, _ in pesos], [peso for _, peso in pesos])[0]
+
+def gerar_cpf(rng):
+    numeros = [rng.randint(0, 9) for _ in range(9)]
+    for tamanho in (9, 10):
+        soma = sum(n * (tamanho + 1 - i) for i, n in enumerate(numeros[:tamanho]))
+        numeros.append((soma * 10 % 11) % 10)
+    return "".join(map(str, numeros))  # só dígitos, como o formulário de cadastro grava
+
+def gerar_telefone(rng):
+    return f"(81) 9{rng.randint(8000, 9999)}-{rng.randint(0, 9999):04d}"
+
+def gerar_texto(rng, paragrafos=(2, 4)):
+    return "\n\n".join(
+        " ".join(rng.sample(FRASES, rng.randint(3, 6)))
+        for _ in range(rng.randint(*paragrafos))
+    )
+
+def proximos_ids(connection):
+    return {
+        modelo: (connection.execute(select(func.max(modelo.id))).scalar() or 0) + 1
+        for modelo in (Cliente, Sessao, Pagamento, Historico, Nota)
+    }
+
+class Gerador:
+    """Monta as linhas de cada tabela com ids próprios, sem depender de RETURNING do banco."""
+
+    def __init__(self, semente, anos, referencia, ids):
+        self.rng = random.Random(semente)
+        self.anos = anos
+        self.referencia = referencia
+        self.criado_em = datetime.combine(referencia, time(12, 0))
+        self.ids = ids
+
+    def novo_id(self, modelo):
+        atual = self.ids[modelo]
+        self.ids[modelo] += 1
+        return atual
+
+    def cliente(self):
+        rng = self.rng
+        nome = f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}"
+        cpf, telefone = gerar_cpf(rng), gerar_telefone(rng)
+        emergencia = gerar_telefone(rng) if rng.random() < 0.5 else None
+        email = f"{normalizar(nome).replace(' ', '.')}{rng.randint(1, 99)}@exemplo.com.br"
+        tokens = tokens_do_cliente(nome, cpf, telefone, email, emergencia)
+        return {
+            "id": self.novo_id(Cliente),
+            "nome": nome,
+            "cpf_cnpj": cpf,
+            "endereco": f"{rng.choice(RUAS)}, {rng.randint(10, 2500)}, {rng.choice(BAIRROS)}, Recife - PE",
+            "telefone": telefone,
+            "telefone_emergencia": emergencia,
+            "email": email,
+            "ativo": True,
+            "criado_em": self.criado_em,
+            "busca": " ".join(tokens),
+        }, tokens
+
+    def serie(self, cliente_id, tipo):
+        """Sessões de uma série: passadas (realizadas ou faltas) e as próximas ainda em aberto."""
+        rng = self.rng
+        frequencia = escolher(rng, FREQUENCIAS)
+        dias = dias_da_frequencia(frequencia)
+        inicio = self.referencia - timedelta(days=rng.randint(dias, max(dias, 365 * self.anos)))
+        # Um terço das séries já terminou; as demais seguem com sessões futuras
+        encerrada = rng.random() < 1 / 3
+        fim = inicio + (self.referencia - inicio) * rng.uniform(0.2, 0.9) if encerrada else self.referencia
+        quantidade = (fim - inicio).days // dias + 1 + (0 if encerrada else OCORRENCIAS_FUTURAS)
+
+        base = {
+            "cliente_id": cliente_id,
+            "repeticao_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "tipo_atendimento": tipo,
+            "frequencia": frequencia,
+            "horario": time(rng.randint(8, 19), rng.choice((0, 30))),
+            "valor": rng.choice(VALORES),
+            "criado_em": self.criado_em,
+        }
+        sessoes = []
+        for data in [inicio, *datas_repeticao(inicio, frequencia, quantidade)]:
+            passada = data < self.referencia
+            realizada = passada and rng.random() < CHANCE_REALIZADA
+            recente = (self.referencia - data).days <= 60
+            paga = realizada and rng.random() < (CHANCE_PAGA_RECENTE if recente else CHANCE_PAGA_ANTIGA)
+            sessoes.append({
+                **base,
+                "id": self.novo_id(Sessao),
+                "data": data,
+                "foi_realizada": realizada,
+                "foi_paga": paga,
+                "observacoes": None if realizada or not passada else "Faltou",
+            })
+        return sessoes, encerrada
+
+    def pagamentos(self, sessao):
+        rng = self.rng
+        valor = sessao["valor"]
+        dia = datetime.combine(sessao["data"], sessao["horario"]) + timedelta(days=rng.randint(0, 10))
+        partes = [valor]
+        if rng.random() < CHANCE_PAGAMENTO_PARCELADO:
+            primeira = (valor / 2).quantize(Decimal("0.01"))
+            partes = [primeira, valor - primeira]
+        return [{
+            "id": self.novo_id(Pagamento),
+            "sessao_id": sessao["id"],
+            "valor_pago": parte,
+            "forma_pagamento": escolher(rng, FORMAS_PAGAMENTO),
+            "data_pagamento": dia + timedelta(days=7 * i),
+            "observacoes": None,
+        } for i, parte in enumerate(partes)]
+
+    def historico(self, sessao):
+        return {
+            "id": self.novo_id(Historico),
+            "cliente_id": sessao["cliente_id"],
+            "data": sessao["data"],
+            "tipo": "supervisao" if self.rng.random() < 0.1 else "sessao",
+            "conteudo": gerar_texto(self.rng),
+        }
+
+    def nota(self):
+        return {
+            "id": self.novo_id(Nota),
+            "titulo": self.rng.choice(TITULOS_NOTAS),
+            "conteudo": gerar_texto(self.rng, (1, 3)),
+            "criado_em": self.criado_em,
+        }
+
+    def bloco(self, quantidade):
+        """Linhas de `quantidade` clientes com todas as suas sessões, pagamentos e históricos."""
+        linhas = {modelo: [] for modelo in (Cliente, Sessao, Pagamento, Historico)}
+        tokens = []
+        for _ in range(quantidade):
+            cliente, tokens_cliente = self.cliente()
+            tipos = ["psicologia"] if self.rng.random() < 0.8 else ["rolfing"]
+            if self.rng.random() < CHANCE_SEGUNDA_SERIE:
+                tipos.append("rolfing" if tipos[0] == "psicologia" else "psicologia")
+
+            ativo = False
+            for tipo in tipos:
+                sessoes, encerrada = self.serie(cliente["id"], tipo)
+                ativo = ativo or not encerrada
+                linhas[Sessao].extend(sessoes)
+                for sessao in sessoes:
+                    if sessao["foi_paga"]:
+                        linhas[Pagamento].extend(self.pagamentos(sessao))
+                    if sessao["foi_realizada"] and self.rng.random() < CHANCE_HISTORICO:
+                        linhas[Historico].append(self.historico(sessao))
+            cliente["ativo"] = ativo
+            linhas[Cliente].append(cliente)
+            tokens.append((cliente["id"], tokens_cliente))
+        return linhas, tokens
+
+def _valor_csv(valor):
+    return "" if valor is None else valor
+
+def copiar_postgres(connection, tabela, linhas):
+    """COPY ... FROM STDIN na mesma conexão (e transação) do SQLAlchemy."""
+    colunas = list(linhas[0])
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    for linha in linhas:
+        escritor.writerow([_valor_csv(linha[c]) for c in colunas])
+    buffer.seek(0)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {tabela.name} ({', '.join(colunas)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+def inserir(connection, modelo, linhas):
+    tabela = modelo.__table__
+    for i in range(0, len(linhas), LINHAS_POR_COMANDO):
+        parte = linhas[i:i + LINHAS_POR_COMANDO]
+        if connection.dialect.name == "postgresql":
+            copiar_postgres(connection, tabela, parte)
+        else:
+            connection.execute(tabela.insert(), parte)
+
+def ajustar_sequencias(connection):
+    # Os ids foram informados explicitamente; as sequências precisam continuar depois deles
+    for modelo in (Cliente, Sessao, Pagamento, Historico, Nota):
+        tabela = modelo.__tablename__
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{tabela}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {tabela}), 0) + 1, false)"
+        ))
+
+def limpar(connection):
+    for modelo in TABELAS_EM_ORDEM:
+        connection.execute(modelo.__table__.delete())
+
+def popular(clientes, anos=3, semente=42, referencia=None, apagar=False, progresso=None):
+    """Gera um consultório sintético; a mesma semente e referência produzem os mesmos dados.
+
+    Insere por Core em blocos de clientes (COPY no Postgres), sem passar pelos eventos do ORM:
+    tokens de busca e saldos são gravados aqui mesmo, e o cache do dashboard é limpo no fim.
+    """
+    referencia = referencia or date.today()
+    totais = {modelo.__tablename__: 0 for modelo in (Cliente, Sessao, Pagamento, Historico, Nota)}
+
+    with db.engine.begin() as connection:
+        if apagar:
+            limpar(connection)
+        gerador = Gerador(semente, anos, referencia, proximos_ids(connection))
+
+        for inicio in range(0, clientes, CLIENTES_POR_BLOCO):
+            linhas, tokens = gerador.bloco(min(CLIENTES_POR_BLOCO, clientes - inicio))
+            for modelo, registros in linhas.items():
+                if registros:
+                    inserir(connection, modelo, registros)
+                totais[modelo.__tablename__] += len(registros)
+            indexar(connection, tokens)
+            if progresso:
+                progresso(inicio + len(tokens), clientes)
+
+        notas = [gerador.nota() for _ in range(max(1, clientes // 20))]
+        inserir(connection, Nota, notas)
+        totais[Nota.__tablename__] += len(notas)
+
+        if connection.dialect.name == "postgresql":
+            ajustar_sequencias(connection)
+        recalcular(connection)
+
+    cache.clear()
+    return totais
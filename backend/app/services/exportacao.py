@@ -0,0 +1,69 @@
+from app import db
+from app.models.sessao import Sessao
+from app.models.pagamento import Pagamento
+from app.services.serializacao import colunas, conversores, codificar
+from datetime import datetime, time, timedelta
+import csv
+import io
+
+FORMATOS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# Linhas buscadas do cursor do servidor a cada ida ao banco
+TAMANHO_LOTE = 1000
+
+def consulta_sessoes(inicio=None, fim=None, cliente_id=None):
+    stmt = db.select(*colunas(Sessao))
+    if inicio:
+        stmt = stmt.where(Sessao.data >= inicio)
+    if fim:
+        stmt = stmt.where(Sessao.data <= fim)
+    if cliente_id:
+        stmt = stmt.where(Sessao.cliente_id == cliente_id)
+    return stmt.order_by(Sessao.data, Sessao.horario, Sessao.id)
+
+def consulta_pagamentos(inicio=None, fim=None, cliente_id=None):
+    # Pagamento não guarda o cliente; vem da sessão paga
+    stmt = db.select(*colunas(Pagamento), Sessao.cliente_id).join(Sessao, Pagamento.sessao_id == Sessao.id)
+    if inicio:
+        stmt = stmt.where(Pagamento.data_pagamento >= datetime.combine(inicio, time.min))
+    if fim:
+        stmt = stmt.where(Pagamento.data_pagamento < datetime.combine(fim + timedelta(days=1), time.min))
+    if cliente_id:
+        stmt = stmt.where(Sessao.cliente_id == cliente_id)
+    return stmt.order_by(Pagamento.data_pagamento, Pagamento.id)
+
+CONSULTAS = {"sessoes": consulta_sessoes, "pagamentos": consulta_pagamentos}
+
+def linhas(stmt, tamanho_lote=TAMANHO_LOTE):
+    """Percorre o resultado em lotes com cursor no servidor, sem carregar tudo na memória."""
+    resultado = db.session.execute(stmt.execution_options(yield_per=tamanho_lote))
+    for lote in resultado.partitions():
+        yield lote
+
+def gerar_csv(stmt, tamanho_lote=TAMANHO_LOTE):
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow([c.name for c in stmt.selected_columns])
+    for lote in linhas(stmt, tamanho_lote):
+        escritor.writerows(lote)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+def gerar_ndjson(stmt, tamanho_lote=TAMANHO_LOTE):
+    nomes = [c.name for c in stmt.selected_columns]
+    convs = conversores(stmt.selected_columns)
+    for lote in linhas(stmt, tamanho_lote):
+        partes = []
+        for linha in lote:
+            registro = {nome: (f(v) if f else v) for nome, f, v in zip(nomes, convs, linha)}
+            partes.append(codificar(registro))
+        yield b"\n".join(partes) + b"\n"
+
+GERADORES = {"csv": gerar_csv, "ndjson": gerar_ndjson}
+
+def exportar(tipo, formato="csv", inicio=None, fim=None, cliente_id=None, tamanho_lote=TAMANHO_LOTE):
+    """Gerador com o conteúdo da exportação em pedaços, pronto para uma resposta em streaming."""
+    stmt = CONSULTAS[tipo](inicio, fim, cliente_id)
+    return GERADORES[formato](stmt, tamanho_lote)
@@ -0,0 +1,226 @@
+from app import db
+from app.models.cliente import Cliente
+from app.services.busca_clientes import tokens_do_cliente, indexar, normalizar, digitos
+from sqlalchemy import insert, select
+from xml.etree import ElementTree
+import csv
+import io
+import re
+import zipfile
+
+TAMANHO_LOTE = 1000
+
+CAMPOS = ["nome", "cpf_cnpj", "endereco", "telefone", "telefone_emergencia", "email"]
+
+# Cabeçalhos aceitos na planilha (já normalizados: minúsculas, sem acento, "_" no lugar de espaços)
+SINONIMOS = {
+    "nome": "nome", "nome_completo": "nome", "cliente": "nome", "paciente": "nome",
+    "cpf_cnpj": "cpf_cnpj", "cpf/cnpj": "cpf_cnpj", "cpf": "cpf_cnpj", "cnpj": "cpf_cnpj", "documento": "cpf_cnpj",
+    "endereco": "endereco",
+    "telefone": "telefone", "celular": "telefone", "fone": "telefone", "whatsapp": "telefone",
+    "telefone_emergencia": "telefone_emergencia", "telefone_de_emergencia": "telefone_emergencia",
+    "contato_de_emergencia": "telefone_emergencia", "emergencia": "telefone_emergencia",
+    "email": "email", "e-mail": "email",
+}
+
+# Mesma validação do formulário de cadastro (pages/clientes/ClienteCreate.tsx)
+EMAIL = re.compile(r"^\S+@\S+\.\S+$")
+
+class ArquivoInvalido(ValueError):
+    pass
+
+def campo_do_cabecalho(titulo):
+    return SINONIMOS.get(normalizar(str(titulo or "")).strip().replace(" ", "_"))
+
+def como_texto(valor):
+    # Planilhas guardam CPF e telefone como número: 12345678901.0 → "12345678901"
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    return str(valor).strip() if valor is not None else ""
+
+def normalizar_cpf_cnpj(valor):
+    """Só os dígitos, como o formulário grava; repõe zeros à esquerda perdidos pela planilha."""
+    numero = digitos(valor)
+    if not numero or set(numero) == {"0"}:
+        return ""
+    if len(numero) in (9, 10):
+        numero = numero.zfill(11)
+    elif len(numero) in (12, 13):
+        numero = numero.zfill(14)
+    return numero
+
+def decodificar(bruto):
+    # UTF-8 primeiro; o Excel no Windows salva CSV em cp1252 (o "ANSI" do Brasil)
+    for codificacao in ("utf-8-sig", "cp1252"):
+        try:
+            return bruto.decode(codificacao)
+        except UnicodeDecodeError:
+            continue
+    raise ArquivoInvalido("Não foi possível ler o CSV; salve-o como UTF-8.")
+
+def linhas_csv(arquivo):
+    # Lido inteiro para poder trocar de codificação: um erro de UTF-8 pode estar na última linha
+    texto = io.StringIO(decodificar(arquivo.read()), newline="")
+    amostra = texto.read(4096)
+    texto.seek(0)
+    try:
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=",;\t")
+    except csv.Error:
+        dialeto = csv.excel
+    try:
+        yield from csv.reader(texto, dialeto)
+    except csv.Error as e:
+        raise ArquivoInvalido(f"CSV inválido: {e}")
+
+def linhas_xlsx(arquivo):
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    # Arquivo que não é um .xlsx de verdade (ou está corrompido) falha ao abrir ou ao ler as células
+    invalido = (zipfile.BadZipFile, InvalidFileException, KeyError, ElementTree.ParseError)
+    try:
+        # read_only: lê a planilha em fluxo, sem carregar todas as células na memória
+        planilha = load_workbook(arquivo, read_only=True, data_only=True)
+    except invalido:
+        raise ArquivoInvalido("Planilha inválida ou corrompida; envie um arquivo .xlsx.")
+    try:
+        yield from planilha.worksheets[0].iter_rows(values_only=True)
+    except invalido:
+        raise ArquivoInvalido("Planilha inválida ou corrompida; envie um arquivo .xlsx.")
+    finally:
+        planilha.close()
+
+def ler_registros(arquivo, formato):
+    """(número da linha, {campo: texto}) de cada linha preenchida, a partir do cabeçalho."""
+    if formato not in ("csv", "xlsx"):
+        raise ArquivoInvalido("Formato não suportado; envie um arquivo .csv ou .xlsx.")
+    linhas = linhas_csv(arquivo) if formato == "csv" else linhas_xlsx(arquivo)
+
+    cabecalho = next(linhas, None)
+    if cabecalho is None:
+        raise ArquivoInvalido("Arquivo vazio.")
+    colunas = [(i, campo_do_cabecalho(titulo)) for i, titulo in enumerate(cabecalho)]
+    colunas = [(i, campo) for i, campo in colunas if campo]
+    if "nome" not in {campo for _, campo in colunas}:
+        raise ArquivoInvalido("O cabeçalho precisa de uma coluna 'nome'.")
+
+    for numero, linha in enumerate(linhas, start=2):
+        registro = {campo: como_texto(linha[i]) if i < len(linha) else "" for i, campo in colunas}
+        if any(registro.values()):
+            yield numero, registro
+
+def validar(registro):
+    erros = []
+    nome = registro.get("nome", "")
+    if not nome:
+        erros.append("nome é obrigatório")
+    elif len(nome) > 100:
+        erros.append("nome com mais de 100 caracteres")
+
+    cpf_cnpj = normalizar_cpf_cnpj(registro.get("cpf_cnpj"))
+    if cpf_cnpj and len(cpf_cnpj) not in (11, 14):
+        erros.append("CPF/CNPJ deve ter 11 ou 14 dígitos")
+
+    for campo in ("telefone", "telefone_emergencia"):
+        numero = digitos(registro.get(campo))
+        if numero and len(numero) not in (10, 11, 12, 13):
+            erros.append(f"{campo} inválido")
+
+    email = registro.get("email", "")
+    if email and (not EMAIL.match(email) or len(email) > 100):
+        erros.append("email inválido")
+
+    dados = {campo: registro.get(campo) or None for campo in CAMPOS}
+    dados.update(nome=nome, cpf_cnpj=cpf_cnpj)
+    return dados, erros
+
+def formatado(cpf_cnpj):
+    if len(cpf_cnpj) == 11:
+        return f"{cpf_cnpj[:3]}.{cpf_cnpj[3:6]}.{cpf_cnpj[6:9]}-{cpf_cnpj[9:]}"
+    return f"{cpf_cnpj[:2]}.{cpf_cnpj[2:5]}.{cpf_cnpj[5:8]}/{cpf_cnpj[8:12]}-{cpf_cnpj[12:]}"
+
+def ja_cadastrados(documentos):
+    """Quais CPF/CNPJ do lote já existem, numa única consulta IN (com e sem máscara)."""
+    if not documentos:
+        return set()
+    candidatos = set(documentos) | {formatado(d) for d in documentos}
+    encontrados = db.session.execute(
+        select(Cliente.cpf_cnpj).where(Cliente.cpf_cnpj.in_(candidatos))
+    ).scalars()
+    return {digitos(d) for d in encontrados}
+
+def gravar(validos):
+    """INSERT em massa; os tokens de busca são gravados aqui, já que não passa pelos eventos do ORM.
+
+    O RETURNING traz o id junto com a própria coluna `busca`: assim não depende da ordem das linhas,
+    o que permite ao SQLAlchemy agrupar vários clientes por INSERT.
+    """
+    for dados in validos:
+        tokens = tokens_do_cliente(
+            dados["nome"], dados["cpf_cnpj"], dados["telefone"], dados["email"], dados["telefone_emergencia"]
+        )
+        dados.update(ativo=True, busca=" ".join(tokens))
+    inseridos = db.session.execute(insert(Cliente).returning(Cliente.id, Cliente.busca), validos).all()
+    indexar(db.session.connection(), [(id_, busca.split()) for id_, busca in inseridos])
+    return [id_ for id_, _ in inseridos]
+
+def importar_lote(lote, vistos, relatorio):
+    validos = []
+    for numero, registro in lote:
+        dados, erros = validar(registro)
+        documento = dados["cpf_cnpj"]
+        if documento and documento in vistos:
+            erros.append(f"CPF/CNPJ repetido no arquivo (linha {vistos[documento]})")
+        if erros:
+            relatorio["erros"].append({"linha": numero, "nome": dados["nome"], "erros": erros})
+        else:
+            if documento:
+                vistos[documento] = numero
+            validos.append((numero, dados))
+
+    existentes = ja_cadastrados([dados["cpf_cnpj"] for _, dados in validos if dados["cpf_cnpj"]])
+    novos = []
+    for numero, dados in validos:
+        if dados["cpf_cnpj"] in existentes:
+            relatorio["erros"].append({
+                "linha": numero, "nome": dados["nome"], "erros": ["Já existe um cliente com este CPF/CNPJ."]
+            })
+        else:
+            novos.append(dados)
+
+    if novos:
+        gravar(novos)
+    relatorio["importados"] += len(novos)
+
+def importar_clientes(arquivo, formato, simular=False, tamanho_lote=TAMANHO_LOTE):
+    """Importa clientes de um CSV/XLSX em lotes; linhas com problema vão para o relatório, não abortam.
+
+    Tudo roda numa transação: em simulação (ou erro inesperado) nada é gravado.
+    """
+    relatorio = {"linhas": 0, "importados": 0, "erros": [], "simulacao": simular}
+    vistos = {}
+    lote = []
+    try:
+        for numero, registro in ler_registros(arquivo, formato):
+            relatorio["linhas"] += 1
+            lote.append((numero, registro))
+            if len(lote) >= tamanho_lote:
+                importar_lote(lote, vistos, relatorio)
+                lote = []
+        if lote:
+            importar_lote(lote, vistos, relatorio)
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if simular:
+        db.session.rollback()
+    else:
+        db.session.commit()
+    relatorio["erros"].sort(key=lambda erro: erro["linha"])
+    relatorio["rejeitados"] = len(relatorio["erros"])
+    return relatorio
+
+def formato_do_arquivo(nome):
+    extensao = (nome or "").rsplit(".", 1)[-1].lower()
+    return extensao if extensao in ("csv", "xlsx") else None
@@ -0,0 +1,132 @@
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from threading import Lock
+from time import perf_counter
+import os
+
+# Limites dos buckets (le) de cada histograma, como no client oficial do Prometheus
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+HISTOGRAMAS = {
+    "http_request_duration_seconds": ("Tempo total da requisição", BUCKETS_SEGUNDOS),
+    "db_query_duration_seconds": ("Tempo gasto no banco por requisição", BUCKETS_SEGUNDOS),
+    "db_queries_per_request": ("Comandos SQL executados por requisição", BUCKETS_CONSULTAS),
+}
+
+class Histograma:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.contagens = [0] * len(buckets)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        for i, limite in enumerate(self.buckets):
+            if valor <= limite:
+                self.contagens[i] += 1
+        self.soma += valor
+        self.total += 1
+
+# Valores por processo: com vários workers do gunicorn, cada um expõe os seus
+_series = {}
+_trava = Lock()
+
+def registrar(nome, rotulos, valor):
+    chave = (nome, tuple(sorted(rotulos.items())))
+    with _trava:
+        if chave not in _series:
+            _series[chave] = Histograma(HISTOGRAMAS[nome][1])
+        _series[chave].observar(valor)
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _rotulos(pares, extra=()):
+    return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in [*pares, *extra]) + "}"
+
+def texto_prometheus():
+    """Histogramas no formato de exposição de texto do Prometheus (versão 0.0.4)."""
+    linhas = []
+    with _trava:
+        series = sorted(_series.items())
+        for nome, (ajuda, _) in HISTOGRAMAS.items():
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} histogram")
+            for (serie, rotulos), h in series:
+                if serie != nome:
+                    continue
+                for limite, contagem in zip(h.buckets, h.contagens):
+                    linhas.append(f"{nome}_bucket{_rotulos(rotulos, [('le', limite)])} {contagem}")
+                linhas.append(f"{nome}_bucket{_rotulos(rotulos, [('le', '+Inf')])} {h.total}")
+                linhas.append(f"{nome}_sum{_rotulos(rotulos)} {h.soma}")
+                linhas.append(f"{nome}_count{_rotulos(rotulos)} {h.total}")
+    return "\n".join(linhas) + "\n"
+
+def limpar():
+    with _trava:
+        _series.clear()
+
+def _antes_do_comando(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("inicio_comandos", []).append(perf_counter())
+
+def _depois_do_comando(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get("inicio_comandos")
+    if not inicios:
+        return
+    duracao = perf_counter() - inicios.pop()
+    if has_request_context() and "metricas_inicio" in g:
+        g.metricas_consultas += 1
+        g.metricas_tempo_db += duracao
+
+def _ao_falhar(contexto):
+    inicios = contexto.connection.info.get("inicio_comandos") if contexto.connection else None
+    if inicios:
+        inicios.pop()
+
+def _iniciar_requisicao():
+    g.metricas_inicio = perf_counter()
+    g.metricas_consultas = 0
+    g.metricas_tempo_db = 0.0
+
+def _finalizar_requisicao(resposta):
+    if "metricas_inicio" not in g:
+        return resposta
+    total = perf_counter() - g.metricas_inicio
+    consultas, tempo_db = g.metricas_consultas, g.metricas_tempo_db
+    endpoint = request.endpoint or "desconhecido"
+
+    resposta.headers["Server-Timing"] = ", ".join([
+        f'db;dur={tempo_db * 1000:.1f};desc="{consultas} consultas"',
+        f"app;dur={(total - tempo_db) * 1000:.1f}",
+        f"total;dur={total * 1000:.1f}",
+    ])
+
+    if endpoint != "metricas.expor_metricas":  # a própria coleta não entra nas séries
+        rotulos = {"endpoint": endpoint, "method": request.method}
+        registrar("http_request_duration_seconds", {**rotulos, "status": resposta.status_code}, total)
+        registrar("db_query_duration_seconds", rotulos, tempo_db)
+        registrar("db_queries_per_request", rotulos, consultas)
+
+    orcamento = current_app.config["ORCAMENTO_CONSULTAS"]
+    if orcamento and consultas > orcamento:
+        # Muitas consultas numa requisição costumam ser um N+1
+        current_app.logger.warning(
+            "%s %s executou %d consultas SQL (orçamento: %d, %.1f ms no banco)",
+            request.method, request.path, consultas, orcamento, tempo_db * 1000
+        )
+    return resposta
+
+def init_metricas(app):
+    app.config.setdefault("ORCAMENTO_CONSULTAS", int(os.getenv("ORCAMENTO_CONSULTAS", 20)))
+    app.config.setdefault("METRICS_TOKEN", os.getenv("METRICS_TOKEN"))
+
+    # Na classe Engine: vale também para a réplica de leitura
+    if not event.contains(Engine, "before_cursor_execute", _antes_do_comando):
+        event.listen(Engine, "before_cursor_execute", _antes_do_comando)
+        event.listen(Engine, "after_cursor_execute", _depois_do_comando)
+        event.listen(Engine, "handle_error", _ao_falhar)
+
+    app.before_request(_iniciar_requisicao)
+    app.after_request(_finalizar_requisicao)
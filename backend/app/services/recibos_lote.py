@@ -0,0 +1,237 @@
+from app import db
+from app.models.sessao import Sessao
+from app.models.cliente import Cliente
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from flask import current_app
+from sqlalchemy import func, String
+import hashlib
+import io
+import json
+import math
+import os
+import re
+import unicodedata
+import zipfile
+from xml.sax.saxutils import escape
+
+MESES = [
+    "janeiro", "fevereiro", "março", "abril", "maio", "junho",
+    "julho", "agosto", "setembro", "outubro", "novembro", "dezembro"
+]
+
+# Muda quando o layout do PDF muda, para não reaproveitar recibos antigos do cache
+VERSAO_LAYOUT = 1
+
+# Abaixo disso o custo de subir os processos é maior que o da renderização
+MINIMO_PARA_PROCESSOS = 4
+
+UNIDADES = ["", "um", "dois", "três", "quatro", "cinco", "seis", "sete", "oito", "nove",
+            "dez", "onze", "doze", "treze", "quatorze", "quinze", "dezesseis", "dezessete",
+            "dezoito", "dezenove"]
+DEZENAS = ["", "", "vinte", "trinta", "quarenta", "cinquenta", "sessenta", "setenta",
+           "oitenta", "noventa"]
+CENTENAS = ["", "cento", "duzentos", "trezentos", "quatrocentos", "quinhentos",
+            "seiscentos", "setecentos", "oitocentos", "novecentos"]
+
+def _ate_mil(n):
+    if n == 100:
+        return "cem"
+    partes = []
+    if n >= 100:
+        partes.append(CENTENAS[n // 100])
+        n %= 100
+    if n >= 20:
+        partes.append(DEZENAS[n // 10])
+        n %= 10
+    if n:
+        partes.append(UNIDADES[n])
+    return " e ".join(partes)
+
+def por_extenso(valor):
+    """Valor inteiro em reais por extenso, como o `extenso` do frontend (modo currency)."""
+    n = math.floor(valor + 0.5)  # como o Math.round do frontend: ,50 arredonda para cima (round() iria ao par)
+    if n == 0:
+        return "zero reais"
+
+    milhoes, resto = divmod(n, 1_000_000)
+    milhares, unidades = divmod(resto, 1000)
+    grupos = []
+    if milhoes:
+        grupos.append((milhoes, f"{_ate_mil(milhoes)} {'milhão' if milhoes == 1 else 'milhões'}"))
+    if milhares:
+        grupos.append((milhares, "mil" if milhares == 1 else f"{_ate_mil(milhares)} mil"))
+    if unidades:
+        grupos.append((unidades, _ate_mil(unidades)))
+
+    texto = grupos[0][1]
+    for grupo, parte in grupos[1:]:
+        # "mil e cem", "mil e cinquenta", "mil duzentos e trinta"
+        texto += (" e " if grupo < 100 or grupo % 100 == 0 else " ") + parte
+    if milhoes and not resto:
+        texto += " de"
+    return f"{texto} {'real' if n == 1 else 'reais'}"
+
+def agregar_datas(coluna):
+    if db.engine.dialect.name == "postgresql":
+        return func.string_agg(func.cast(coluna, String), ",")
+    return func.group_concat(coluna, ",")
+
+def totais_do_mes(mes, ano):
+    """Quantidade, valor e datas das sessões pagas e realizadas de cada cliente, em uma consulta."""
+    inicio = date(ano, mes, 1)
+    fim = date(ano + 1, 1, 1) if mes == 12 else date(ano, mes + 1, 1)
+
+    linhas = db.session.query(
+        Sessao.cliente_id,
+        Cliente.nome,
+        Cliente.cpf_cnpj,
+        func.count(),
+        func.coalesce(func.sum(Sessao.valor), 0),
+        agregar_datas(Sessao.data),
+    ).join(Cliente, Cliente.id == Sessao.cliente_id).filter(
+        Sessao.foi_realizada == True,
+        Sessao.foi_paga == True,
+        Sessao.data >= inicio,
+        Sessao.data < fim
+    ).group_by(Sessao.cliente_id, Cliente.nome, Cliente.cpf_cnpj).order_by(Cliente.nome).all()
+
+    return [
+        {
+            "cliente_id": cliente_id,
+            "nome": nome,
+            "cpf_cnpj": cpf_cnpj or "",
+            "quantidade": quantidade,
+            "valor_total": float(valor_total),
+            "datas": sorted(datas.split(",")),
+            "mes": mes,
+            "ano": ano,
+        }
+        for cliente_id, nome, cpf_cnpj, quantidade, valor_total, datas in linhas
+    ]
+
+def hash_conteudo(dados):
+    bruto = json.dumps({**dados, "layout": VERSAO_LAYOUT}, sort_keys=True)
+    return hashlib.sha256(bruto.encode()).hexdigest()[:16]
+
+def caminho_cache(dados):
+    # Um arquivo por conteúdo: fora do cache da aplicação (não disputa o CACHE_THRESHOLD com o
+    # dashboard) e compartilhado pelos workers da mesma máquina
+    pasta = current_app.config.get("RECIBOS_CACHE_DIR") or os.path.join(current_app.instance_path, "recibos")
+    nome = f"{dados['cliente_id']}-{dados['ano']}-{dados['mes']:02d}-{hash_conteudo(dados)}.pdf"
+    return os.path.join(pasta, nome)
+
+def ler_cache(dados):
+    try:
+        with open(caminho_cache(dados), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def gravar_cache(dados, pdf):
+    caminho = caminho_cache(dados)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "wb") as f:
+        f.write(pdf)
+    os.replace(temporario, caminho)  # outro worker nunca lê um PDF pela metade
+
+def nome_arquivo(dados):
+    nome = unicodedata.normalize("NFKD", dados["nome"]).encode("ascii", "ignore").decode()
+    nome = re.sub(r"[^a-z0-9]+", "-", nome.lower()).strip("-")
+    return f"recibo-{dados['ano']}-{dados['mes']:02d}-{dados['cliente_id']}-{nome}.pdf"
+
+def formatar_datas(datas):
+    formatadas = [f"{d[8:10]} de {MESES[int(d[5:7]) - 1].capitalize()}" for d in datas]
+    if len(formatadas) <= 1:
+        return "".join(formatadas)
+    return ", ".join(formatadas[:-1]) + " e " + formatadas[-1]
+
+def formatar_moeda(valor):
+    inteiro, centavos = f"{valor:,.2f}".split(".")
+    return f"R$ {inteiro.replace(',', '.')},{centavos}"
+
+def renderizar_pdf(dados, emissao):
+    """Recibo em PDF; roda nos processos do pool, então só recebe e devolve dados simples."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    centro = ParagraphStyle("centro", fontName="Helvetica", fontSize=12, leading=16, alignment=TA_CENTER)
+    titulo = ParagraphStyle("titulo", parent=centro, fontName="Helvetica-Bold", fontSize=25, leading=30)
+    destaque = ParagraphStyle("destaque", parent=centro, fontSize=16, leading=22)
+    rodape = ParagraphStyle("rodape", parent=centro, fontSize=9, leading=12)
+
+    emitente = dados["emitente"]
+    quantidade = dados["quantidade"]
+    datas = formatar_datas(dados["datas"])
+    texto = (
+        f"Recebi de <b>{escape(dados['nome'])}</b> (CPF - <b>{escape(dados['cpf_cnpj'])}</b>) a quantia de "
+        f"<b>{formatar_moeda(dados['valor_total'])}</b> (<b>{por_extenso(dados['valor_total'])}</b>), "
+        f"correspondente à <b>{quantidade}</b> {'sessão' if quantidade == 1 else 'sessões'} de psicoterapia"
+        + (f" nos dias <b>{datas}</b>." if datas else ".")
+    )
+
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4, title="Recibo").build([
+        Spacer(1, 60),
+        Paragraph("RECIBO", titulo),
+        Spacer(1, 30),
+        Paragraph(texto, destaque),
+        Spacer(1, 20),
+        Paragraph(
+            f"<b>Emitente: {emitente['nome']}<br/>CPF: {emitente['cpf']}<br/>CRP: {emitente['crp']}</b>",
+            centro
+        ),
+        Spacer(1, 12),
+        Paragraph(f"{emitente['cidade']}, {emissao.day:02d} de {MESES[emissao.month - 1]} de {emissao.year}.", centro),
+        Spacer(1, 40),
+        Paragraph("_" * 51, centro),
+        Spacer(1, 30),
+        Paragraph(f"{emitente['endereco']}<br/>{emitente['contato']}", rodape),
+    ])
+    return buffer.getvalue()
+
+def renderizar_varios(pendentes, emissao, processos=None):
+    if len(pendentes) < MINIMO_PARA_PROCESSOS or processos == 1:
+        return [renderizar_pdf(dados, emissao) for dados in pendentes]
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        return list(pool.map(renderizar_pdf, pendentes, [emissao] * len(pendentes)))
+
+def gerar_lote(mes, ano, processos=None, emissao=None):
+    """Recibos do mês de todos os clientes, renderizando só os que não estão no cache.
+
+    A data de emissão não entra no hash: um recibo já emitido é reaproveitado como foi gerado.
+    """
+    emissao = emissao or date.today()
+    # O emitente entra nos dados (e no hash): os processos do pool não têm o app
+    emitente = current_app.config["RECIBO_EMITENTE"]
+
+    arquivos, pendentes = {}, []
+    for dados in totais_do_mes(mes, ano):
+        dados["emitente"] = emitente
+        pdf = ler_cache(dados)
+        if pdf is None:
+            pendentes.append(dados)
+        else:
+            arquivos[nome_arquivo(dados)] = pdf
+
+    for dados, pdf in zip(pendentes, renderizar_varios(pendentes, emissao, processos)):
+        gravar_cache(dados, pdf)
+        arquivos[nome_arquivo(dados)] = pdf
+
+    relatorio = {
+        "recibos": len(arquivos),
+        "renderizados": len(pendentes),
+        "em_cache": len(arquivos) - len(pendentes),
+    }
+    return dict(sorted(arquivos.items())), relatorio
+
+def compactar(arquivos):
+    buffer = io.BytesIO()
+    # PDFs já são comprimidos; ZIP_STORED evita gastar CPU à toa
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as zf:
+        for nome, conteudo in arquivos.items():
+            zf.writestr(nome, conteudo)
+    return buffer.getvalue()
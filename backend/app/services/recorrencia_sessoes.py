@@ -0,0 +1,64 @@
+from datetime import timedelta
+import unicodedata
+
+# Intervalo em dias entre ocorrências de cada frequência
+FREQ_MAP = {
+    "semanal": 7,
+    "quinzenal": 14,
+    "mensal": 30,
+    "avulsa": 0,
+}
+
+def normalizar_dia_semana(nome_dia):
+    return unicodedata.normalize("NFKD", nome_dia).encode("ASCII", "ignore").decode("ASCII").lower()
+
+def dias_da_frequencia(frequencia):
+    return FREQ_MAP.get(normalizar_dia_semana(frequencia or ""), 0)
+
+def datas_repeticao(data_inicial, frequencia, quantidade=8):
+    """Datas das ocorrências seguintes de uma série de `quantidade` sessões.
+
+    Não inclui `data_inicial`. Cada data recua até cair no mesmo dia da semana
+    da sessão inicial (relevante para a frequência mensal de 30 dias).
+    """
+    dias = dias_da_frequencia(frequencia)
+    if dias <= 0:
+        return []
+
+    dia_semana_alvo = data_inicial.weekday()  # 0 = segunda, 6 = domingo
+    datas = []
+    for i in range(1, quantidade):
+        nova_data = data_inicial + timedelta(days=dias * i)
+        while nova_data.weekday() != dia_semana_alvo:
+            nova_data -= timedelta(days=1)
+        datas.append(nova_data)
+    return datas
+
+def datas_no_intervalo(data_inicial, frequencia, inicio, fim, data_fim=None):
+    """Ocorrências da série (incluindo `data_inicial`) entre `inicio` e `fim`.
+
+    Segue a mesma regra de `datas_repeticao`, mas calcula diretamente os
+    índices que caem na janela, sem percorrer a série desde o início.
+    """
+    if data_fim and data_fim < fim:
+        fim = data_fim
+    if fim < data_inicial or fim < inicio:
+        return []
+
+    dias = dias_da_frequencia(frequencia)
+    if dias <= 0:
+        return [data_inicial] if inicio <= data_inicial <= fim else []
+
+    dia_semana_alvo = data_inicial.weekday()
+    # O alinhamento ao dia da semana recua no máximo 6 dias
+    primeiro = max(0, (inicio - data_inicial).days // dias)
+    ultimo = (fim + timedelta(days=6) - data_inicial).days // dias
+
+    datas = []
+    for i in range(primeiro, ultimo + 1):
+        nova_data = data_inicial + timedelta(days=dias * i)
+        while nova_data.weekday() != dia_semana_alvo:
+            nova_data -= timedelta(days=1)
+        if inicio <= nova_data <= fim:
+            datas.append(nova_data)
+    return datas
@@ -1,58 +1,117 @@
 from app import db
 from app.models.sessao import Sessao
+from app.models.serie_repeticao import SerieRepeticao
+from app.services.recorrencia_sessoes import FREQ_MAP
 from datetime import datetime, timedelta
-from collections import defaultdict
+from sqlalchemy import func, insert, select
+import time
 
-FREQ_MAP = {
-    "semanal": 7,
-    "quinzenal": 14,
-    "mensal": 30,
-}
+# Frequências que se repetem (a "avulsa" não gera novas ocorrências)
+FREQUENCIAS_RECORRENTES = [frequencia for frequencia, dias in FREQ_MAP.items() if dias > 0]
 
-def renovar_sessoes_repetidas():
-    hoje = datetime.utcnow().date()
-
-    sessoes = Sessao.query.filter(Sessao.repeticao_id.isnot(None)).all()
-    sessoes_por_repeticao = defaultdict(list)
+def ultimas_sessoes_por_serie():
+    """Última ocorrência de cada série, em uma única consulta com window function.
 
-    for s in sessoes:
-        sessoes_por_repeticao[s.repeticao_id].append(s)
+    Só séries materializadas: as de SerieRepeticao são calculadas sob demanda, e as linhas
+    delas (com `data_ocorrencia`) são exceções gravadas, não algo a renovar.
+    """
+    numeradas = db.session.query(
+        Sessao.repeticao_id,
+        Sessao.cliente_id,
+        Sessao.data,
+        Sessao.horario,
+        Sessao.tipo_atendimento,
+        Sessao.frequencia,
+        Sessao.valor,
+        func.row_number().over(
+            partition_by=Sessao.repeticao_id,
+            order_by=(Sessao.data.desc(), Sessao.id.desc())
+        ).label("posicao")
+    ).filter(
+        Sessao.repeticao_id.isnot(None),
+        Sessao.data_ocorrencia.is_(None),
+        Sessao.repeticao_id.not_in(select(SerieRepeticao.id))
+    ).subquery()
 
-    for repeticao_id, lista in sessoes_por_repeticao.items():
-        lista.sort(key=lambda s: s.data)
-        ultima = lista[-1]
-
-        dias = FREQ_MAP.get(ultima.frequencia)
-        if not dias:
-            continue
+    return db.session.query(numeradas).filter(
+        numeradas.c.posicao == 1,
+        numeradas.c.frequencia.in_(FREQUENCIAS_RECORRENTES)
+    ).order_by(numeradas.c.repeticao_id).all()
 
-        for i in range(1, 5):
+def sessoes_candidatas(ultimas, hoje, horizonte):
+    for ultima in ultimas:
+        dias = FREQ_MAP[ultima.frequencia]
+        # Intervalo fixo a partir da última sessão, sem alinhar ao dia da semana como
+        # datas_repeticao: a renovação sempre gerou "mensal" de 30 em 30 dias
+        for i in range(1, horizonte + 1):
             nova_data = ultima.data + timedelta(days=dias * i)
             if nova_data <= hoje:
                 continue
+            yield {
+                "cliente_id": ultima.cliente_id,
+                "data": nova_data,
+                "tipo_atendimento": ultima.tipo_atendimento,
+                "frequencia": ultima.frequencia,
+                "horario": ultima.horario,
+                "foi_realizada": False,
+                "foi_paga": False,
+                "valor": ultima.valor,
+                "observacoes": "",
+                "repeticao_id": ultima.repeticao_id,
+            }
 
-            existe = Sessao.query.filter_by(
-                cliente_id=ultima.cliente_id,
-                data=nova_data,
-                horario=ultima.horario,
-                tipo_atendimento=ultima.tipo_atendimento
-            ).first()
+def sessoes_existentes(candidatas):
+    """Chaves (cliente, data, horário, tipo) já gravadas entre as candidatas do lote."""
+    linhas = db.session.query(
+        Sessao.cliente_id, Sessao.data, Sessao.horario, Sessao.tipo_atendimento
+    ).filter(
+        Sessao.cliente_id.in_({c["cliente_id"] for c in candidatas}),
+        Sessao.data >= min(c["data"] for c in candidatas),
+        Sessao.data <= max(c["data"] for c in candidatas)
+    ).all()
+    return {tuple(linha) for linha in linhas}
 
-            if existe:
-                continue
+def chave(candidata):
+    return (candidata["cliente_id"], candidata["data"], candidata["horario"], candidata["tipo_atendimento"])
+
+def renovar_sessoes_repetidas(horizonte=4, simular=False, tamanho_lote=500):
+    """Gera as próximas `horizonte` ocorrências de cada série que ainda não existem.
+
+    Processa as séries em lotes: uma consulta de existência e um INSERT em
+    massa por lote, com commit ao fim de cada um (exceto em simulação).
+    Retorna contagens e tempo gasto.
+    """
+    inicio = time.perf_counter()
+    hoje = datetime.utcnow().date()
+
+    ultimas = ultimas_sessoes_por_serie()
+    relatorio = {"series": len(ultimas), "candidatas": 0, "inseridas": 0, "lotes": 0}
+    geradas = set()
+
+    for posicao in range(0, len(ultimas), tamanho_lote):
+        candidatas = list(sessoes_candidatas(ultimas[posicao:posicao + tamanho_lote], hoje, horizonte))
+        if not candidatas:
+            continue
+
+        # Também descarta repetidas entre as próprias candidatas (mesmo cliente em duas séries)
+        existentes = sessoes_existentes(candidatas) | geradas
+        novas = []
+        for candidata in candidatas:
+            if chave(candidata) not in existentes:
+                existentes.add(chave(candidata))
+                novas.append(candidata)
+        geradas.update(chave(c) for c in novas)
+
+        relatorio["candidatas"] += len(candidatas)
+        relatorio["inseridas"] += len(novas)
+        relatorio["lotes"] += 1
+
+        if novas and not simular:
+            db.session.execute(insert(Sessao), novas)
+            db.session.commit()
+
+    if simular:
+        db.session.rollback()
 
-            nova = Sessao(
-                cliente_id=ultima.cliente_id,
-                data=nova_data,
-                tipo_atendimento=ultima.tipo_atendimento,
-                frequencia=ultima.frequencia,
-                horario=ultima.horario,
-                foi_realizada=False,
-                foi_paga=False,
-                valor=ultima.valor,
-                observacoes="",
-                repeticao_id=repeticao_id
-            )
-            db.session.add(nova)
-
-    db.session.commit()
\ No newline at end of file
+    relatorio["segundos"] = round(time.perf_counter() - inicio, 3)
+    return relatorio
@@ -0,0 +1,77 @@
+from app import db, cache
+from flask import request, current_app
+from datetime import datetime
+from app.services.alteracoes import observar_por_classe
+import hashlib
+import time
+
+# Versão de cada tabela: o time_ns() da última gravação vista. Fica no cache (Redis em produção),
+# então validar uma lista não consulta o banco. Se a chave sumir (expirou, reinício, outro
+# processo com SimpleCache), a versão nova é sempre maior: no máximo força um download a mais.
+
+def chave_versao(tabela):
+    return f"condicional:versao:{tabela}"
+
+def versao(tabela):
+    atual = cache.get(chave_versao(tabela))
+    if atual is None:
+        atual = time.time_ns()
+        cache.set(chave_versao(tabela), atual, timeout=current_app.config["CACHE_DEFAULT_TIMEOUT"])
+    return atual
+
+def dependentes(tabela):
+    """A tabela e as que apontam para ela: um DELETE em cascata no banco não passa pelo ORM."""
+    tabelas = {tabela}
+    for outra in db.metadata.tables.values():
+        if any(fk.column.table.name == tabela for fk in outra.foreign_keys):
+            tabelas.add(outra.name)
+    return tabelas
+
+def invalidar(tabelas):
+    agora = time.time_ns()
+    for tabela in tabelas:
+        cache.set(chave_versao(tabela), agora, timeout=current_app.config["CACHE_DEFAULT_TIMEOUT"])
+
+def validador(*modelos):
+    """ETag e Last-Modified de um conjunto de tabelas, a partir das versões guardadas no cache."""
+    versoes = [versao(modelo.__tablename__) for modelo in modelos]
+    bruto = "|".join(f"{modelo.__tablename__}:{v}" for modelo, v in zip(modelos, versoes))
+    return hashlib.md5(bruto.encode()).hexdigest(), datetime.utcfromtimestamp(max(versoes) / 1e9)
+
+def nao_modificado(etag, ultima_modificacao):
+    # If-None-Match tem prioridade sobre If-Modified-Since (RFC 9110)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and ultima_modificacao:
+        return ultima_modificacao.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+def resposta_condicional(modelos, gerar_resposta):
+    """Responde 304 se nenhuma das tabelas mudou; senão chama `gerar_resposta` e anexa os validadores.
+
+    Assim uma visita repetida não faz a consulta da lista nem a serialização em JSON.
+    """
+    if not isinstance(modelos, (list, tuple)):
+        modelos = (modelos,)
+    etag, ultima_modificacao = validador(*modelos)
+
+    if nao_modificado(etag, ultima_modificacao):
+        resposta = current_app.response_class(status=304)
+    else:
+        resposta = current_app.make_response(gerar_resposta())
+        if resposta.status_code != 200:
+            return resposta
+
+    resposta.set_etag(etag, weak=True)
+    resposta.last_modified = ultima_modificacao
+    # Força o navegador a revalidar a cada uso, reaproveitando o corpo guardado no 304
+    resposta.headers["Cache-Control"] = "private, no-cache"
+    return resposta
+
+def init_requisicao_condicional():
+    # Só muda a versão depois do commit: um 200 nunca carrega dados ainda não gravados
+    observar_por_classe(
+        "condicional",
+        lambda classe: {classe.__table__.name},
+        lambda session, tabelas: invalidar(set().union(*(dependentes(t) for t in tabelas))),
+    )
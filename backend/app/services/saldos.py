@@ -0,0 +1,148 @@
+from app.models.sessao import Sessao
+from app.models.pagamento import Pagamento
+from app.models.saldo_cliente import SaldoCliente
+from datetime import datetime
+from decimal import Decimal
+from app.services.alteracoes import observar
+from sqlalchemy import select, insert, delete, func, case, and_, literal, inspect
+
+COLUNAS = [
+    "cliente_id", "total_faturado", "total_pago", "em_aberto",
+    "sessoes_em_aberto", "ultima_sessao", "proxima_sessao", "atualizado_em"
+]
+
+# Alteração que exige refazer todos os saldos (comando em massa sem filtro que dê para ler)
+TODOS = "todos"
+
+def consulta_saldos(cliente_ids=None):
+    """SELECT com uma linha de SaldoCliente por cliente, agregando sessões e pagamentos."""
+    pago_por_sessao = select(
+        Pagamento.sessao_id, func.sum(Pagamento.valor_pago).label("pago")
+    ).group_by(Pagamento.sessao_id)
+    if cliente_ids is not None:
+        pago_por_sessao = pago_por_sessao.join(Sessao, Sessao.id == Pagamento.sessao_id).where(
+            Sessao.cliente_id.in_(cliente_ids)
+        )
+    pago_por_sessao = pago_por_sessao.subquery()
+
+    valor = func.coalesce(Sessao.valor, 0)
+    pago = func.coalesce(pago_por_sessao.c.pago, 0)
+    devendo = and_(Sessao.foi_realizada == True, Sessao.foi_paga == False)
+
+    stmt = select(
+        Sessao.cliente_id,
+        func.coalesce(func.sum(case((Sessao.foi_realizada == True, valor), else_=0)), 0),
+        func.coalesce(func.sum(pago), 0),
+        # Pagamentos parciais abatem o valor da sessão ainda não quitada
+        func.coalesce(func.sum(case((and_(devendo, valor > pago), valor - pago), else_=0)), 0),
+        func.count().filter(devendo),
+        func.max(Sessao.data).filter(Sessao.foi_realizada == True),
+        func.min(Sessao.data).filter(Sessao.foi_realizada == False),
+        literal(datetime.utcnow()),
+    ).outerjoin(pago_por_sessao, pago_por_sessao.c.sessao_id == Sessao.id).group_by(Sessao.cliente_id)
+    if cliente_ids is not None:
+        stmt = stmt.where(Sessao.cliente_id.in_(cliente_ids))
+    return stmt
+
+def recalcular(executor, cliente_ids=None):
+    """Regrava os saldos dos clientes (ou de todos) com um DELETE e um INSERT ... SELECT.
+
+    Refaz o cliente inteiro em vez de somar deltas: custa agregar as sessões dele a cada commit,
+    mas vale para qualquer alteração (valor, realizada, paga, troca de cliente, cascata).
+    """
+    remover = delete(SaldoCliente)
+    if cliente_ids is not None:
+        if not cliente_ids:
+            return
+        cliente_ids = sorted(cliente_ids)
+        remover = remover.where(SaldoCliente.cliente_id.in_(cliente_ids))
+    executor.execute(remover)
+    executor.execute(insert(SaldoCliente).from_select(COLUNAS, consulta_saldos(cliente_ids)))
+
+def divergencias(executor):
+    """Clientes cujo saldo gravado difere do calculado a partir das sessões e pagamentos."""
+    campos = COLUNAS[1:-1]
+    esperados = {linha[0]: linha[1:-1] for linha in executor.execute(consulta_saldos())}
+    gravados = {
+        linha[0]: linha[1:] for linha in executor.execute(
+            select(SaldoCliente.cliente_id, *[getattr(SaldoCliente, c) for c in campos])
+        )
+    }
+
+    def normalizar(valores):
+        return tuple(Decimal(str(v)) if isinstance(v, (int, float, Decimal)) else v for v in valores)
+
+    diferentes = []
+    for cliente_id in esperados.keys() | gravados.keys():
+        esperado, gravado = esperados.get(cliente_id), gravados.get(cliente_id)
+        if esperado is None or gravado is None or normalizar(esperado) != normalizar(gravado):
+            diferentes.append(cliente_id)
+    return sorted(diferentes)
+
+def clientes(ids):
+    return {("cliente", i) for i in ids if i is not None}
+
+def sessoes(ids):
+    return {("sessao", i) for i in ids if i is not None}
+
+def do_flush(session, objetos):
+    alterados = set()
+    for obj in objetos:
+        if isinstance(obj, Sessao):
+            # Inclui o cliente anterior se a sessão mudou de cliente
+            anteriores = inspect(obj).attrs.cliente_id.history.deleted or ()
+            alterados |= clientes([obj.cliente_id, *anteriores])
+        elif isinstance(obj, Pagamento):
+            alterados |= sessoes([obj.sessao_id])
+    return alterados
+
+def em_massa(estado):
+    classe = estado.bind_mapper.class_
+    if classe not in (Sessao, Pagamento):
+        return set()
+
+    session = estado.session
+    parametros = estado.parameters if isinstance(estado.parameters, list) else [estado.parameters or {}]
+    onde = getattr(estado.statement, "whereclause", None)
+
+    if estado.is_insert:
+        if classe is Sessao and all("cliente_id" in p for p in parametros):
+            return clientes(p["cliente_id"] for p in parametros)
+        if classe is Pagamento and all("sessao_id" in p for p in parametros):
+            return sessoes(p["sessao_id"] for p in parametros)
+        return {TODOS}
+    if onde is not None:
+        # As linhas atingidas são lidas antes de o comando rodar
+        if classe is Sessao:
+            afetados = select(Sessao.cliente_id).where(onde).distinct()
+        else:
+            afetados = select(Sessao.cliente_id).join(Pagamento, Pagamento.sessao_id == Sessao.id).where(onde).distinct()
+        return clientes(session.execute(afetados).scalars().all())
+    if all("id" in p for p in parametros):
+        # UPDATE em massa pela chave primária
+        ids = [p["id"] for p in parametros]
+        if classe is Sessao:
+            return clientes(session.execute(
+                select(Sessao.cliente_id).where(Sessao.id.in_(ids)).distinct()
+            ).scalars().all())
+        return sessoes(session.execute(
+            select(Pagamento.sessao_id).where(Pagamento.id.in_(ids))
+        ).scalars().all())
+    return {TODOS}
+
+def confirmar(session, alterados):
+    """Antes do commit, na mesma transação: refaz os saldos dos clientes atingidos."""
+    if TODOS in alterados:
+        recalcular(session)
+        return
+    cliente_ids = {i for tipo, i in alterados if tipo == "cliente"}
+    sessao_ids = {i for tipo, i in alterados if tipo == "sessao"}
+    if sessao_ids:
+        cliente_ids |= set(session.execute(
+            select(Sessao.cliente_id).where(Sessao.id.in_(sessao_ids)).distinct()
+        ).scalars().all())
+    if cliente_ids:
+        recalcular(session, cliente_ids)
+
+def init_saldos():
+    observar("saldos", do_flush, em_massa, confirmar, antes_do_commit=True)
@@ -0,0 +1,88 @@
+from app import db
+from app.models.cliente import Cliente
+from app.models.sessao import Sessao
+from app.models.historico import Historico
+from app.models.nota import Nota
+from app.models.pagamento import Pagamento
+from flask import current_app, request
+from sqlalchemy import Numeric, Date, DateTime, Time
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+# Mesmos campos (e ordem) do to_dict() de cada modelo
+CAMPOS = {
+    Cliente: ["id", "nome", "cpf_cnpj", "endereco", "telefone", "telefone_emergencia",
+              "email", "ativo", "criado_em"],
+    Sessao: ["id", "cliente_id", "repeticao_id", "data_ocorrencia", "data", "tipo_atendimento",
+             "frequencia", "horario", "foi_realizada", "foi_paga", "valor", "observacoes", "criado_em"],
+    Historico: ["id", "cliente_id", "data", "tipo", "conteudo"],
+    Nota: ["id", "titulo", "conteudo", "criado_em", "atualizado_em"],
+    Pagamento: ["id", "sessao_id", "valor_pago", "forma_pagamento", "data_pagamento", "observacoes"],
+}
+
+def colunas(modelo):
+    return [modelo.__table__.c[nome] for nome in CAMPOS[modelo]]
+
+def _iso(valor):
+    return valor.isoformat() if valor is not None else None
+
+def _float(valor):
+    return float(valor) if valor is not None else None
+
+def conversores(cols):
+    """Um conversor por coluna, escolhido pelo tipo; None quando o valor já é JSON nativo."""
+    resultado = []
+    for coluna in cols:
+        if isinstance(coluna.type, Numeric):
+            resultado.append(_float)
+        elif isinstance(coluna.type, (Date, DateTime, Time)) and orjson is None:
+            resultado.append(_iso)  # o orjson já serializa datas no mesmo formato ISO
+        else:
+            resultado.append(None)
+    return resultado
+
+def converter_linhas(linhas, convs):
+    if not any(convs):
+        return [list(linha) for linha in linhas]
+    pares = [(i, f) for i, f in enumerate(convs) if f]
+    resultado = []
+    for linha in linhas:
+        linha = list(linha)
+        for i, f in pares:
+            linha[i] = f(linha[i])
+        resultado.append(linha)
+    return resultado
+
+def codificar(dados):
+    if orjson is not None:
+        return orjson.dumps(dados)
+    return json.dumps(dados, ensure_ascii=False, separators=(",", ":")).encode()
+
+def consultar(modelo, *filtros, ordem=(), limite=None):
+    """Linhas como tuplas, via select() de colunas: sem objetos ORM nem identity map."""
+    stmt = db.select(*colunas(modelo)).where(*filtros).order_by(*ordem)
+    if limite is not None:
+        stmt = stmt.limit(limite)
+    return db.session.execute(stmt).all()
+
+def serializar(modelo, linhas, colunar=False):
+    cols = colunas(modelo)
+    valores = converter_linhas(linhas, conversores(cols))
+    nomes = CAMPOS[modelo]
+    if colunar:
+        return {"cols": nomes, "rows": valores}
+    return [dict(zip(nomes, linha)) for linha in valores]
+
+def formato_colunar():
+    return request.args.get("formato") == "colunas"
+
+def resposta_json(dados):
+    return current_app.response_class(codificar(dados), mimetype="application/json")
+
+def resposta_lista(modelo, linhas):
+    """Resposta JSON de uma lista; `?formato=colunas` devolve {"cols": [...], "rows": [[...]]}."""
+    return resposta_json(serializar(modelo, linhas, formato_colunar()))
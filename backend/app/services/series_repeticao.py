@@ -0,0 +1,143 @@
+from app import db
+from app.models.cliente import Cliente
+from app.models.sessao import Sessao
+from app.models.serie_repeticao import SerieRepeticao
+from app.services.serializacao import CAMPOS
+from collections import namedtuple
+from datetime import date
+from sqlalchemy import or_
+
+# Linha do dashboard para uma ocorrência ainda não gravada (mesmos campos de sessoes_pendentes)
+Pendente = namedtuple("Pendente", "nome telefone data horario tipo_atendimento")
+
+# Ocorrência ainda não gravada nas colunas listadas de `sessoes` (id e criado_em nulos)
+LinhaSessao = namedtuple("LinhaSessao", CAMPOS[Sessao])
+
+
+def series_ativas(inicio, fim, cliente_id=None, tipo_atendimento=None):
+    """Séries com alguma ocorrência possível entre `inicio` e `fim`."""
+    query = SerieRepeticao.query.filter(
+        SerieRepeticao.data_inicio <= fim,
+        or_(SerieRepeticao.data_fim.is_(None), SerieRepeticao.data_fim >= inicio)
+    )
+    if cliente_id:
+        query = query.filter(SerieRepeticao.cliente_id == cliente_id)
+    if tipo_atendimento:
+        query = query.filter(SerieRepeticao.tipo_atendimento == tipo_atendimento)
+    return query.all()
+
+
+def ocorrencias_materializadas(series, inicio, fim):
+    """Pares (repeticao_id, data_ocorrencia) que já existem como linhas em `sessoes`."""
+    if not series:
+        return set()
+    linhas = db.session.query(Sessao.repeticao_id, Sessao.data_ocorrencia).filter(
+        Sessao.repeticao_id.in_([s.id for s in series]),
+        Sessao.data_ocorrencia >= inicio,
+        Sessao.data_ocorrencia <= fim
+    ).all()
+    return {tuple(linha) for linha in linhas}
+
+
+def ocorrencia_para_dict(serie, data):
+    return {
+        "id": None,
+        "cliente_id": serie.cliente_id,
+        "repeticao_id": serie.id,
+        "data_ocorrencia": data.isoformat(),
+        "data": data.isoformat(),
+        "tipo_atendimento": serie.tipo_atendimento,
+        "frequencia": serie.frequencia,
+        "horario": serie.horario.isoformat(),
+        "foi_realizada": False,
+        "foi_paga": False,
+        "valor": float(serie.valor) if serie.valor else None,
+        "observacoes": serie.observacoes,
+        "criado_em": None,
+        "virtual": True,
+    }
+
+
+def ocorrencias_virtuais(series, inicio, fim, materializadas):
+    for serie in series:
+        for data in serie.ocorrencias(inicio, fim):
+            if (serie.id, data) not in materializadas:
+                yield serie, data
+
+
+def ocorrencias_como_linhas(inicio, fim, cliente_id=None, tipo_atendimento=None):
+    """Ocorrências não gravadas entre `inicio` (None = desde o começo) e `fim`, como LinhaSessao.
+
+    Entram na listagem de /sessoes/ junto com as linhas gravadas e são serializadas do mesmo jeito.
+    """
+    inicio = inicio or date.min
+    series = series_ativas(inicio, fim, cliente_id, tipo_atendimento)
+    materializadas = ocorrencias_materializadas(series, inicio, fim)
+    return [
+        LinhaSessao(
+            id=None, cliente_id=serie.cliente_id, repeticao_id=serie.id, data_ocorrencia=data, data=data,
+            tipo_atendimento=serie.tipo_atendimento, frequencia=serie.frequencia, horario=serie.horario,
+            foi_realizada=False, foi_paga=False, valor=serie.valor, observacoes=serie.observacoes, criado_em=None,
+        )
+        for serie, data in ocorrencias_virtuais(series, inicio, fim, materializadas)
+    ]
+
+
+def ocorrencias_pendentes(inicio, fim, materializadas=None):
+    """Ocorrências não gravadas entre `inicio` e `fim`, com nome e telefone do cliente, para o dashboard.
+
+    `materializadas` são os pares (repeticao_id, data_ocorrencia) já gravados, se quem chama já
+    os leu; senão são consultados aqui.
+    """
+    linhas = db.session.query(SerieRepeticao, Cliente.nome, Cliente.telefone).join(
+        Cliente, SerieRepeticao.cliente_id == Cliente.id
+    ).filter(
+        SerieRepeticao.data_inicio <= fim,
+        or_(SerieRepeticao.data_fim.is_(None), SerieRepeticao.data_fim >= inicio)
+    ).all()
+    if not linhas:
+        return []
+
+    contatos = {serie.id: (nome, telefone) for serie, nome, telefone in linhas}
+    series = [serie for serie, _, _ in linhas]
+    if materializadas is None:
+        materializadas = ocorrencias_materializadas(series, inicio, fim)
+    return [
+        Pendente(*contatos[serie.id], data, serie.horario, serie.tipo_atendimento)
+        for serie, data in ocorrencias_virtuais(series, inicio, fim, materializadas)
+    ]
+
+
+def agenda(inicio, fim, cliente_id=None):
+    """Sessões gravadas no intervalo mescladas com as ocorrências calculadas das séries."""
+    query = Sessao.query.filter(Sessao.data >= inicio, Sessao.data <= fim)
+    if cliente_id:
+        query = query.filter(Sessao.cliente_id == cliente_id)
+    itens = [s.to_dict() for s in query.all()]
+
+    series = series_ativas(inicio, fim, cliente_id)
+    materializadas = ocorrencias_materializadas(series, inicio, fim)
+    itens.extend(
+        ocorrencia_para_dict(serie, data)
+        for serie, data in ocorrencias_virtuais(series, inicio, fim, materializadas)
+    )
+
+    itens.sort(key=lambda s: (s["data"], s["horario"], s["id"] or 0))
+    return itens
+
+
+def materializar(serie, data_ocorrencia):
+    """Cria (sem gravar) a linha de `sessoes` de uma ocorrência da série."""
+    return Sessao(
+        cliente_id=serie.cliente_id,
+        repeticao_id=serie.id,
+        data_ocorrencia=data_ocorrencia,
+        data=data_ocorrencia,
+        tipo_atendimento=serie.tipo_atendimento,
+        frequencia=serie.frequencia,
+        horario=serie.horario,
+        foi_realizada=False,
+        foi_paga=False,
+        valor=serie.valor,
+        observacoes=serie.observacoes,
+    )
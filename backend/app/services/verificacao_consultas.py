@@ -0,0 +1,77 @@
+from app import create_app, db
+from app.services import cache_dashboard
+from app.services.benchmark_rotas import CASOS, ContadorConsultas, preparar_contexto, limpar_marcadas
+from app.services.dados_sinteticos import popular
+
+# Máximo de comandos SQL por chamada, qualquer que seja o volume de dados.
+# POST de sessões: série já existente + 2 leituras de conflito (sessões e regras de SerieRepeticao)
+# + um INSERT em massa + 2 do saldo_cliente. PUT em cadeia: a sessão + as mesmas 2 leituras de
+# conflito + UPDATE da sessão e das futuras + 2 do saldo_cliente.
+# Dashboard: sessões gravadas (com as exceções já gravadas) + regras de SerieRepeticao.
+ORCAMENTOS = {
+    "GET /sessoes/": 1,
+    "GET /sessoes/ (janela)": 3,
+    "GET /sessoes/cliente/<id>": 1,
+    "POST /sessoes/ (série)": 6,
+    "PUT /sessoes/<id> (em cadeia)": 7,
+    "GET /clientes/": 1,
+    "GET /clientes/nome/<nome>": 1,
+    "GET /clientes/busca": 3,
+    "GET /dashboard/proximas-sessoes": 2,
+    "GET /dashboard/sessoes-amanha": 2,
+    "GET /dashboard/resumo-financeiro": 1,
+    "GET /dashboard/agenda": 3,
+    "GET /recibos/preview/<id>": 1,
+    "GET /historicos/cliente/<id>": 1,
+    "GET /pagamentos/": 1,
+    "GET /saldos/devedores": 1,
+    "GET /notas/": 1,
+    "flask renovar-sessoes --dry-run": 2,
+}
+
+# Tamanho da série criada no POST em cada volume: o custo também não pode crescer com ela
+TAMANHOS_PADRAO = ((20, 8), (200, 52))
+
+def contar_consultas(clientes, quantidade_serie):
+    """Comandos SQL de cada caso orçado, num SQLite em memória com `clientes` clientes sintéticos."""
+    app = create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://", "SQLALCHEMY_BINDS": {}})
+    with app.app_context():
+        db.create_all()
+        popular(clientes, anos=2, semente=clientes)
+        http = app.test_client()
+        ctx = {**preparar_contexto(http), "quantidade": quantidade_serie}
+
+        contagens = {}
+        try:
+            for caso in CASOS:
+                if caso.nome not in ORCAMENTOS:
+                    continue
+                caso.chamar(http, ctx, 0)  # aquecimento: caches de compilação e de metadados
+                cache_dashboard.limpar()
+                with ContadorConsultas() as contador:
+                    caso.chamar(http, ctx, 1)
+                contagens[caso.nome] = contador.total
+        finally:
+            limpar_marcadas()
+            db.session.remove()
+            db.drop_all()
+    return contagens
+
+def contar_por_tamanho(tamanhos=TAMANHOS_PADRAO):
+    """{clientes: {caso: comandos SQL}} para cada volume de dados."""
+    return {clientes: contar_consultas(clientes, serie) for clientes, serie in tamanhos}
+
+def problema_do_caso(nome, por_tamanho):
+    """(contagens por tamanho, problema ou None) de um caso, frente ao seu orçamento."""
+    orcamento = ORCAMENTOS[nome]
+    contagens = {clientes: contagens[nome] for clientes, contagens in por_tamanho.items()}
+    if max(contagens.values()) > orcamento:
+        return contagens, f"acima do orçamento de {orcamento}"
+    if len(set(contagens.values())) > 1:
+        return contagens, "cresce com o volume de dados (O(n) consultas)"
+    return contagens, None
+
+def verificar_consultas(tamanhos=TAMANHOS_PADRAO):
+    """[(caso, orçamento, contagens por tamanho, problema ou None)] para cada caso orçado."""
+    por_tamanho = contar_por_tamanho(tamanhos)
+    return [(nome, orcamento, *problema_do_caso(nome, por_tamanho)) for nome, orcamento in ORCAMENTOS.items()]
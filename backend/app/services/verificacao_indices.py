@@ -0,0 +1,100 @@
+from app import db
+from app.models.sessao import Sessao
+from app.models.historico import Historico
+from app.models.cliente import Cliente
+from app.models.cliente_token import ClienteToken
+from datetime import date, time, timedelta
+from sqlalchemy import select, text, and_, or_
+
+TABELAS_VERIFICADAS = ("sessoes", "historicos", "clientes", "clientes_tokens")
+
+
+def consultas_das_rotas():
+    """Formato das consultas quentes de cada rota, com valores de exemplo."""
+    hoje = date.today()
+    fim_mes = hoje + timedelta(days=30)
+
+    return [
+        ("GET /sessoes/ (janela da agenda)", select(Sessao.id).where(
+            Sessao.data >= hoje, Sessao.data <= fim_mes
+        ).order_by(Sessao.data, Sessao.horario, Sessao.id)),
+        ("POST/PUT /sessoes/ (conflitos)", select(Sessao.id, Sessao.horario).where(or_(
+            and_(Sessao.data >= hoje, Sessao.data <= fim_mes),
+            and_(Sessao.data_ocorrencia >= hoje, Sessao.data_ocorrencia <= fim_mes)
+        ))),
+        ("PUT /sessoes/<id> (futuras da série)", select(Sessao.id).where(
+            Sessao.repeticao_id == "00000000-0000-0000-0000-000000000000",
+            Sessao.data > hoje
+        ).order_by(Sessao.data)),
+        ("GET /sessoes/cliente/<id>", select(Sessao.id).where(Sessao.cliente_id == 1)),
+        ("GET /recibos/preview/<id>", select(Sessao.id).where(
+            Sessao.cliente_id == 1,
+            Sessao.foi_realizada == True,
+            Sessao.foi_paga == True,
+            Sessao.data >= hoje.replace(day=1),
+            Sessao.data < fim_mes
+        )),
+        ("GET /dashboard/proximas-sessoes", select(Sessao.id).where(
+            Sessao.data >= hoje,
+            Sessao.data <= hoje + timedelta(days=7),
+            Sessao.foi_realizada == False
+        ).order_by(Sessao.data, Sessao.horario)),
+        ("GET /dashboard/sessoes-amanha", select(Sessao.id).where(
+            Sessao.data == hoje + timedelta(days=1),
+            Sessao.foi_realizada == False
+        ).order_by(Sessao.horario)),
+        ("flask renovar-sessoes (sessão existente na série)", select(Sessao.data, Sessao.horario).where(
+            Sessao.repeticao_id == "00000000-0000-0000-0000-000000000000",
+            Sessao.data == hoje,
+            Sessao.horario == time(9)
+        )),
+        ("GET /historicos/cliente/<id>", select(Historico.id).where(
+            Historico.cliente_id == 1,
+            Historico.data >= hoje.replace(day=1)
+        ).order_by(Historico.data.desc(), Historico.id.desc()).limit(21)),
+        ("GET /clientes/busca", select(Cliente.id).where(
+            Cliente.busca.like("%jose%"), Cliente.busca.like("%silva%")
+        ) if db.engine.dialect.name == "postgresql" else select(ClienteToken.cliente_id).where(
+            ClienteToken.token >= "silva", ClienteToken.token < "silva\uffff"
+        ).order_by(ClienteToken.token, ClienteToken.cliente_id).limit(10)),
+    ]
+
+
+def varreduras_sequenciais(conexao, sql):
+    """Retorna as tabelas verificadas que o plano percorre sem índice."""
+    if conexao.dialect.name == "postgresql":
+        # Em tabelas pequenas o planner sempre prefere seq scan; desligá-lo
+        # faz o EXPLAIN mostrar se existe um índice utilizável.
+        conexao.execute(text("SET LOCAL enable_seqscan = off"))
+        plano = conexao.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+        encontradas = []
+        pendentes = [plano[0]["Plan"]]
+        while pendentes:
+            no = pendentes.pop()
+            if no.get("Node Type") == "Seq Scan" and no.get("Relation Name") in TABELAS_VERIFICADAS:
+                encontradas.append(no["Relation Name"])
+            pendentes.extend(no.get("Plans", []))
+        return encontradas
+
+    if conexao.dialect.name == "sqlite":
+        encontradas = []
+        for linha in conexao.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"):
+            detalhe = linha[-1]
+            partes = detalhe.split()
+            if len(partes) >= 2 and partes[0] == "SCAN" and partes[1] in TABELAS_VERIFICADAS \
+                    and "INDEX" not in detalhe:
+                encontradas.append(partes[1])
+        return encontradas
+
+    raise RuntimeError(f"Banco não suportado para verificação: {conexao.dialect.name}")
+
+
+def verificar_indices():
+    """Executa EXPLAIN em cada consulta e retorna [(rota, tabelas_sem_indice)]."""
+    resultados = []
+    with db.engine.connect() as conexao:
+        for nome, consulta in consultas_das_rotas():
+            sql = str(consulta.compile(dialect=conexao.dialect, compile_kwargs={"literal_binds": True}))
+            with conexao.begin():
+                resultados.append((nome, varreduras_sequenciais(conexao, sql)))
+    return resultados
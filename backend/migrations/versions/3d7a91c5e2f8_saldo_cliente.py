@@ -0,0 +1,69 @@
+"""saldo_cliente: resumo financeiro por cliente
+
+Revision ID: 3d7a91c5e2f8
+Revises: 9b3f6e1d4a27
+Create Date: 2026-10-18 16:40:27.108233
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import datetime
+
+
+# revision identifiers, used by Alembic.
+revision = '3d7a91c5e2f8'
+down_revision = '9b3f6e1d4a27'
+branch_labels = None
+depends_on = None
+
+# Mesmo cálculo de app.services.saldos.consulta_saldos nesta revisão, congelado em SQL
+PREENCHER_SALDOS = """
+INSERT INTO saldo_cliente (
+    cliente_id, total_faturado, total_pago, em_aberto,
+    sessoes_em_aberto, ultima_sessao, proxima_sessao, atualizado_em
+)
+SELECT
+    s.cliente_id,
+    COALESCE(SUM(CASE WHEN s.foi_realizada THEN COALESCE(s.valor, 0) ELSE 0 END), 0),
+    COALESCE(SUM(COALESCE(p.pago, 0)), 0),
+    COALESCE(SUM(CASE
+        WHEN s.foi_realizada AND NOT s.foi_paga AND COALESCE(s.valor, 0) > COALESCE(p.pago, 0)
+        THEN COALESCE(s.valor, 0) - COALESCE(p.pago, 0) ELSE 0
+    END), 0),
+    COUNT(CASE WHEN s.foi_realizada AND NOT s.foi_paga THEN 1 END),
+    MAX(CASE WHEN s.foi_realizada THEN s.data END),
+    MIN(CASE WHEN NOT s.foi_realizada THEN s.data END),
+    :agora
+FROM sessoes s
+LEFT JOIN (
+    SELECT sessao_id, SUM(valor_pago) AS pago FROM pagamentos GROUP BY sessao_id
+) p ON p.sessao_id = s.id
+GROUP BY s.cliente_id
+"""
+
+
+def upgrade():
+    op.create_table('saldo_cliente',
+    sa.Column('cliente_id', sa.Integer(), nullable=False),
+    sa.Column('total_faturado', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('total_pago', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('em_aberto', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('sessoes_em_aberto', sa.Integer(), nullable=False),
+    sa.Column('ultima_sessao', sa.Date(), nullable=True),
+    sa.Column('proxima_sessao', sa.Date(), nullable=True),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['cliente_id'], ['clientes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('cliente_id')
+    )
+    with op.batch_alter_table('saldo_cliente', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_saldo_cliente_em_aberto'), ['em_aberto'], unique=False)
+
+    # Preenche a partir das sessões e pagamentos já gravados
+    op.get_bind().execute(sa.text(PREENCHER_SALDOS), {'agora': datetime.utcnow()})
+
+
+def downgrade():
+    with op.batch_alter_table('saldo_cliente', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_saldo_cliente_em_aberto'))
+
+    op.drop_table('saldo_cliente')
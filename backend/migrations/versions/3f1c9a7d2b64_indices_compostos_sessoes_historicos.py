@@ -0,0 +1,36 @@
+"""índices compostos para sessões e históricos
+
+Revision ID: 3f1c9a7d2b64
+Revises: 8aa2b46b437c
+Create Date: 2026-10-18 10:12:41.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7d2b64'
+down_revision = '8aa2b46b437c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_sessoes_data_horario', 'sessoes', ['data', 'horario'], unique=False)
+    op.create_index('ix_sessoes_cliente_id_data', 'sessoes', ['cliente_id', 'data'], unique=False)
+    op.create_index('ix_sessoes_repeticao_id_data', 'sessoes', ['repeticao_id', 'data'], unique=False)
+    op.create_index(
+        'ix_sessoes_nao_realizadas_data_horario', 'sessoes', ['data', 'horario'], unique=False,
+        postgresql_where=sa.text('foi_realizada = false'),
+        sqlite_where=sa.text('foi_realizada = false')
+    )
+    op.create_index('ix_historicos_cliente_id_data', 'historicos', ['cliente_id', 'data'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_historicos_cliente_id_data', table_name='historicos')
+    op.drop_index('ix_sessoes_nao_realizadas_data_horario', table_name='sessoes')
+    op.drop_index('ix_sessoes_repeticao_id_data', table_name='sessoes')
+    op.drop_index('ix_sessoes_cliente_id_data', table_name='sessoes')
+    op.drop_index('ix_sessoes_data_horario', table_name='sessoes')
@@ -0,0 +1,81 @@
+"""busca textual em históricos e notas (tsvector no Postgres, FTS5 no SQLite)
+
+Revision ID: 9b3f6e1d4a27
+Revises: e41d7b2a9c63
+Create Date: 2026-10-18 15:12:09.417552
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9b3f6e1d4a27'
+down_revision = 'e41d7b2a9c63'
+branch_labels = None
+depends_on = None
+
+
+# DDL congelada desta revisão (a de app.services.busca_textual pode mudar depois)
+DDL = {
+    'postgresql': {
+        'historicos': [
+            "ALTER TABLE historicos ADD COLUMN busca tsvector GENERATED ALWAYS AS "
+            "(to_tsvector('portuguese', coalesce(conteudo, ''))) STORED",
+            "CREATE INDEX ix_historicos_busca ON historicos USING gin (busca)",
+        ],
+        'notas': [
+            "ALTER TABLE notas ADD COLUMN busca tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('portuguese', coalesce(titulo, '')), 'A') || "
+            "setweight(to_tsvector('portuguese', coalesce(conteudo, '')), 'B')) STORED",
+            "CREATE INDEX ix_notas_busca ON notas USING gin (busca)",
+        ],
+    },
+    'sqlite': {
+        'historicos': [
+            "CREATE VIRTUAL TABLE historicos_fts USING fts5(conteudo, content='historicos', "
+            "content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+            "CREATE TRIGGER historicos_fts_ai AFTER INSERT ON historicos BEGIN "
+            "INSERT INTO historicos_fts(rowid, conteudo) VALUES (new.id, new.conteudo); END",
+            "CREATE TRIGGER historicos_fts_ad AFTER DELETE ON historicos BEGIN "
+            "INSERT INTO historicos_fts(historicos_fts, rowid, conteudo) VALUES ('delete', old.id, old.conteudo); END",
+            "CREATE TRIGGER historicos_fts_au AFTER UPDATE ON historicos BEGIN "
+            "INSERT INTO historicos_fts(historicos_fts, rowid, conteudo) VALUES ('delete', old.id, old.conteudo); "
+            "INSERT INTO historicos_fts(rowid, conteudo) VALUES (new.id, new.conteudo); END",
+        ],
+        'notas': [
+            "CREATE VIRTUAL TABLE notas_fts USING fts5(titulo, conteudo, content='notas', "
+            "content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+            "CREATE TRIGGER notas_fts_ai AFTER INSERT ON notas BEGIN "
+            "INSERT INTO notas_fts(rowid, titulo, conteudo) VALUES (new.id, new.titulo, new.conteudo); END",
+            "CREATE TRIGGER notas_fts_ad AFTER DELETE ON notas BEGIN "
+            "INSERT INTO notas_fts(notas_fts, rowid, titulo, conteudo) "
+            "VALUES ('delete', old.id, old.titulo, old.conteudo); END",
+            "CREATE TRIGGER notas_fts_au AFTER UPDATE ON notas BEGIN "
+            "INSERT INTO notas_fts(notas_fts, rowid, titulo, conteudo) "
+            "VALUES ('delete', old.id, old.titulo, old.conteudo); "
+            "INSERT INTO notas_fts(rowid, titulo, conteudo) VALUES (new.id, new.titulo, new.conteudo); END",
+        ],
+    },
+}
+
+
+def upgrade():
+    dialeto = op.get_bind().dialect.name
+    for tabela in ('historicos', 'notas'):
+        for comando in DDL.get(dialeto, {}).get(tabela, []):
+            op.execute(comando)
+        if dialeto == 'sqlite':
+            # Indexa o que já estava gravado
+            op.execute(f"INSERT INTO {tabela}_fts({tabela}_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialeto = op.get_bind().dialect.name
+    for tabela in ('historicos', 'notas'):
+        if dialeto == 'postgresql':
+            op.execute(f'DROP INDEX IF EXISTS ix_{tabela}_busca')
+            op.execute(f'ALTER TABLE {tabela} DROP COLUMN busca')
+        elif dialeto == 'sqlite':
+            for sufixo in ('ai', 'ad', 'au'):
+                op.execute(f'DROP TRIGGER IF EXISTS {tabela}_fts_{sufixo}')
+            op.execute(f'DROP TABLE IF EXISTS {tabela}_fts')
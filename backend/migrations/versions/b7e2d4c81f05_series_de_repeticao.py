@@ -0,0 +1,44 @@
+"""séries de repetição calculadas sob demanda
+
+Revision ID: b7e2d4c81f05
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-18 11:02:17.530214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2d4c81f05'
+down_revision = '3f1c9a7d2b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('series_repeticao',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('cliente_id', sa.Integer(), nullable=False),
+    sa.Column('tipo_atendimento', sa.String(length=30), nullable=False),
+    sa.Column('frequencia', sa.String(length=20), nullable=False),
+    sa.Column('horario', sa.Time(), nullable=False),
+    sa.Column('valor', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('observacoes', sa.Text(), nullable=True),
+    sa.Column('data_inicio', sa.Date(), nullable=False),
+    sa.Column('data_fim', sa.Date(), nullable=True),
+    sa.Column('criado_em', sa.DateTime(), nullable=True),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['cliente_id'], ['clientes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_series_repeticao_cliente_id', 'series_repeticao', ['cliente_id'], unique=False)
+    op.add_column('sessoes', sa.Column('data_ocorrencia', sa.Date(), nullable=True))
+    op.create_index('ix_sessoes_data_ocorrencia', 'sessoes', ['data_ocorrencia'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_sessoes_data_ocorrencia', table_name='sessoes')
+    op.drop_column('sessoes', 'data_ocorrencia')
+    op.drop_index('ix_series_repeticao_cliente_id', table_name='series_repeticao')
+    op.drop_table('series_repeticao')
@@ -0,0 +1,91 @@
+"""busca de clientes sem acento: coluna normalizada, trigramas e tokens
+
+Revision ID: e41d7b2a9c63
+Revises: b7e2d4c81f05
+Create Date: 2026-10-18 14:05:41.902318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import re
+import unicodedata
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41d7b2a9c63'
+down_revision = 'b7e2d4c81f05'
+branch_labels = None
+depends_on = None
+
+
+# Cópia congelada de app.services.busca_clientes.tokens_do_cliente (como estava nesta revisão):
+# a migração precisa gerar sempre os mesmos tokens, mesmo que o código da aplicação mude.
+def _normalizar(texto):
+    texto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+
+
+def _palavras(texto):
+    return re.findall(r'[a-z0-9]+', _normalizar(texto))
+
+
+def _digitos(texto):
+    return re.sub(r'\D', '', texto or '')
+
+
+def _tokens_do_cliente(nome, cpf_cnpj, telefone, email, telefone_emergencia=None):
+    tokens = set(_palavras(nome)) | set(_palavras(email)) | set(_palavras(cpf_cnpj))
+    if _digitos(cpf_cnpj):
+        tokens.add(_digitos(cpf_cnpj))
+    for fone in (telefone, telefone_emergencia):
+        numero = _digitos(fone)
+        if numero:
+            tokens |= set(_palavras(fone))
+            tokens.add(numero)
+            if len(numero) >= 10:
+                tokens.add(numero[2:])
+    return sorted(t[:100] for t in tokens)
+
+
+def upgrade():
+    op.add_column('clientes', sa.Column('busca', sa.Text(), nullable=True))
+    op.create_table('clientes_tokens',
+    sa.Column('token', sa.String(length=100), nullable=False),
+    sa.Column('cliente_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['cliente_id'], ['clientes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('token', 'cliente_id')
+    )
+    op.create_index('ix_clientes_tokens_cliente_id', 'clientes_tokens', ['cliente_id'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute('CREATE INDEX ix_clientes_busca_trgm ON clientes USING gin (busca gin_trgm_ops)')
+
+    # Preenche a busca dos clientes já cadastrados
+    conexao = op.get_bind()
+    clientes = sa.table('clientes',
+        sa.column('id', sa.Integer), sa.column('nome', sa.String), sa.column('cpf_cnpj', sa.String),
+        sa.column('telefone', sa.String), sa.column('telefone_emergencia', sa.String),
+        sa.column('email', sa.String), sa.column('busca', sa.Text)
+    )
+    tokens = sa.table('clientes_tokens', sa.column('token', sa.String), sa.column('cliente_id', sa.Integer))
+    atualizacoes, linhas = [], []
+    for c in conexao.execute(sa.select(clientes)).all():
+        termos = _tokens_do_cliente(c.nome, c.cpf_cnpj, c.telefone, c.email, c.telefone_emergencia)
+        atualizacoes.append({'cliente': c.id, 'busca': ' '.join(termos)})
+        linhas.extend({'cliente_id': c.id, 'token': t} for t in termos)
+    if atualizacoes:
+        conexao.execute(
+            clientes.update().where(clientes.c.id == sa.bindparam('cliente')).values(busca=sa.bindparam('busca')),
+            atualizacoes
+        )
+    if linhas:
+        conexao.execute(tokens.insert(), linhas)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_clientes_busca_trgm')
+    op.drop_index('ix_clientes_tokens_cliente_id', table_name='clientes_tokens')
+    op.drop_table('clientes_tokens')
+    op.drop_column('clientes', 'busca')
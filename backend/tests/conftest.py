@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+# create_app lê o ambiente; os testes usam sempre SQLite em memória e cache local
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.pop("DATABASE_READ_URL", None)
+os.environ.pop("CACHE_REDIS_URL", None)
+os.environ.pop("WEB_CONCURRENCY", None)
+
+# Marca orcamento(n) e as fixtures volume, base_sintetica e consultas
+pytest_plugins = ["orcamento_consultas"]
+
+
+@pytest.fixture
+def app():
+    from app import create_app, db
+
+    app = create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://", "SQLALCHEMY_BINDS": {}, "TESTING": True})
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def http(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def cabecalhos(app):
+    from flask_jwt_extended import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token(identity=os.getenv('APP_USERNAME', 'admin'))}"}
@@ -0,0 +1,92 @@
+"""Plugin do pytest: orçamento de comandos SQL, conferido em dois volumes de dados.
+
+    @pytest.mark.orcamento(2)
+    def test_rota(base_sintetica, consultas):
+        with consultas:
+            base_sintetica.http.get("/rota", headers=base_sintetica.ctx["headers"])
+
+O teste roda uma vez em cada volume de TAMANHOS_PADRAO (o mesmo da CLI `flask verificar-consultas`)
+e falha se o bloco `with consultas` executar mais comandos SQL que o orçamento da marca, ou se a
+contagem mudar de um volume para o outro (O(n) consultas).
+"""
+from types import SimpleNamespace
+
+import pytest
+
+CHAVE_CONTAGENS = pytest.StashKey()
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "orcamento(n): máximo de comandos SQL do bloco `with consultas`")
+    config.stash[CHAVE_CONTAGENS] = {}
+
+
+def pytest_generate_tests(metafunc):
+    if "volume" in metafunc.fixturenames:
+        from app.services.verificacao_consultas import TAMANHOS_PADRAO
+
+        metafunc.parametrize("volume", TAMANHOS_PADRAO, indirect=True, scope="session",
+                             ids=[f"{clientes}-clientes" for clientes, _ in TAMANHOS_PADRAO])
+
+
+@pytest.fixture(scope="session")
+def volume(request):
+    """(clientes, tamanho da série criada no POST)."""
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def base_sintetica(volume):
+    """SQLite em memória com dados sintéticos do volume; `http` e `ctx` dos casos de benchmark_rotas."""
+    from app import create_app, db
+    from app.services.benchmark_rotas import preparar_contexto, limpar_marcadas
+    from app.services.dados_sinteticos import popular
+
+    clientes, quantidade_serie = volume
+    app = create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://", "SQLALCHEMY_BINDS": {}, "TESTING": True})
+    with app.app_context():
+        db.create_all()
+        popular(clientes, anos=2, semente=clientes)
+        http = app.test_client()
+        yield SimpleNamespace(app=app, http=http, ctx={**preparar_contexto(http), "quantidade": quantidade_serie})
+        limpar_marcadas()
+        db.session.remove()
+        db.drop_all()
+
+
+class Consultas:
+    """Conta os comandos SQL de cada bloco `with` e falha acima do orçamento."""
+
+    def __init__(self, orcamento, contagens, volume):
+        self.orcamento = orcamento
+        self.contagens = contagens  # {volume: comandos} do mesmo teste nos outros volumes
+        self.volume = volume
+        self.total = 0
+
+    def __enter__(self):
+        from app.services.benchmark_rotas import ContadorConsultas
+
+        self.contador = ContadorConsultas().__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self.contador.__exit__(*exc)
+        if exc[0] is not None:
+            return False
+        self.total = self.contador.total
+        if self.orcamento is not None and self.total > self.orcamento:
+            pytest.fail(f"{self.total} comandos SQL, acima do orçamento de {self.orcamento}", pytrace=False)
+        self.contagens[self.volume] = self.total
+        if len(set(self.contagens.values())) > 1:
+            pytest.fail(f"{self.contagens} comandos SQL por volume de clientes: cresce com o volume de dados "
+                        f"(O(n) consultas)", pytrace=False)
+        return False
+
+
+@pytest.fixture
+def consultas(request, volume):
+    marca = request.node.get_closest_marker("orcamento")
+    # Mesmo teste nos outros volumes: o nome sem o parâmetro do volume
+    teste = request.node.nodeid.replace(f"{volume[0]}-clientes", "")
+    contagens = request.config.stash[CHAVE_CONTAGENS].setdefault(teste, {})
+    return Consultas(marca.args[0] if marca else None, contagens, volume[0])
@@ -0,0 +1,71 @@
+from flask import Flask, jsonify
+from flask_sqlalchemy import SQLAlchemy
+
+from app.services.banco import SessaoRoteada, configurar_banco, init_leitura
+
+
+def app_com(config):
+    # Flask puro: um create_app com réplica registraria o bind 'leitura' no `db` global
+    app = Flask(__name__)
+    app.config.update(config)
+    configurar_banco(app)
+    return app
+
+
+def test_config_explicita_prevalece_sobre_o_ambiente(monkeypatch):
+    monkeypatch.setenv("DATABASE_READ_URL", "sqlite:////tmp/replica.db")
+    opcoes = {"pool_pre_ping": False}
+
+    app = app_com({"SQLALCHEMY_DATABASE_URI": "sqlite://", "SQLALCHEMY_BINDS": {},
+                   "SQLALCHEMY_ENGINE_OPTIONS": opcoes})
+
+    assert app.config["SQLALCHEMY_BINDS"] == {}
+    assert app.config["SQLALCHEMY_ENGINE_OPTIONS"] == opcoes
+
+
+def test_ambiente_preenche_o_que_falta(monkeypatch):
+    monkeypatch.setenv("DATABASE_READ_URL", "sqlite:////tmp/replica.db")
+
+    app = app_com({"SQLALCHEMY_DATABASE_URI": "sqlite://"})
+
+    assert app.config["SQLALCHEMY_BINDS"]["leitura"]["url"] == "sqlite:////tmp/replica.db"
+    assert app.config["SQLALCHEMY_ENGINE_OPTIONS"]["pool_pre_ping"] is True
+
+
+def test_get_le_da_replica_e_escritas_vao_ao_principal(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATABASE_READ_URL", f"sqlite:///{tmp_path / 'replica.db'}")
+    # Instância própria do SQLAlchemy para não registrar o bind no `db` da aplicação
+    banco = SQLAlchemy(session_options={"class_": SessaoRoteada})
+
+    class Registro(banco.Model):
+        id = banco.Column(banco.Integer, primary_key=True)
+        origem = banco.Column(banco.String(20))
+
+    app = app_com({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'principal.db'}"})
+    banco.init_app(app)
+    init_leitura(app, banco)
+
+    with app.app_context():
+        for engine, origem in ((banco.engine, "principal"), (banco.engines["leitura"], "replica")):
+            Registro.metadata.create_all(engine)
+            with engine.begin() as conexao:
+                conexao.execute(Registro.__table__.insert(), {"origem": origem})
+
+    def origens():
+        return sorted(r.origem for r in banco.session.execute(banco.select(Registro)).scalars())
+
+    @app.route("/leitura", methods=["GET", "POST"])
+    def leitura():
+        return jsonify(origens())
+
+    @app.route("/escrita", methods=["GET"])
+    def escrita():
+        banco.session.add(Registro(origem="nova"))
+        banco.session.commit()  # flush vai ao principal mesmo numa requisição GET
+        bloqueadas = banco.session.execute(banco.select(Registro).with_for_update()).scalars()
+        return jsonify({"lidas": origens(), "bloqueadas": sorted(r.origem for r in bloqueadas)})
+
+    http = app.test_client()
+    assert http.get("/leitura").get_json() == ["replica"]
+    assert http.post("/leitura").get_json() == ["principal"]
+    assert http.get("/escrita").get_json() == {"lidas": ["replica"], "bloqueadas": ["nova", "principal"]}
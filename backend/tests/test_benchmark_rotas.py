@@ -0,0 +1,46 @@
+import pytest
+
+from app.models.sessao import Sessao
+from app.services import benchmark_rotas
+from app.services.benchmark_rotas import MARCADOR, executar, preparar_contexto
+from app.services.dados_sinteticos import popular
+
+
+@pytest.fixture
+def populado(app):
+    popular(5, anos=1, semente=5)
+
+
+def marcadas():
+    return Sessao.query.filter_by(observacoes=MARCADOR).count()
+
+
+def test_sobras_de_execucao_interrompida_sao_limpas_antes(app, populado):
+    preparar_contexto(app.test_client())  # sem limpar no fim, como um Ctrl+C
+    assert marcadas() > 0
+
+    resultado = executar(repeticoes=1, filtro="GET /notas/")
+
+    assert resultado["rotas"]["GET /notas/"]["status"] == [200]
+    assert marcadas() == 0
+
+
+def test_falha_na_preparacao_nao_deixa_sessoes_marcadas(populado, monkeypatch):
+    def falhar(**kwargs):
+        raise RuntimeError("falhou depois do POST da série")
+
+    monkeypatch.setattr(benchmark_rotas, "SerieRepeticao", falhar)
+    with pytest.raises(RuntimeError):
+        executar(repeticoes=1)
+    monkeypatch.undo()
+
+    assert marcadas() == 0
+
+
+def test_rodadas_sem_cache_nao_apagam_o_resto_do_cache(populado):
+    from app import cache
+
+    cache.set("outra:chave", "valor")
+    executar(repeticoes=1, filtro="GET /dashboard/resumo-financeiro")
+
+    assert cache.get("outra:chave") == "valor"
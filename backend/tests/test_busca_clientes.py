@@ -0,0 +1,62 @@
+from app import db
+from app.models.cliente import Cliente
+from app.services.busca_clientes import LIMITE_MAXIMO
+
+
+def test_busca_por_nome_casa_trecho_sem_acento_e_sem_limite(http, cabecalhos):
+    db.session.add_all([
+        Cliente(nome=f"Maria Silva {i}", cpf_cnpj=f"{i:011d}") for i in range(1, LIMITE_MAXIMO + 6)
+    ])
+    db.session.add_all([
+        Cliente(nome="João Conceição", cpf_cnpj="98765432100"),
+        Cliente(nome="Pedro Souza", cpf_cnpj="11122233344", email="silva@exemplo.com"),
+    ])
+    db.session.commit()
+
+    def nomes(trecho):
+        resposta = http.get(f"/clientes/nome/{trecho}", headers=cabecalhos)
+        assert resposta.status_code == 200
+        return [c["nome"] for c in resposta.get_json()]
+
+    assert len(nomes("ilva")) == LIMITE_MAXIMO + 5  # trecho no meio da palavra, sem o teto da busca
+    assert nomes("conceicao") == ["João Conceição"]
+    assert nomes("ÃO CON") == ["João Conceição"]
+    assert "Pedro Souza" not in nomes("silva")  # só o nome conta, como antes
+
+
+def buscar(http, cabecalhos, q, **parametros):
+    resposta = http.get("/clientes/busca", headers=cabecalhos, query_string={"q": q, **parametros})
+    assert resposta.status_code == 200
+    return resposta.get_json()
+
+
+def test_busca_por_prefixo_com_palavras_inteiras_primeiro(http, cabecalhos):
+    db.session.add_all([
+        Cliente(nome="Anabela Costa", cpf_cnpj="11111111111"),
+        Cliente(nome="Ana Costa", cpf_cnpj="22222222222", telefone="(81) 99999-0000"),
+        Cliente(nome="Bruno Anacleto", cpf_cnpj="33333333333", ativo=False),
+        Cliente(nome="Carla Dias", cpf_cnpj="44444444444"),
+    ])
+    db.session.commit()
+
+    resultados = buscar(http, cabecalhos, "ana")
+    # "Ana" casa a palavra inteira e vem antes dos que só casam o prefixo
+    assert [c["nome"] for c in resultados][0] == "Ana Costa"
+    assert {c["nome"] for c in resultados} == {"Ana Costa", "Anabela Costa", "Bruno Anacleto"}
+    assert resultados[0]["relevancia"] == 1.0 > resultados[1]["relevancia"]
+
+    assert [c["nome"] for c in buscar(http, cabecalhos, "ÂNA cos")] == ["Ana Costa", "Anabela Costa"]
+    assert [c["nome"] for c in buscar(http, cabecalhos, "99999-0000")] == ["Ana Costa"]  # telefone sem DDD
+    assert "Bruno Anacleto" not in [c["nome"] for c in buscar(http, cabecalhos, "ana", ativos="true")]
+    assert len(buscar(http, cabecalhos, "ana", limite=1)) == 1
+
+
+def test_update_em_massa_atualiza_os_tokens(http, cabecalhos):
+    db.session.add(Cliente(nome="Ana Costa", cpf_cnpj="11111111111"))
+    db.session.commit()
+
+    db.session.execute(db.update(Cliente).where(Cliente.nome == "Ana Costa").values(nome="Beatriz Lopes"))
+    db.session.commit()
+
+    assert buscar(http, cabecalhos, "ana") == []
+    assert [c["nome"] for c in buscar(http, cabecalhos, "beatriz")] == ["Beatriz Lopes"]
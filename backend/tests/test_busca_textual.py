@@ -0,0 +1,68 @@
+from sqlalchemy import inspect
+
+from app import create_app, db
+
+
+def test_drop_all_remove_as_tabelas_fts(tmp_path):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'banco.db'}", "SQLALCHEMY_BINDS": {}})
+    with app.app_context():
+        db.create_all()
+        assert {"historicos_fts", "notas_fts"} <= set(inspect(db.engine).get_table_names())
+
+        db.drop_all()
+        assert inspect(db.engine).get_table_names() == []
+
+        db.create_all()  # sem "table historicos_fts already exists"
+        db.drop_all()
+
+
+def criar_textos():
+    from datetime import date
+
+    from app.models.cliente import Cliente
+    from app.models.historico import Historico
+    from app.models.nota import Nota
+
+    ana, bruno = Cliente(nome="Ana Souza", cpf_cnpj="1"), Cliente(nome="Bruno Lima", cpf_cnpj="2")
+    db.session.add_all([ana, bruno])
+    db.session.flush()
+    db.session.add_all([
+        Historico(cliente_id=ana.id, data=date(2030, 1, 7), tipo="sessao",
+                  conteudo="Relatou ansiedade no trabalho. Ansiedade piora à noite; ansiedade constante."),
+        Historico(cliente_id=bruno.id, data=date(2030, 1, 8), tipo="sessao",
+                  conteudo="Sessão tranquila, pouca ansiedade e muitas conquistas no mês, com metas novas."),
+        Historico(cliente_id=ana.id, data=date(2030, 1, 9), tipo="sessao", conteudo="Falou sobre a família."),
+        Nota(titulo="Leituras sobre ansiedade", conteudo="Lista de livros"),
+    ])
+    db.session.commit()
+    return ana, bruno
+
+
+def test_busca_ignora_acentos_e_ordena_pela_relevancia(http, cabecalhos):
+    ana, _ = criar_textos()
+
+    resultados = http.get("/busca/?q=ANSIEDADE&em=historicos", headers=cabecalhos).get_json()["resultados"]
+
+    # Três ocorrências no texto curto da Ana pesam mais que uma no do Bruno; "família" fica de fora
+    assert [r["cliente_id"] for r in resultados] == [ana.id, ana.id + 1]
+    assert resultados[0]["relevancia"] > resultados[1]["relevancia"]
+    assert "<mark>ansiedade</mark>" in resultados[0]["trecho"].lower()
+
+    # Prefixo e palavra sem acento acham "família"; filtro por cliente
+    resultados = http.get(f"/busca/?q=famil&cliente_id={ana.id}", headers=cabecalhos).get_json()["resultados"]
+    assert [r["origem"] for r in resultados] == ["historico"]
+    assert "<mark>família</mark>" in resultados[0]["trecho"]
+
+
+def test_nota_com_titulo_no_trecho_e_html_escapado(http, cabecalhos):
+    from app.models.nota import Nota
+
+    db.session.add(Nota(titulo="Supervisão", conteudo="<b>ideia</b> de supervisão em grupo"))
+    db.session.commit()
+
+    resultado, = http.get("/busca/?q=supervisao&em=notas", headers=cabecalhos).get_json()["resultados"]
+    assert resultado["titulo"] == "Supervisão"
+    assert resultado["trecho"] == "<mark>Supervisão</mark>"  # o FTS5 recorta a coluna que melhor casa
+
+    resultado, = http.get("/busca/?q=ideia&em=notas", headers=cabecalhos).get_json()["resultados"]
+    assert resultado["trecho"] == "&lt;b&gt;<mark>ideia</mark>&lt;/b&gt; de supervisão em grupo"
@@ -0,0 +1,103 @@
+from collections import namedtuple
+from datetime import date, time, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models.cliente import Cliente
+from app.models.serie_repeticao import SerieRepeticao
+from app.models.sessao import Sessao
+from app.services.conflitos_sessoes import IndiceSessoes, encontrar_conflitos
+
+Linha = namedtuple("Linha", "id data horario repeticao_id")
+
+DIA = date(2030, 1, 7)
+
+
+@pytest.mark.parametrize("horario, conflita", [
+    (time(10, 0), True),
+    (time(9, 0), True),    # exatamente 60 minutos antes: conflita, como a checagem original (<=)
+    (time(11, 0), True),   # exatamente 60 minutos depois
+    (time(8, 59), False),
+    (time(11, 1), False),
+])
+def test_janela_de_60_minutos_inclui_os_limites(horario, conflita):
+    indice = IndiceSessoes([Linha(1, DIA, time(10, 0), None)])
+
+    assert bool(indice.sobrepostas(DIA, horario)) is conflita
+
+
+def test_perto_da_meia_noite_so_o_mesmo_dia_conta():
+    indice = IndiceSessoes([Linha(1, DIA, time(23, 30), None), Linha(2, DIA + timedelta(days=1), time(0, 15), None)])
+
+    assert [e[1] for e in indice.sobrepostas(DIA, time(22, 45))] == [1]
+    # 23:50 e 00:15 do dia seguinte ficam a 25 minutos, mas em dias diferentes
+    assert [e[1] for e in indice.sobrepostas(DIA, time(23, 50))] == [1]
+    assert [e[1] for e in indice.sobrepostas(DIA + timedelta(days=1), time(0, 0))] == [2]
+    assert indice.sobrepostas(DIA + timedelta(days=1), time(23, 50)) == []
+
+
+@pytest.fixture
+def agenda(app):
+    cliente = Cliente(nome="Ana Souza", cpf_cnpj="12345678901")
+    db.session.add(cliente)
+    db.session.flush()
+    db.session.add(Sessao(cliente_id=cliente.id, data=DIA, horario=time(14, 0), tipo_atendimento="psicologia",
+                          frequencia="avulsa", foi_realizada=False, foi_paga=False))
+    serie = SerieRepeticao(cliente_id=cliente.id, tipo_atendimento="rolfing", frequencia="semanal",
+                           horario=time(9, 0), data_inicio=DIA)
+    db.session.add(serie)
+    db.session.commit()
+    return serie
+
+
+def contar_consultas():
+    comandos = []
+    event.listen(db.engine, "before_cursor_execute", lambda *args: comandos.append(args[2]))
+    return comandos
+
+
+def test_ocorrencias_da_serie_no_mesmo_dia_conflitam(agenda):
+    proxima = DIA + timedelta(days=7)
+    slots = [(DIA, time(9, 30)), (proxima, time(8, 0)), (proxima, time(10, 1)), (DIA, time(15, 0))]
+
+    assert encontrar_conflitos(slots) == [(DIA, time(9, 30)), (proxima, time(8, 0)), (DIA, time(15, 0))]
+    # A própria série não conflita com ela mesma (PUT /series/<id>)
+    assert encontrar_conflitos(slots, ignorar_repeticao_id=agenda.id) == [(DIA, time(15, 0))]
+
+
+def test_ocorrencia_gravada_substitui_a_calculada(agenda):
+    # A ocorrência do dia foi remarcada para as 18h: as 9h ficam livres
+    db.session.add(Sessao(cliente_id=agenda.cliente_id, repeticao_id=agenda.id, data_ocorrencia=DIA, data=DIA,
+                          horario=time(18, 0), tipo_atendimento="rolfing", frequencia="semanal",
+                          foi_realizada=False, foi_paga=False))
+    db.session.commit()
+
+    assert encontrar_conflitos([(DIA, time(9, 0)), (DIA, time(17, 30))]) == [(DIA, time(17, 30))]
+
+
+def test_uma_consulta_de_sessoes_e_uma_de_series_para_qualquer_quantidade_de_slots(agenda):
+    slots = [(DIA + timedelta(days=7 * i), time(16, 0)) for i in range(52)]
+
+    comandos = contar_consultas()
+    assert encontrar_conflitos(slots) == []
+    assert len(comandos) == 2
+
+
+def test_post_grava_a_serie_num_insert_e_devolve_a_principal(http, cabecalhos, agenda):
+    inicio = DIA + timedelta(days=2)
+    corpo = {"cliente_id": agenda.cliente_id, "data": inicio.isoformat(), "horario": "16:00",
+             "tipo_atendimento": "massagem", "frequencia": "semanal", "valor": 120}
+
+    resposta = http.post("/sessoes/?quantidade=5", headers=cabecalhos, json=corpo)
+
+    assert resposta.status_code == 201
+    principal = db.session.get(Sessao, resposta.get_json()["id"])
+    assert resposta.get_json()["data"] == principal.data.isoformat() == inicio.isoformat()
+    serie = Sessao.query.filter_by(repeticao_id=principal.repeticao_id).order_by(Sessao.data).all()
+    assert [s.data for s in serie] == [inicio + timedelta(days=7 * i) for i in range(5)]
+
+    # A mesma série de novo: a principal conflita com ela mesma
+    corpo["tipo_atendimento"] = "acupuntura"
+    assert http.post("/sessoes/?quantidade=5", headers=cabecalhos, json=corpo).status_code == 400
@@ -0,0 +1,39 @@
+import pytest
+
+
+@pytest.mark.parametrize("parametros", ["mes=0", "mes=13", "ano=0", "ano=-5", "ano=10000", "mes=12&ano=9999"])
+def test_resumo_financeiro_rejeita_mes_ou_ano_fora_do_intervalo(http, cabecalhos, parametros):
+    resposta = http.get(f"/dashboard/resumo-financeiro?{parametros}", headers=cabecalhos)
+
+    assert resposta.status_code == 400
+    assert "erro" in resposta.get_json()
+
+
+def test_resumo_financeiro_aceita_limites(http, cabecalhos):
+    for parametros in ("mes=1&ano=1", "mes=12&ano=9998"):
+        assert http.get(f"/dashboard/resumo-financeiro?{parametros}", headers=cabecalhos).status_code == 200
+
+
+def test_versao_descartada_do_cache_nao_volta_a_respostas_antigas(http, cabecalhos):
+    from app import cache
+    from app.services.cache_dashboard import chave_versao
+
+    assert http.get("/dashboard/resumo-financeiro", headers=cabecalhos).headers["X-Cache"] == "MISS"
+    assert http.get("/dashboard/resumo-financeiro", headers=cabecalhos).headers["X-Cache"] == "HIT"
+
+    # Como o SimpleCache faz ao passar de CACHE_THRESHOLD
+    cache.delete(chave_versao("resumo_financeiro"))
+    assert http.get("/dashboard/resumo-financeiro", headers=cabecalhos).headers["X-Cache"] == "MISS"
+
+
+@pytest.mark.parametrize("dias", [-1, 367, 10**9])
+def test_agenda_rejeita_dias_fora_do_intervalo(http, cabecalhos, dias):
+    resposta = http.get(f"/dashboard/agenda?dias={dias}", headers=cabecalhos)
+
+    assert resposta.status_code == 400
+    assert "erro" in resposta.get_json()
+
+
+def test_agenda_aceita_limites(http, cabecalhos):
+    for dias in (0, 366):
+        assert http.get(f"/dashboard/agenda?dias={dias}", headers=cabecalhos).status_code == 200
@@ -0,0 +1,37 @@
+from datetime import date
+
+from app import db
+from app.models.cliente import Cliente
+from app.models.historico import Historico
+
+
+def test_paginacao_inclui_historicos_sem_data(http, cabecalhos):
+    cliente = Cliente(nome="Ana Souza", cpf_cnpj="12345678901")
+    db.session.add(cliente)
+    db.session.flush()
+    datas = [date(2024, 1, 1), None, date(2024, 3, 1), None, date(2024, 3, 1), date(2024, 2, 1), None]
+    historicos = [Historico(cliente_id=cliente.id, data=data, tipo="sessao", conteudo="texto") for data in datas]
+    db.session.add_all(historicos)
+    db.session.commit()
+    # O default do modelo preenche a data omitida; aqui ela precisa ficar NULL
+    ids_sem_data = [h.id for h, data in zip(historicos, datas) if data is None]
+    db.session.execute(db.update(Historico).where(Historico.id.in_(ids_sem_data)).values(data=None))
+    db.session.commit()
+
+    vistos, cursor = [], None
+    while True:
+        url = f"/historicos/cliente/{cliente.id}?limite=2" + (f"&cursor={cursor}" if cursor else "")
+        resposta = http.get(url, headers=cabecalhos)
+        assert resposta.status_code == 200
+        pagina = resposta.get_json()
+        vistos += pagina["historicos"]
+        cursor = pagina["proximo_cursor"]
+        if not cursor:
+            break
+
+    assert len(vistos) == len(datas)
+    assert len({h["id"] for h in vistos}) == len(datas)
+    # Mais recentes primeiro; os sem data no fim
+    assert [h["data"] for h in vistos] == [
+        "2024-03-01", "2024-03-01", "2024-02-01", "2024-01-01", None, None, None
+    ]
@@ -0,0 +1,40 @@
+import io
+import zipfile
+
+from openpyxl import Workbook
+
+from app.models.cliente import Cliente
+
+
+def enviar(http, cabecalhos, nome, conteudo):
+    return http.post("/clientes/importar", headers=cabecalhos, content_type="multipart/form-data",
+                     data={"arquivo": (io.BytesIO(conteudo), nome)})
+
+
+def test_csv_em_cp1252(http, cabecalhos):
+    conteudo = "nome;cpf\nJoão Conceição;123.456.789-01\n".encode("cp1252")
+
+    resposta = enviar(http, cabecalhos, "clientes.csv", conteudo)
+
+    assert resposta.status_code == 200
+    assert resposta.get_json()["importados"] == 1
+    assert Cliente.query.one().nome == "João Conceição"
+
+
+def test_planilha_corrompida_responde_400(http, cabecalhos):
+    planilha = io.BytesIO()
+    livro = Workbook()
+    livro.active.append(["nome"])
+    livro.save(planilha)
+
+    # XML da aba truncado dentro de um .xlsx que abre normalmente
+    corrompida = io.BytesIO()
+    with zipfile.ZipFile(planilha) as origem, zipfile.ZipFile(corrompida, "w") as destino:
+        for item in origem.infolist():
+            dados = origem.read(item)
+            destino.writestr(item, dados[: len(dados) // 2] if item.filename.endswith("sheet1.xml") else dados)
+
+    for conteudo in (b"isto nao e um xlsx", corrompida.getvalue()):
+        resposta = enviar(http, cabecalhos, "clientes.xlsx", conteudo)
+        assert resposta.status_code == 400
+        assert "corrompida" in resposta.get_json()["erro"]
@@ -0,0 +1,42 @@
+import pytest
+
+from app.services import cache_dashboard
+from app.services.benchmark_rotas import CASOS
+from app.services.verificacao_consultas import ORCAMENTOS
+
+CASOS_ORCADOS = [
+    pytest.param(caso, marks=pytest.mark.orcamento(ORCAMENTOS[caso.nome]), id=caso.nome)
+    for caso in CASOS if caso.nome in ORCAMENTOS
+]
+
+
+@pytest.mark.parametrize("caso", CASOS_ORCADOS)
+def test_consultas_dentro_do_orcamento(caso, base_sintetica, consultas):
+    http, ctx = base_sintetica.http, base_sintetica.ctx
+    caso.chamar(http, ctx, 0)  # aquecimento: caches de compilação e de metadados
+    cache_dashboard.limpar()
+
+    with consultas:
+        caso.chamar(http, ctx, 1)
+
+
+@pytest.mark.orcamento(1)
+def test_orcamento_estourado_falha(base_sintetica, consultas):
+    http, ctx = base_sintetica.http, base_sintetica.ctx
+    cache_dashboard.limpar()
+
+    with pytest.raises(pytest.fail.Exception, match="acima do orçamento de 1"):
+        with consultas:
+            http.get("/dashboard/agenda", headers=ctx["headers"])
+
+
+def test_contagem_que_cresce_com_o_volume_falha(app):
+    from app import db
+    from sqlalchemy import text
+    from orcamento_consultas import Consultas
+
+    # O mesmo teste fez 1 comando no volume menor
+    with pytest.raises(pytest.fail.Exception, match="cresce com o volume"):
+        with Consultas(None, {20: 1}, 200):
+            db.session.execute(text("SELECT 1"))
+            db.session.execute(text("SELECT 2"))
@@ -0,0 +1,53 @@
+from datetime import date, time
+
+import pytest
+
+from app import db
+from app.models.cliente import Cliente
+from app.models.pagamento import Pagamento
+from app.models.sessao import Sessao
+
+
+@pytest.fixture
+def sessoes(app):
+    cliente = Cliente(nome="Ana Souza", cpf_cnpj="12345678901")
+    db.session.add(cliente)
+    db.session.flush()
+    criadas = [
+        Sessao(cliente_id=cliente.id, data=date(2026, 3, dia), horario=time(9, 0), tipo_atendimento="psicologia",
+               frequencia="avulsa", foi_realizada=True, foi_paga=False, valor=valor)
+        for dia, valor in ((2, 150), (9, None))
+    ]
+    db.session.add_all(criadas)
+    db.session.commit()
+    return [s.id for s in criadas]
+
+
+def test_sessao_sem_valor_nao_e_quitada(http, cabecalhos, sessoes):
+    com_valor, sem_valor = sessoes
+
+    resposta = http.post("/pagamentos/lote", headers=cabecalhos, json={"sessao_ids": sessoes})
+
+    assert resposta.status_code == 201
+    corpo = resposta.get_json()
+    assert corpo["sessoes_pagas"] == [com_valor]
+    assert corpo["sessoes_sem_valor"] == [sem_valor]
+    assert db.session.get(Sessao, sem_valor).foi_paga is False
+    assert Pagamento.query.filter_by(sessao_id=sem_valor).count() == 0
+
+
+@pytest.mark.parametrize("valor_pago", ["NaN", "Infinity", "-Infinity", "abc", [10]])
+def test_valor_pago_nao_finito_responde_400(http, cabecalhos, sessoes, valor_pago):
+    resposta = http.post("/pagamentos/lote", headers=cabecalhos,
+                         json={"sessao_ids": sessoes, "valor_pago": valor_pago})
+
+    assert resposta.status_code == 400
+    assert Pagamento.query.count() == 0
+
+
+@pytest.mark.parametrize("sessao_ids", [None, [], 5, "12", [[1]], [1, "2"], [True], {"1": 1}])
+def test_sessao_ids_invalido_responde_400(http, cabecalhos, sessoes, sessao_ids):
+    resposta = http.post("/pagamentos/lote", headers=cabecalhos, json={"sessao_ids": sessao_ids})
+
+    assert resposta.status_code == 400
+    assert "erro" in resposta.get_json()
@@ -0,0 +1,41 @@
+from datetime import date, time
+
+import pytest
+
+from app import db
+from app.models.cliente import Cliente
+from app.models.sessao import Sessao
+from app.services.recibos_lote import gerar_lote, por_extenso
+
+
+@pytest.mark.parametrize("valor, esperado", [
+    (150.5, "cento e cinquenta e um reais"),  # round() daria 150 (arredonda ao par)
+    (2.5, "três reais"),
+    (1.49, "um real"),
+    (1000, "mil reais"),
+])
+def test_por_extenso_arredonda_como_o_frontend(valor, esperado):
+    assert por_extenso(valor) == esperado
+
+
+def test_lote_reaproveita_pdfs_gravados_no_diretorio(app, tmp_path):
+    app.config["RECIBOS_CACHE_DIR"] = str(tmp_path)
+    app.config["RECIBO_EMITENTE"] = {**app.config["RECIBO_EMITENTE"], "nome": "Fulana de Tal"}
+    cliente = Cliente(nome="Ana Souza", cpf_cnpj="12345678901")
+    db.session.add(cliente)
+    db.session.flush()
+    db.session.add(Sessao(cliente_id=cliente.id, data=date(2030, 3, 4), horario=time(9, 0), valor=150,
+                          tipo_atendimento="psicologia", frequencia="avulsa", foi_realizada=True, foi_paga=True))
+    db.session.commit()
+
+    arquivos, relatorio = gerar_lote(3, 2030, processos=1)
+    assert relatorio == {"recibos": 1, "renderizados": 1, "em_cache": 0}
+    assert len(list(tmp_path.glob("*.pdf"))) == 1
+
+    de_novo, relatorio = gerar_lote(3, 2030, processos=1)
+    assert relatorio == {"recibos": 1, "renderizados": 0, "em_cache": 1}
+    assert de_novo == arquivos
+
+    # Outro emitente muda o conteúdo: o PDF antigo não é reaproveitado
+    app.config["RECIBO_EMITENTE"] = {**app.config["RECIBO_EMITENTE"], "nome": "Outra Pessoa"}
+    assert gerar_lote(3, 2030, processos=1)[1]["renderizados"] == 1
@@ -0,0 +1,49 @@
+from datetime import date, time, timedelta
+
+from app import db
+from app.models.cliente import Cliente
+from app.models.sessao import Sessao
+from app.models.serie_repeticao import SerieRepeticao
+from app.services.renovacao_sessoes import renovar_sessoes_repetidas
+from app.services.series_repeticao import materializar
+
+
+def test_renova_so_series_materializadas(app):
+    cliente = Cliente(nome="Ana Souza", cpf_cnpj="12345678901")
+    db.session.add(cliente)
+    db.session.flush()
+    ontem = date.today() - timedelta(days=1)
+
+    # Série materializada: a última sessão foi ontem
+    db.session.add(Sessao(cliente_id=cliente.id, data=ontem, horario=time(8, 0), tipo_atendimento="psicologia",
+                          frequencia="semanal", repeticao_id="serie-gravada", foi_realizada=True, foi_paga=False))
+    # Regra calculada sob demanda, com uma ocorrência gravada como exceção
+    serie = SerieRepeticao(cliente_id=cliente.id, tipo_atendimento="rolfing", frequencia="semanal",
+                           horario=time(14, 0), data_inicio=ontem - timedelta(days=7))
+    db.session.add(serie)
+    db.session.flush()
+    db.session.add(materializar(serie, ontem))
+    db.session.commit()
+
+    relatorio = renovar_sessoes_repetidas(horizonte=4)
+
+    assert relatorio["series"] == 1
+    assert relatorio["inseridas"] == 4
+    novas = Sessao.query.filter(Sessao.data > ontem).order_by(Sessao.data).all()
+    assert {s.repeticao_id for s in novas} == {"serie-gravada"}
+    assert [s.data for s in novas] == [ontem + timedelta(days=7 * i) for i in range(1, 5)]
+
+
+def test_mensal_renova_de_30_em_30_dias_sem_alinhar_ao_dia_da_semana(app):
+    cliente = Cliente(nome="Ana Souza", cpf_cnpj="12345678901")
+    db.session.add(cliente)
+    db.session.flush()
+    ontem = date.today() - timedelta(days=1)
+    db.session.add(Sessao(cliente_id=cliente.id, data=ontem, horario=time(8, 0), tipo_atendimento="psicologia",
+                          frequencia="mensal", repeticao_id="serie-mensal", foi_realizada=True, foi_paga=False))
+    db.session.commit()
+
+    renovar_sessoes_repetidas(horizonte=3)
+
+    novas = Sessao.query.filter(Sessao.data > ontem).order_by(Sessao.data).all()
+    assert [s.data for s in novas] == [ontem + timedelta(days=30 * i) for i in range(1, 4)]
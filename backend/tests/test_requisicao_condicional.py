@@ -0,0 +1,44 @@
+from app import db
+from app.models.cliente import Cliente
+from app.models.nota import Nota
+
+
+def test_lista_responde_304_ate_a_tabela_mudar(http, cabecalhos):
+    primeira = http.get("/notas/", headers=cabecalhos)
+    assert primeira.status_code == 200
+    etag = primeira.headers["ETag"]
+
+    repetida = http.get("/notas/", headers={**cabecalhos, "If-None-Match": etag})
+    assert repetida.status_code == 304
+
+    db.session.add(Nota(titulo="Nova", conteudo="texto"))
+    db.session.commit()
+    depois = http.get("/notas/", headers={**cabecalhos, "If-None-Match": etag})
+    assert depois.status_code == 200
+    assert depois.headers["ETag"] != etag
+
+
+def test_alteracao_em_massa_e_cascata_mudam_a_versao(http, cabecalhos):
+    cliente = Cliente(nome="Ana Souza", cpf_cnpj="12345678901")
+    db.session.add(cliente)
+    db.session.commit()
+    etag_clientes = http.get("/clientes/", headers=cabecalhos).headers["ETag"]
+    etag_sessoes = http.get("/sessoes/", headers=cabecalhos).headers["ETag"]
+
+    # UPDATE em massa não passa pelo flush; sessoes aponta para clientes (ON DELETE CASCADE)
+    db.session.execute(db.update(Cliente).values(telefone="11999990000"))
+    db.session.commit()
+
+    assert http.get("/clientes/", headers={**cabecalhos, "If-None-Match": etag_clientes}).status_code == 200
+    assert http.get("/sessoes/", headers={**cabecalhos, "If-None-Match": etag_sessoes}).status_code == 200
+
+
+def test_rollback_nao_muda_a_versao(http, cabecalhos):
+    etag = http.get("/notas/", headers=cabecalhos).headers["ETag"]
+
+    db.session.add(Nota(titulo="Descartada", conteudo="texto"))
+    db.session.flush()
+    db.session.rollback()
+    db.session.commit()
+
+    assert http.get("/notas/", headers={**cabecalhos, "If-None-Match": etag}).status_code == 304
@@ -0,0 +1,78 @@
+from datetime import date, time, timedelta
+
+import pytest
+
+from app import db
+from app.models.cliente import Cliente
+from app.models.sessao import Sessao
+from app.services.saldos import divergencias
+
+
+@pytest.fixture
+def clientes(app):
+    """Ana com duas sessões realizadas de 150 e uma futura da mesma série; Bruno com uma de 200."""
+    ana, bruno = Cliente(nome="Ana Souza", cpf_cnpj="1"), Cliente(nome="Bruno Lima", cpf_cnpj="2")
+    db.session.add_all([ana, bruno])
+    db.session.flush()
+    inicio = date.today() - timedelta(days=14)
+    db.session.add_all([
+        Sessao(cliente_id=ana.id, data=inicio + timedelta(days=7 * i), horario=time(9, 0), valor=150,
+               tipo_atendimento="psicologia", frequencia="semanal", repeticao_id="serie-ana",
+               foi_realizada=i < 2, foi_paga=False)
+        for i in range(3)
+    ])
+    db.session.add(Sessao(cliente_id=bruno.id, data=inicio, horario=time(11, 0), valor=200,
+                          tipo_atendimento="psicologia", frequencia="avulsa", foi_realizada=True, foi_paga=False))
+    db.session.commit()
+    return ana, bruno
+
+
+def saldo(http, cabecalhos, cliente):
+    return http.get(f"/saldos/cliente/{cliente.id}", headers=cabecalhos).get_json()
+
+
+def ids_da(cliente):
+    return [s.id for s in Sessao.query.filter_by(cliente_id=cliente.id).order_by(Sessao.data)]
+
+
+def test_saldos_acompanham_o_pagamento_em_lote(http, cabecalhos, clientes):
+    ana, bruno = clientes
+    assert saldo(http, cabecalhos, ana)["em_aberto"] == 300
+
+    resposta = http.post("/pagamentos/lote", headers=cabecalhos,
+                         json={"sessao_ids": ids_da(ana)[:2], "valor_pago": 200})
+    assert resposta.status_code == 201
+
+    # A primeira sessão foi quitada; a segunda recebeu 50 e ainda deve 100
+    assert saldo(http, cabecalhos, ana)["total_pago"] == 200
+    assert saldo(http, cabecalhos, ana)["em_aberto"] == 100
+    assert saldo(http, cabecalhos, ana)["sessoes_em_aberto"] == 1
+    assert saldo(http, cabecalhos, bruno)["em_aberto"] == 200  # outro cliente não é tocado
+    assert divergencias(db.session) == []
+
+
+def test_saldos_acompanham_a_exclusao_de_pagamento(http, cabecalhos, clientes):
+    ana, _ = clientes
+    primeira, segunda, _ = ids_da(ana)
+    pagamentos = http.post("/pagamentos/lote", headers=cabecalhos,
+                           json={"sessao_ids": [segunda], "valor_pago": 100}).get_json()["pagamentos"]
+
+    assert http.delete(f"/pagamentos/{pagamentos[0]['id']}", headers=cabecalhos).status_code == 200
+
+    assert saldo(http, cabecalhos, ana)["total_pago"] == 0
+    assert saldo(http, cabecalhos, ana)["em_aberto"] == 300
+    assert divergencias(db.session) == []
+
+
+def test_saldos_acompanham_a_mudanca_de_valor(http, cabecalhos, clientes):
+    ana, _ = clientes
+    primeira, *_ = ids_da(ana)
+
+    # A sessão e as futuras da série passam a valer 180 (UPDATE em massa nas futuras)
+    resposta = http.put(f"/sessoes/{primeira}", headers=cabecalhos,
+                        json={"valor": 180, "atualizar_valores_futuros": True})
+    assert resposta.status_code == 200
+
+    assert saldo(http, cabecalhos, ana)["total_faturado"] == 360
+    assert saldo(http, cabecalhos, ana)["em_aberto"] == 360
+    assert divergencias(db.session) == []
@@ -0,0 +1,96 @@
+from datetime import date, time, timedelta
+
+from app import db
+from app.models.cliente import Cliente
+from app.models.sessao import Sessao
+from app.models.serie_repeticao import SerieRepeticao
+from app.services.series_repeticao import materializar
+
+
+def criar_serie(inicio):
+    cliente = Cliente(nome="Ana Souza", cpf_cnpj="12345678901", telefone="11999990000")
+    db.session.add(cliente)
+    db.session.flush()
+    serie = SerieRepeticao(
+        cliente_id=cliente.id, tipo_atendimento="psicologia", frequencia="semanal",
+        horario=time(9, 0), valor=150, data_inicio=inicio,
+    )
+    db.session.add(serie)
+    db.session.flush()
+    return cliente, serie
+
+
+def test_janela_de_sessoes_inclui_ocorrencias_das_series(http, cabecalhos):
+    inicio = date(2030, 1, 7)
+    cliente, serie = criar_serie(inicio)
+    # Uma ocorrência gravada (remarcada para as 10h) e uma sessão avulsa no mesmo dia da primeira
+    remarcada = materializar(serie, inicio + timedelta(days=7))
+    remarcada.horario = time(10, 0)
+    db.session.add(remarcada)
+    db.session.add(Sessao(cliente_id=cliente.id, data=inicio, horario=time(9, 0), tipo_atendimento="rolfing",
+                          frequencia="avulsa", foi_realizada=False, foi_paga=False))
+    db.session.commit()
+
+    vistas, cursor = [], None
+    while True:
+        url = f"/sessoes/?inicio={inicio}&fim={inicio + timedelta(days=27)}&limite=2"
+        resposta = http.get(url + (f"&cursor={cursor}" if cursor else ""), headers=cabecalhos)
+        assert resposta.status_code == 200
+        vistas += resposta.get_json()["sessoes"]
+        cursor = resposta.get_json()["proximo_cursor"]
+        if not cursor:
+            break
+
+    assert [(s["data"], s["horario"], s["id"] is None) for s in vistas] == [
+        ("2030-01-07", "09:00:00", True),
+        ("2030-01-07", "09:00:00", False),
+        ("2030-01-14", "10:00:00", False),
+        ("2030-01-21", "09:00:00", True),
+        ("2030-01-28", "09:00:00", True),
+    ]
+    # Filtrar por realizadas exclui as ocorrências calculadas
+    url = f"/sessoes/?inicio={inicio}&fim={inicio + timedelta(days=27)}&foi_realizada=true"
+    assert http.get(url, headers=cabecalhos).get_json()["sessoes"] == []
+
+
+def test_dashboard_mostra_ocorrencias_das_series(http, cabecalhos):
+    criar_serie(date.today() - timedelta(days=13))  # só amanhã cai nos próximos 7 dias
+    db.session.commit()
+
+    proximas = http.get("/dashboard/proximas-sessoes", headers=cabecalhos).get_json()
+    assert [s["cliente"] for s in proximas] == ["Ana Souza"]
+
+    # Mudar a regra invalida o cache do dashboard
+    SerieRepeticao.query.one().horario = time(15, 30)
+    db.session.commit()
+    proximas = http.get("/dashboard/proximas-sessoes", headers=cabecalhos).get_json()
+    assert proximas[0]["horario"] == "15:30"
+
+
+def test_ocorrencia_da_janela_e_gravada_pelo_id_da_serie(http, cabecalhos):
+    inicio = date(2030, 1, 7)
+    criar_serie(inicio)
+    db.session.commit()
+    url = f"/sessoes/?inicio={inicio}&fim={inicio}"
+
+    virtual, = http.get(url, headers=cabecalhos).get_json()["sessoes"]
+    assert virtual["id"] is None
+
+    # O que a agenda faz ao clicar numa ocorrência sem id
+    caminho = f"/series/{virtual['repeticao_id']}/ocorrencias/{virtual['data_ocorrencia']}"
+    gravada = http.post(caminho, headers=cabecalhos)
+    assert gravada.status_code == 201
+    assert http.post(caminho, headers=cabecalhos).get_json()["sessao"]["id"] == gravada.get_json()["id"]
+
+    assert [s["id"] for s in http.get(url, headers=cabecalhos).get_json()["sessoes"]] == [gravada.get_json()["id"]]
+
+
+def test_dashboard_nao_recalcula_ocorrencia_ja_gravada(http, cabecalhos):
+    _, serie = criar_serie(date.today() - timedelta(days=13))
+    # A ocorrência de amanhã foi antecipada para hoje e realizada: não é mais pendente
+    antecipada = materializar(serie, date.today() + timedelta(days=1))
+    antecipada.data, antecipada.foi_realizada = date.today(), True
+    db.session.add(antecipada)
+    db.session.commit()
+
+    assert http.get("/dashboard/proximas-sessoes", headers=cabecalhos).get_json() == []
@@ -1,5 +1,5 @@
 import { useNavigate } from "react-router-dom";
-import { useEffect, useState } from "react";
+import { useCallback, useState } from "react";
 import FullCalendar from "@fullcalendar/react";
 import dayGridPlugin from "@fullcalendar/daygrid";
 import timeGridPlugin from "@fullcalendar/timegrid";
@@ -12,12 +12,11 @@ import Slider from "@mui/material/Slider";
 import CircularProgress from "@mui/material/CircularProgress";
 import Box from "@mui/material/Box";
 import type { DateClickArg } from "@fullcalendar/interaction";
-import type { EventClickArg } from "@fullcalendar/core";
+import type { EventClickArg, EventSourceFuncArg } from "@fullcalendar/core";
 
 export default function AgendaCalendar() {
-  const [eventos, setEventos] = useState<any[]>([]);
   const [range, setRange] = useState<[number, number]>([8, 20]);
-  const [isLoading, setIsLoading] = useState<boolean>(true); // <- flag de carregamento
+  const [isLoading, setIsLoading] = useState<boolean>(false); // <- flag de carregamento
 
   const navigate = useNavigate();
 
@@ -29,54 +28,42 @@ export default function AgendaCalendar() {
     });
   };
 
-  useEffect(() => {
-    async function carregarSessoes() {
-      try {
-        const { data } = await sessaoService.getAll();
-        const nomesClientes = await Promise.all(
-          data.map(async (sessao: Sessao) => {
-            const cliente = await clienteService.get(sessao.cliente_id);
-            return {
-              ...sessao,
-              nome_cliente: cliente.data.nome,
-            };
-          })
-        );
-
-        const eventosFormatados = nomesClientes.map(
-          (sessao: Sessao & { nome_cliente: string }) => ({
-            id: sessao.id,
-            title: `${sessao.tipo_atendimento} - ${sessao.nome_cliente}`,
-            start: `${sessao.data}T${sessao.horario}`,
-            color: sessao.foi_paga ? "#5cb85c" : "#d9534f",
-            extendedProps: {
-              observacoes: sessao.observacoes,
-              valor: sessao.valor,
-              foi_realizada: sessao.foi_realizada,
-            },
-          })
-        );
-        setEventos(eventosFormatados);
-      } finally {
-        setIsLoading(false); // <- esconde o loading após carregar
-      }
-    }
-
-    carregarSessoes();
-  }, []);
+  // Memorizado para o FullCalendar não refazer a busca a cada renderização
+  const carregarSessoes = useCallback(async (info: EventSourceFuncArg) => {
+    // O fim do intervalo do FullCalendar é exclusivo; a API usa datas inclusivas
+    const fimInclusivo = new Date(info.end.getTime() - 24 * 60 * 60 * 1000);
+    const sessoes = await sessaoService.getPeriodo(
+      info.startStr.slice(0, 10),
+      fimInclusivo.toISOString().slice(0, 10)
+    );
+    const nomesClientes = await Promise.all(
+      sessoes.map(async (sessao: Sessao) => {
+        const cliente = await clienteService.get(sessao.cliente_id);
+        return {
+          ...sessao,
+          nome_cliente: cliente.data.nome,
+        };
+      })
+    );
 
-  if (isLoading) {
-    return (
-      <Box
-        display="flex"
-        alignItems="center"
-        justifyContent="center"
-        height="80vh"
-      >
-        <CircularProgress size={60} />
-      </Box>
+    return nomesClientes.map(
+      (sessao: Sessao & { nome_cliente: string }) => ({
+        // Ocorrências de série ainda não gravadas não têm id; são gravadas ao clicar
+        id: sessao.id != null ? String(sessao.id) : `serie-${sessao.repeticao_id}-${sessao.data_ocorrencia}`,
+        title: `${sessao.tipo_atendimento} - ${sessao.nome_cliente}`,
+        start: `${sessao.data}T${sessao.horario}`,
+        color: sessao.foi_paga ? "#5cb85c" : "#d9534f",
+        extendedProps: {
+          observacoes: sessao.observacoes,
+          valor: sessao.valor,
+          foi_realizada: sessao.foi_realizada,
+          repeticao_id: sessao.repeticao_id,
+          data_ocorrencia: sessao.data_ocorrencia,
+          virtual: sessao.id == null,
+        },
+      })
     );
-  }
+  }, []);
 
   return (
     <div style={{ marginTop: "-40px" }}>
@@ -85,8 +72,15 @@ export default function AgendaCalendar() {
           marginBottom: "16px",
           display: "flex",
           justifyContent: "flex-end",
+          alignItems: "center",
+          gap: "16px",
         }}
       >
+        {isLoading && (
+          <Box display="flex" alignItems="center">
+            <CircularProgress size={24} />
+          </Box>
+        )}
         <Slider
           value={range}
           onChange={(_, newValue) => setRange(newValue as [number, number])}
@@ -108,7 +102,8 @@ export default function AgendaCalendar() {
         }}
         locale={ptLocale}
         height="80vh"
-        events={eventos}
+        events={carregarSessoes}
+        loading={setIsLoading}
         nowIndicator
         slotMinTime={`${range[0].toString().padStart(2, "0")}:00:00`}
         slotMaxTime={`${(range[1] + 1).toString().padStart(2, "0")}:00:00`}
@@ -117,11 +112,22 @@ export default function AgendaCalendar() {
           const hora = arg.dateStr.split("T")[1]?.slice(0, 5);
           navigate(`/sessoes/novo?data=${data}&horario=${hora}`);
         }}
-        eventClick={(arg: EventClickArg) => {
+        eventClick={async (arg: EventClickArg) => {
           const tooltip = document.querySelector(".fc-tooltip");
           if (tooltip) tooltip.remove();
           document.removeEventListener("mousemove", () => {});
 
+          const { virtual, repeticao_id, data_ocorrencia } = arg.event.extendedProps;
+          if (virtual) {
+            try {
+              const sessao = await sessaoService.materializarOcorrencia(repeticao_id, data_ocorrencia);
+              navigate(`/sessoes/editar/${sessao.id}`);
+            } catch (err) {
+              console.error(err);
+            }
+            return;
+          }
+
           const id = arg.event.id;
           navigate(`/sessoes/editar/${id}`);
         }}
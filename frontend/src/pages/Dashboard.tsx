@@ -2,12 +2,10 @@ import ProximasSessoes from "../components/dashboard/ProximasSessoes";
 import SessoesAmanha from "../components/dashboard/SessoesAmanha";
 import { useEffect, useState } from "react";
 import DashboardService from "../services/dashboardService";
-import type { ResumoFinanceiroResponse } from "../services/dashboardService";
+import type { AgendaDashboardResponse } from "../services/dashboardService";
 import ResumoFinanceiro from "../components/dashboard/ResumoFinanceiro";
 import { Box, CircularProgress, Typography } from "@mui/material";
-import ProximasSessoesService from "../services/proximasSessoesService";
 import type { SessaoProxima } from "../services/proximasSessoesService";
-import SessoesAmanhaService from "../services/sessoesAmanhaService";
 import type { SessaoAmanha } from "../services/sessoesAmanhaService";
 
 export default function Dashboard() {
@@ -22,50 +20,27 @@ export default function Dashboard() {
   const [sessoesAmanha, setSessoesAmanha] = useState<SessaoAmanha[]>([]);
 
   useEffect(() => {
-    async function fetchProximas() {
+    // Resumo, próximas sessões e sessões de amanhã vêm de uma única chamada
+    async function fetchAgenda() {
       try {
-        const res = await ProximasSessoesService.getProximasSessoes();
-        setProximasSessoes(res.data);
+        const res: { data: AgendaDashboardResponse } =
+          await DashboardService.getAgenda();
+        const resumo = res.data.resumo_financeiro;
+        setSessoes(resumo.sessoes);
+        setRecebido(resumo.recebido);
+        setAReceber(resumo.a_receber);
+        setFuturas(resumo.futuras);
+        setNaoRealizadas(resumo.nao_realizadas);
+        setProximasSessoes(res.data.proximas_sessoes);
+        setSessoesAmanha(res.data.sessoes_amanha);
       } catch (err) {
-        console.error("Erro ao buscar próximas sessões:", err);
-      }
-    }
-
-    fetchProximas();
-  }, []);
-
-  useEffect(() => {
-    async function fetchAmanha() {
-      try {
-        const res = await SessoesAmanhaService.getSessoesAmanha();
-        
-        setSessoesAmanha(res.data);
-      } catch (err) {
-        console.error("Erro ao buscar sessões de amanhã:", err);
-      }
-    }
-
-    fetchAmanha();
-  }, []);
-
-  useEffect(() => {
-    async function fetchResumo() {
-      try {
-        const res: { data: ResumoFinanceiroResponse } =
-          await DashboardService.getResumoFinanceiro();
-        setSessoes(res.data.sessoes);
-        setRecebido(res.data.recebido);
-        setAReceber(res.data.a_receber);
-        setFuturas(res.data.futuras);
-        setNaoRealizadas(res.data.nao_realizadas);
-      } catch (err) {
-        console.error("Erro ao buscar resumo financeiro:", err);
+        console.error("Erro ao buscar dados do dashboard:", err);
       } finally {
         setLoading(false);
       }
     }
 
-    fetchResumo();
+    fetchAgenda();
   }, []);
 
   return (
@@ -25,7 +25,7 @@ import { useNavigate } from "react-router-dom";
 import ClienteService from "../../services/clienteService";
 import AddCircleIcon from "@mui/icons-material/AddCircle";
 import HistoricoService from "../../services/historicoService";
-import type { Historico } from "../../services/historicoService";
+import type { HistoricoResumo } from "../../services/historicoService";
 
 function formatCpfCnpj(value: string) {
   if (!value) return "";
@@ -65,7 +65,13 @@ export default function ClienteReadTable() {
     null
   );
   const [historicoPorCliente, setHistoricoPorCliente] = useState<
-    Record<number, Historico[]>
+    Record<number, HistoricoResumo[]>
+  >({});
+  const [cursorHistorico, setCursorHistorico] = useState<
+    Record<number, string | null>
+  >({});
+  const [conteudoCompleto, setConteudoCompleto] = useState<
+    Record<number, string>
   >({});
   const [expandidos, setExpandidos] = useState<number[]>([]);
   // Estados relacionados ao histórico (devem estar aqui dentro)
@@ -73,7 +79,7 @@ export default function ClienteReadTable() {
   const [
     historicoSelecionadoParaExclusao,
     setHistoricoSelecionadoParaExclusao,
-  ] = useState<Historico | null>(null);
+  ] = useState<HistoricoResumo | null>(null);
   const [clienteDoHistorico, setClienteDoHistorico] = useState<Cliente | null>(
     null
   );
@@ -103,12 +109,42 @@ export default function ClienteReadTable() {
     } else {
       if (!historicoPorCliente[clienteId]) {
         const res = await HistoricoService.getByCliente(clienteId);
-        setHistoricoPorCliente((prev) => ({ ...prev, [clienteId]: res.data }));
+        setHistoricoPorCliente((prev) => ({
+          ...prev,
+          [clienteId]: res.data.historicos,
+        }));
+        setCursorHistorico((prev) => ({
+          ...prev,
+          [clienteId]: res.data.proximo_cursor,
+        }));
       }
       setExpandidos([...expandidos, clienteId]);
     }
   };
 
+  const carregarMaisHistorico = async (clienteId: number) => {
+    const res = await HistoricoService.getByCliente(
+      clienteId,
+      cursorHistorico[clienteId]
+    );
+    setHistoricoPorCliente((prev) => ({
+      ...prev,
+      [clienteId]: [...(prev[clienteId] || []), ...res.data.historicos],
+    }));
+    setCursorHistorico((prev) => ({
+      ...prev,
+      [clienteId]: res.data.proximo_cursor,
+    }));
+  };
+
+  const verConteudoCompleto = async (historicoId: number) => {
+    const res = await HistoricoService.getById(historicoId);
+    setConteudoCompleto((prev) => ({
+      ...prev,
+      [historicoId]: res.data.conteudo,
+    }));
+  };
+
   const confirmarExclusao = async () => {
     if (clienteSelecionado) {
       await ClienteService.delete(clienteSelecionado.id!);
@@ -122,7 +158,7 @@ export default function ClienteReadTable() {
     fetchClientes();
   }, []);
 
-  const handleEditarHistorico = (historico: Historico) => {
+  const handleEditarHistorico = (historico: HistoricoResumo) => {
     navigate(`/historicos/editar/${historico.id}`);
   };
 
@@ -378,8 +414,22 @@ export default function ClienteReadTable() {
                                       whiteSpace="pre-wrap"
                                       sx={{ color: "#000" }}
                                     >
-                                      {h.conteudo}
+                                      {conteudoCompleto[h.id] ??
+                                        (h.tamanho > h.previa.length
+                                          ? `${h.previa}…`
+                                          : h.previa)}
                                     </Typography>
+                                    {h.tamanho > h.previa.length &&
+                                      conteudoCompleto[h.id] === undefined && (
+                                        <Button
+                                          size="small"
+                                          onClick={() =>
+                                            verConteudoCompleto(h.id)
+                                          }
+                                        >
+                                          Ver completo
+                                        </Button>
+                                      )}
                                   </Box>
                                 ));
                             })()
@@ -388,6 +438,14 @@ export default function ClienteReadTable() {
                               Sem histórico registrado.
                             </Typography>
                           )}
+                          {cursorHistorico[cliente.id!] && (
+                            <Button
+                              size="small"
+                              onClick={() => carregarMaisHistorico(cliente.id!)}
+                            >
+                              Carregar mais
+                            </Button>
+                          )}
                         </Box>
                       </TableCell>
                     </TableRow>
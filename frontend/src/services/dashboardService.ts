@@ -1,4 +1,6 @@
 import api from "./axios";
+import type { SessaoProxima } from "./proximasSessoesService";
+import type { SessaoAmanha } from "./sessoesAmanhaService";
 
 export interface ResumoFinanceiroResponse {
   sessoes: number;
@@ -8,10 +10,22 @@ export interface ResumoFinanceiroResponse {
   nao_realizadas: number;
 }
 
+export interface AgendaDashboardResponse {
+  resumo_financeiro: ResumoFinanceiroResponse;
+  proximas_sessoes: SessaoProxima[];
+  sessoes_amanha: SessaoAmanha[];
+}
+
 const DashboardService = {
   getResumoFinanceiro() {
     return api.get<ResumoFinanceiroResponse>("/dashboard/resumo-financeiro");
   },
+
+  getAgenda(dias: number = 7) {
+    return api.get<AgendaDashboardResponse>("/dashboard/agenda", {
+      params: { dias },
+    });
+  },
 };
 
 export default DashboardService;
@@ -8,9 +8,25 @@ export interface Historico {
   conteudo: string;
 }
 
+// Item da listagem: só uma prévia do conteúdo; o texto completo vem de getById
+export interface HistoricoResumo {
+  id: number;
+  data: string | null;
+  tipo: "sessao" | "supervisao";
+  previa: string;
+  tamanho: number;
+}
+
+export interface HistoricoPagina {
+  historicos: HistoricoResumo[];
+  proximo_cursor: string | null;
+}
+
 class HistoricoService {
-  getByCliente(clienteId: number) {
-    return api.get<Historico[]>(`/historicos/cliente/${clienteId}`);
+  getByCliente(clienteId: number, cursor?: string | null) {
+    return api.get<HistoricoPagina>(`/historicos/cliente/${clienteId}`, {
+      params: cursor ? { cursor } : undefined,
+    });
   }
 
   getById(id: number) {
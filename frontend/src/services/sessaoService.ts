@@ -1,8 +1,10 @@
 import api from "./axios";
 
 export interface Sessao {
-  id?: number;
+  id?: number | null; // null: ocorrência de série ainda não gravada (GET /sessoes/ com inicio e fim)
   cliente_id: number;
+  repeticao_id?: string | null;
+  data_ocorrencia?: string | null;
   data: string;
   tipo_atendimento: string;
   frequencia: string;
@@ -14,6 +16,11 @@ export interface Sessao {
   criado_em?: string;
 }
 
+export interface SessaoPagina {
+  sessoes: Sessao[];
+  proximo_cursor: string | null;
+}
+
 export interface ReciboPreview {
   quantidade: number;
   valor_total: number;
@@ -31,6 +38,30 @@ class SessaoService {
     return api.get<Sessao[]>("/sessoes/");
   }
 
+  async getPeriodo(inicio: string, fim: string) {
+    const sessoes: Sessao[] = [];
+    let cursor: string | null = null;
+    do {
+      const params: Record<string, string> = { inicio, fim };
+      if (cursor) params.cursor = cursor;
+      const { data } = await api.get<SessaoPagina>("/sessoes/", { params });
+      sessoes.push(...data.sessoes);
+      cursor = data.proximo_cursor;
+    } while (cursor);
+    return sessoes;
+  }
+
+  // Grava a ocorrência de uma série para poder editá-la; se já existir, devolve a gravada
+  async materializarOcorrencia(repeticaoId: string, dataOcorrencia: string) {
+    try {
+      const { data } = await api.post<Sessao>(`/series/${repeticaoId}/ocorrencias/${dataOcorrencia}`);
+      return data;
+    } catch (err: any) {
+      if (err?.response?.status === 409) return err.response.data.sessao as Sessao;
+      throw err;
+    }
+  }
+
   get(id: number) {
     return api.get<Sessao>(`/sessoes/${id}`);
   }